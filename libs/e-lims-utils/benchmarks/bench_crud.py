@@ -0,0 +1,225 @@
+"""Benchmark suite of the Crud operations across database backends and table sizes.
+
+Each operation is timed on SQLite in memory, on a SQLite file and, if the E_LIMS_BENCH_POSTGRESQL_URL environment variable
+is set, on PostgreSQL, for each table size. The results are stored as JSON, so that two runs can be compared.
+
+Usage:
+    python benchmarks/bench_crud.py run --sizes 1000 100000 1000000 --output results.json
+    python benchmarks/bench_crud.py compare baseline.json results.json --threshold 0.1
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Field
+
+from e_lims_utils.crud.crud import BaseSqlModel, Crud
+from e_lims_utils.crud.engine import engine_registry
+from e_lims_utils.files.files import FileProperties, FileSuffix
+from e_lims_utils.files.timestamp import Timestamp
+from e_lims_utils.logger.logger import Logger, LoggerLevel
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+POSTGRESQL_URL_VARIABLE = "E_LIMS_BENCH_POSTGRESQL_URL"
+SAMPLE_SIZE = 1000  # Maximum number of records of the single-record operations, which run one transaction each.
+DEFAULT_SIZES = (1000, 100000, 1000000)
+
+
+class CrudBenchRecord(BaseSqlModel, table=True):
+    """The SQLModel of the benchmark.
+
+    Attributes:
+        uid (int): The unique identifier.
+        name (str): The name of the record, shared by 1% of the records.
+        age (int): The age of the record.
+    """
+
+    uid: int = Field(default=None, primary_key=True)
+    name: str
+    age: int
+
+
+def backends(directory: Path) -> dict[str, str]:
+    """Returns the database URLs of the backends to benchmark.
+
+    Args:
+        directory (Path): The directory of the SQLite file.
+
+    Returns:
+        dict[str, str]: The database URLs keyed by backend name.
+    """
+    urls = {"sqlite-memory": "sqlite:///:memory:", "sqlite-file": f"sqlite:///{directory / 'bench_crud.db'}"}
+    if os.environ.get(POSTGRESQL_URL_VARIABLE):
+        urls["postgresql"] = os.environ[POSTGRESQL_URL_VARIABLE]
+    return urls
+
+
+def scenario(crud: Crud, size: int) -> list[tuple[str, int, Callable[[], object]]]:
+    """Returns the operations to time, in the order they run on a table of 'size' records.
+
+    Args:
+        crud (Crud): The Crud object of the empty table.
+        size (int): The number of records of the table.
+
+    Returns:
+        list[tuple[str, int, Callable[[], object]]]: The name, the number of records processed and the function of each operation,
+            the operations processing no record at this size are left out.
+    """
+    ids = list(range(1, size + 1))
+    sample = ids[: max(1, min(size // 10, SAMPLE_SIZE))]
+    half = ids[len(sample) : (size + len(sample)) // 2]
+    rows = [{"name": f"name-{uid % 100}", "age": uid % 90} for uid in ids]
+    name_count = len(ids[::100])
+    operations = [
+        ("bulk_creates", size, lambda: crud.bulk_creates(rows)),
+        ("read", len(sample), lambda: [crud.read(uid) for uid in sample]),
+        ("reads", size, crud.reads),
+        ("read_by_ids", size, lambda: crud.read_by_ids(ids)),
+        ("read_by_field", name_count, lambda: crud.read_by_field("name", "name-0")),
+        ("update", len(sample), lambda: [crud.update(CrudBenchRecord(uid=uid, name="updated", age=1)) for uid in sample]),
+        ("updates", size, lambda: crud.updates([{"uid": uid, "age": 2} for uid in ids])),
+        ("update_where", size, lambda: crud.update_where({"age": 2}, {"age": 3})),
+        ("delete", len(sample), lambda: [crud.delete(uid) for uid in sample]),
+        ("delete_by_ids", len(half), lambda: crud.delete_by_ids(half)),
+        ("delete_by_field", name_count, lambda: crud.delete_by_field("name", "name-1")),
+        ("delete_where", size, lambda: crud.delete_where({})),
+        ("creates", size, lambda: crud.creates([CrudBenchRecord(**row) for row in rows])),
+        ("create", len(sample), lambda: [crud.create(CrudBenchRecord(name="single", age=1)) for _ in sample]),
+    ]
+    return [(operation, count, function) for operation, count, function in operations if count]
+
+
+def run_backend(crud: Crud, size: int) -> dict[str, tuple[int, float]]:
+    """Runs the operations of the scenario on a new table and returns their durations.
+
+    Args:
+        crud (Crud): The Crud object of the backend.
+        size (int): The number of records of the table.
+
+    Returns:
+        dict[str, tuple[int, float]]: The number of records processed and the duration in seconds, keyed by operation.
+    """
+    crud.create_table()
+    durations = {}
+    try:
+        for operation, count, function in scenario(crud, size):
+            start = time.perf_counter()
+            function()
+            durations[operation] = (count, time.perf_counter() - start)
+    finally:
+        crud.drop_table()
+    return durations
+
+
+def git_commit() -> str | None:
+    """Returns the abbreviated hash of the current git commit.
+
+    Returns:
+        str | None: The hash of HEAD, None outside a git repository.
+    """
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, check=True, text=True, cwd=Path(__file__).parent)  # noqa: S603, S607
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run(sizes: list[int], repeat: int, output: Path) -> dict[str, Any]:
+    """Runs the benchmark on every backend and size, keeps the best duration of each operation and writes the results.
+
+    Args:
+        sizes (list[int]): The numbers of records of the table.
+        repeat (int): The number of runs per backend and size.
+        output (Path): The path of the JSON results.
+
+    Returns:
+        dict[str, Any]: The results.
+    """
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as directory:
+        file = FileProperties(name="bench_crud", suffix=FileSuffix.LOG, path=Path(directory), timestamp=Timestamp(datetime.now(tz=timezone.utc)))
+        logger = Logger(file=file, level=LoggerLevel.WARNING)
+        for backend, url in backends(Path(directory)).items():
+            crud = Crud(logger, CrudBenchRecord, url)
+            try:
+                for size in sizes:
+                    runs = [run_backend(crud, size) for _ in range(repeat)]
+                    for operation, (count, _) in runs[0].items():
+                        seconds = min(durations[operation][1] for durations in runs)
+                        results.append({"backend": backend, "size": size, "operation": operation, "count": count, "seconds": seconds, "rows_per_second": count / seconds})
+                        print(f"{backend:<14} {size:>9} {operation:<16} {count / seconds:>14,.0f} rows/s")
+            except OperationalError as error:
+                print(f"{backend:<14} skipped: {error.orig}")
+            finally:
+                engine_registry.dispose(url)
+    report = {
+        "commit": git_commit(),
+        "date": datetime.now(tz=timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report
+
+
+def compare(baseline: Path, current: Path, threshold: float) -> bool:
+    """Prints the throughput change of each operation between two results and flags the regressions.
+
+    Args:
+        baseline (Path): The path of the JSON results of reference.
+        current (Path): The path of the JSON results to check.
+        threshold (float): The relative throughput loss above which an operation is a regression.
+
+    Returns:
+        bool: True if no operation regressed.
+    """
+    reports = [json.loads(path.read_text(encoding="utf-8")) for path in (baseline, current)]
+    before = {(result["backend"], result["size"], result["operation"]): result["rows_per_second"] for result in reports[0]["results"]}
+    print(f"{reports[0]['commit']} -> {reports[1]['commit']}")
+    regressions = 0
+    for result in reports[1]["results"]:
+        key = (result["backend"], result["size"], result["operation"])
+        if key not in before:
+            continue
+        change = result["rows_per_second"] / before[key] - 1
+        flag = "REGRESSION" if change < -threshold else ""
+        regressions += bool(flag)
+        print(f"{key[0]:<14} {key[1]:>9} {key[2]:<16} {before[key]:>14,.0f} {result['rows_per_second']:>14,.0f} {change:>+8.1%} {flag}")
+    return not regressions
+
+
+def main() -> None:
+    """Parses the command line and runs or compares the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="Run the benchmark and write the results.")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="The numbers of records of the table.")
+    run_parser.add_argument("--repeat", type=int, default=1, help="The number of runs, the best duration is kept.")
+    run_parser.add_argument("--output", type=Path, default=Path("bench_crud.json"), help="The path of the JSON results.")
+    compare_parser = commands.add_parser("compare", help="Compare two results and exit with status 1 on a regression.")
+    compare_parser.add_argument("baseline", type=Path, help="The JSON results of reference.")
+    compare_parser.add_argument("current", type=Path, help="The JSON results to check.")
+    compare_parser.add_argument("--threshold", type=float, default=0.1, help="The relative throughput loss flagged as a regression.")
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args.sizes, args.repeat, args.output)
+    elif not compare(args.baseline, args.current, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
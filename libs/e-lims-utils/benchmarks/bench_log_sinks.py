@@ -0,0 +1,65 @@
+"""Benchmark of the throughput of the Logger file sinks: default, buffered and queued, in lines per second.
+
+The rotating file, which is flushed after each line when it's the sink, is timed alone and buffered.
+
+The stdout handler is removed, so that the file handler is timed alone. The queued sink is timed until its queue is written.
+
+Usage:
+    python benchmarks/bench_log_sinks.py --lines 100000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from e_lims_utils.files.files import FileProperties, FileSuffix
+from e_lims_utils.files.timestamp import Timestamp
+from e_lims_utils.logger.logger import Logger, LoggerLevel
+from e_lims_utils.logger.rotation import LogRotation
+from e_lims_utils.logger.sinks import BufferOptions, QueueOptions
+
+
+def lines_per_second(logger: Logger, lines: int) -> float:
+    """Logs debug lines to the file only and returns the throughput.
+
+    Args:
+        logger (Logger): The logger, its stdout handler is removed.
+        lines (int): The number of lines to log.
+
+    Returns:
+        float: The number of lines written per second.
+    """
+    logger._logger.remove(next(iter(logger._logger._core.handlers)))  # noqa: SLF001
+    start = time.perf_counter()
+    for index in range(lines):
+        logger.debug("Measure {} of channel {}: {:.3f} mV.", index, index % 8, index * 0.001)  # noqa: PLE1205
+    logger.drain()
+    seconds = time.perf_counter() - start
+    logger._logger.remove()  # noqa: SLF001
+    return lines / seconds
+
+
+def main() -> None:
+    """Times each file sink and prints its throughput."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100000, help="The number of lines per sink.")
+    args = parser.parse_args()
+    sinks = {
+        "default": {},
+        "buffered": {"buffer": BufferOptions()},
+        "queued": {"queue": QueueOptions()},
+        "rotating": {"rotation": LogRotation(max_bytes=1 << 30)},
+        "rotating+buffered": {"rotation": LogRotation(max_bytes=1 << 30), "buffer": BufferOptions()},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, options in sinks.items():
+            file = FileProperties(name=f"bench_{name}", suffix=FileSuffix.LOG, path=Path(directory), timestamp=Timestamp(datetime.now(tz=timezone.utc)))
+            throughput = lines_per_second(Logger(file=file, level=LoggerLevel.DEBUG, **options), args.lines)
+            print(f"{name:<18} {throughput:>12,.0f} lines/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark of the Logger calls filtered out by the level: eager f-string, format arguments, message function and is_enabled.
+
+The is_enabled variants time the check alone, with the level given as a LoggerLevel member looked up on its class, a member bound
+to a local variable and a level name, then the check guarding an eager f-string.
+
+The values logged stand for a measurement array, whose repr is the costly part of an eager debug message.
+
+Usage:
+    python benchmarks/bench_logger.py --calls 100000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from e_lims_utils.files.files import FileProperties, FileSuffix
+from e_lims_utils.files.timestamp import Timestamp
+from e_lims_utils.logger.logger import Logger, LoggerLevel
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+def per_call(function: Callable[[], object], calls: int) -> float:
+    """Returns the duration of a call, in nanoseconds.
+
+    Args:
+        function (Callable[[], object]): The call to time.
+        calls (int): The number of calls.
+
+    Returns:
+        float: The mean duration of a call, in nanoseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(calls):
+        function()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def main() -> None:
+    """Times the suppressed debug calls of a WARNING logger and prints the duration per call."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=100000, help="The number of calls per variant.")
+    args = parser.parse_args()
+    values = [index * 0.001 for index in range(1000)]
+    with tempfile.TemporaryDirectory() as directory:
+        file = FileProperties(name="bench_logger", suffix=FileSuffix.LOG, path=Path(directory), timestamp=Timestamp(datetime.now(tz=timezone.utc)))
+        logger = Logger(file=file, level=LoggerLevel.WARNING)
+        debug = LoggerLevel.DEBUG
+        variants: dict[str, Callable[[], object]] = {
+            "empty call": lambda: None,
+            "f-string": lambda: logger.debug(f"Values: {values!r}"),  # noqa: G004
+            "constant": lambda: logger.debug("Values read."),
+            "format arguments": lambda: logger.debug("Values: {!r}", values),  # noqa: PLE1205
+            "message function": lambda: logger.debug(lambda: f"Values: {values!r}"),
+            "is_enabled member": lambda: logger.is_enabled(LoggerLevel.DEBUG),
+            "is_enabled local": lambda: logger.is_enabled(debug),
+            "is_enabled name": lambda: logger.is_enabled("DEBUG"),
+            "is_enabled guard": lambda: logger.is_enabled("DEBUG") and logger.debug(f"Values: {values!r}"),  # noqa: G004
+        }
+        for name, function in variants.items():
+            print(f"{name:<18} {per_call(function, args.calls):>12,.0f} ns/call")
+        logger._logger.remove()  # noqa: SLF001
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark of Crud.reads() with each row format: time and memory per record on a wide table.
+
+Usage:
+    python benchmarks/bench_rows.py --rows 50000
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlmodel import Field
+
+from e_lims_utils.crud.crud import BaseSqlModel, Crud
+from e_lims_utils.crud.rows import RowFactory
+from e_lims_utils.files.files import FileProperties, FileSuffix
+from e_lims_utils.files.timestamp import Timestamp
+from e_lims_utils.logger.logger import Logger, LoggerLevel
+
+
+class WideBenchRecord(BaseSqlModel, table=True):
+    """The SQLModel of the benchmark, a measure with several columns.
+
+    Attributes:
+        uid (int): The unique identifier.
+        instrument (str): The instrument of the measure.
+        channel (int): The channel of the measure.
+        operator (str): The operator of the measure.
+        unit (str): The unit of the value.
+        value (float): The measured value.
+        minimum (float): The lower limit of the value.
+        maximum (float): The upper limit of the value.
+        valid (bool): Whether the value is within the limits.
+    """
+
+    uid: int = Field(default=None, primary_key=True)
+    instrument: str
+    channel: int
+    operator: str
+    unit: str
+    value: float
+    minimum: float
+    maximum: float
+    valid: bool
+
+
+def main() -> None:
+    """Reads the table with each row format and prints the time and memory per record."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000, help="The number of records of the table.")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        file = FileProperties(name="bench_rows", suffix=FileSuffix.LOG, path=Path(directory), timestamp=Timestamp(datetime.now(tz=timezone.utc)))
+        crud = Crud(Logger(file=file, level=LoggerLevel.WARNING), WideBenchRecord, "sqlite:///:memory:")
+        crud.create_table()
+        crud.bulk_creates(
+            [{"instrument": "DMM", "channel": uid % 8, "operator": "Jane", "unit": "V", "value": uid * 0.1, "minimum": 0.0, "maximum": 1e6, "valid": True} for uid in range(args.rows)],
+        )
+        print(f"{'row_factory':<12} {'us/record':>10} {'bytes/record':>13}")
+        for row_factory in RowFactory:
+            gc.collect()
+            tracemalloc.start()
+            start = time.perf_counter()
+            records = crud.reads(row_factory=row_factory)
+            seconds = time.perf_counter() - start
+            memory, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{row_factory.value:<12} {seconds / len(records) * 1e6:>10.2f} {memory / len(records):>13,.0f}")
+            del records
+
+
+if __name__ == "__main__":
+    main()
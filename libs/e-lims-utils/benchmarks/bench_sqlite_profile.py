@@ -0,0 +1,105 @@
+"""Benchmark of the CRUD operations on a SQLite file, with the SQLite defaults and with the SqliteProfile.
+
+Usage:
+    python benchmarks/bench_sqlite_profile.py --rows 10000 --commits 1000
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqlmodel import Field
+
+from e_lims_utils.crud.crud import BaseSqlModel, Crud
+from e_lims_utils.crud.engine import EngineOptions, SqliteProfile, engine_registry
+from e_lims_utils.files.files import FileProperties, FileSuffix
+from e_lims_utils.files.timestamp import Timestamp
+from e_lims_utils.logger.logger import Logger, LoggerLevel
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class BenchRecord(BaseSqlModel, table=True):
+    """The SQLModel of the benchmark.
+
+    Attributes:
+        uid (int): The unique identifier.
+        name (str): The name of the record.
+        age (int): The age of the record.
+    """
+
+    uid: int = Field(default=None, primary_key=True)
+    name: str
+    age: int
+
+
+def timed(operation: Callable[[], object], count: int) -> float:
+    """Runs an operation and returns its throughput.
+
+    Args:
+        operation (Callable[[], object]): The operation to run.
+        count (int): The number of records processed by the operation.
+
+    Returns:
+        float: The number of records processed per second.
+    """
+    start = time.perf_counter()
+    operation()
+    return count / (time.perf_counter() - start)
+
+
+def run(crud: Crud, rows: int, commits: int) -> dict[str, float]:
+    """Runs the CRUD operations on an empty table and returns their throughputs.
+
+    Args:
+        crud (Crud): The Crud object of the table.
+        rows (int): The number of records of the bulk operations.
+        commits (int): The number of single-record transactions.
+
+    Returns:
+        dict[str, float]: The records per second keyed by operation.
+    """
+    crud.create_table()
+    ids = list(range(1, rows + 1))
+    results = {
+        "bulk_creates": timed(lambda: crud.bulk_creates([{"name": f"name-{uid}", "age": uid % 100} for uid in ids]), rows),
+        "create (1 commit each)": timed(lambda: [crud.create(BenchRecord(name="single", age=1)) for _ in range(commits)], commits),
+        "read (by primary key)": timed(lambda: [crud.read(uid) for uid in ids[:commits]], commits),
+        "reads": timed(crud.reads, rows + commits),
+        "read_by_ids": timed(lambda: crud.read_by_ids(ids), rows),
+        "update (1 commit each)": timed(lambda: [crud.update(BenchRecord(uid=uid, name="updated", age=2)) for uid in ids[:commits]], commits),
+        "updates": timed(lambda: crud.updates([{"uid": uid, "age": 3} for uid in ids]), rows),
+        "delete (1 commit each)": timed(lambda: [crud.delete(uid) for uid in ids[:commits]], commits),
+        "delete_by_ids": timed(lambda: crud.delete_by_ids(ids[commits:]), rows - commits),
+    }
+    crud.drop_table()
+    return results
+
+
+def main() -> None:
+    """Runs the benchmark with and without the SQLite profile and prints the throughputs."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="The number of records of the bulk operations.")
+    parser.add_argument("--commits", type=int, default=1000, help="The number of single-record transactions.")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        file = FileProperties(name="bench_sqlite_profile", suffix=FileSuffix.LOG, path=Path(directory), timestamp=Timestamp(datetime.now(tz=timezone.utc)))
+        logger = Logger(file=file, level=LoggerLevel.WARNING)
+        results = {}
+        for name, options in (("default", EngineOptions()), ("profile", EngineOptions(sqlite=SqliteProfile()))):
+            url = f"sqlite:///{Path(directory) / name}.db"
+            results[name] = run(Crud(logger, BenchRecord, url, options), args.rows, args.commits)
+            engine_registry.dispose(url, options)
+    print(f"{'operation':<24} {'default rows/s':>15} {'profile rows/s':>15} {'speedup':>8}")
+    for operation, default in results["default"].items():
+        profile = results["profile"][operation]
+        print(f"{operation:<24} {default:>15,.0f} {profile:>15,.0f} {profile / default:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
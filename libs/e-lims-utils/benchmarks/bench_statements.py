@@ -0,0 +1,61 @@
+"""Microbenchmark of the per-call overhead of the SELECT statements of Crud, built on each call or built once and cached.
+
+Usage:
+    python benchmarks/bench_statements.py --calls 20000
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+
+from sqlmodel import Field, Session, create_engine, select
+
+from e_lims_utils.crud.crud import BaseSqlModel, _select_by, _select_in
+
+
+class StatementBenchRecord(BaseSqlModel, table=True):
+    """The SQLModel of the benchmark.
+
+    Attributes:
+        uid (int): The unique identifier.
+        name (str): The name of the record.
+    """
+
+    uid: int = Field(default=None, primary_key=True)
+    name: str
+
+
+def main() -> None:
+    """Times the reads by primary key, by primary keys and by field with both kinds of statements and prints the cost per call."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="The number of calls per read.")
+    args = parser.parse_args()
+    model = StatementBenchRecord
+    engine = create_engine("sqlite:///:memory:")
+    model.metadata.create_all(engine, tables=[model.__table__])
+    with Session(engine) as session:
+        session.add_all(model(name=f"name-{uid}") for uid in range(100))
+        session.commit()
+        reads = {
+            "read": (
+                lambda: session.exec(select(model).where(model.uid == 1)).first(),
+                lambda: session.exec(_select_by(model, "uid"), params={"value": 1}).first(),
+            ),
+            "read_by_ids": (
+                lambda: session.exec(select(model).where(model.uid.in_([1, 2, 3]))).all(),
+                lambda: session.exec(_select_in(model, "uid"), params={"values": [1, 2, 3]}).all(),
+            ),
+            "read_by_field": (
+                lambda: session.exec(select(model).where(model.name == "name-1")).all(),
+                lambda: session.exec(_select_by(model, "name"), params={"value": "name-1"}).all(),
+            ),
+        }
+        print(f"{'read':<14} {'built us/call':>14} {'cached us/call':>15} {'saved':>7}")
+        for name, (built, cached) in reads.items():
+            built_seconds = min(timeit.repeat(built, number=args.calls, repeat=3)) / args.calls
+            cached_seconds = min(timeit.repeat(cached, number=args.calls, repeat=3)) / args.calls
+            print(f"{name:<14} {built_seconds * 1e6:>14.1f} {cached_seconds * 1e6:>15.1f} {1 - cached_seconds / built_seconds:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
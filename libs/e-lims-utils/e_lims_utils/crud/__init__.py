@@ -2,11 +2,29 @@
 
 The Crud class provides methods to create, read, update, and delete (CRUD) records in a database table.
 It uses SQLAlchemy's Session and Engine to interact with the database.
+The AsyncCrud class provides the same methods as coroutines, using SQLAlchemy's AsyncSession and AsyncEngine.
 
 The BaseSqlModel class serves as a base for all SQLModel classes in the application.
 It includes a primary key field named 'uid'.
 
+The EngineRegistry class shares one engine and connection pool per database URL and EngineOptions across all Crud objects.
+
+The export module reads query results as NumPy arrays, Arrow tables or Parquet files, without creating model instances.
+The read methods return model instances, or with a RowFactory SQLAlchemy rows or generated __slots__ records.
+The loader module streams CSV and Parquet files into a table with the fastest bulk path of the database.
+
 Classes:
     BaseSqlModel: A base class for all SQLModel classes in the application.
     Crud: A class to perform CRUD operations on a SQLModel.
+    AsyncCrud: A class to perform CRUD operations on a SQLModel from asyncio code.
+    EngineOptions: A class used to represent the connection-pool options of an engine.
+    SqliteProfile: A class used to represent the tuning PRAGMAs of the SQLite connections of an engine.
+    EngineRegistry: A class to share engines and their connection pools across the process.
+    RecordCache: A class to cache records by primary key with LRU and TTL eviction.
+    IndexAdvisor: A class to report the columns which are often filtered on but have no index.
+    Predicate: A class used to represent a filter on the records, compiled to a SQL WHERE clause.
+    Query: A class to build and run a SELECT statement on the table of a Crud object.
+    LoadReport: A class used to represent the result of a bulk load.
+    Instrumentation: A class to time the Crud operations and log the slow ones.
+    LatencyHistogram: A class used to represent the distribution of the latencies of an operation.
 """
@@ -0,0 +1,404 @@
+"""AsyncCrud class, the asyncio variant of the Crud class."""
+from __future__ import annotations
+
+import contextlib
+import functools
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import delete, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from e_lims_utils.crud.crud import BULK_CHUNK_SIZE, IDS_CHUNK_SIZE, _chunks, _create_table, _same_keys, _select_all, _select_by, _select_in, _to_row, _where
+from e_lims_utils.crud.engine import EngineOptions, engine_registry
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Mapping, Sequence
+
+    from sqlalchemy import ColumnElement
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+    from e_lims_utils.crud.crud import BaseSqlModel
+    from e_lims_utils.logger.logger import Logger
+
+_async_sessions: ContextVar[dict[AsyncEngine, AsyncSession]] = ContextVar("_async_sessions", default={})
+
+
+class AsyncCrud:
+    """A class to perform CRUD operations on a SQLModel from asyncio code.
+
+    This class provides the same methods as the Crud class as coroutines, built on SQLAlchemy's AsyncEngine and AsyncSession,
+    so that waiting on the database does not block the event loop. The database URL must use an asyncio driver,
+    such as 'sqlite+aiosqlite' or 'postgresql+asyncpg'.
+
+    Attributes:
+        * logger (Logger): The logger used to log messages.
+        * model (BaseSqlModel): The SQLModel class that represents the table in the database.
+        * url (str): The URL of the database, with an asyncio driver.
+        * options (EngineOptions): The connection-pool options of the engine.
+        * engine (AsyncEngine): The SQLAlchemy AsyncEngine used to connect to the database. It's shared by all AsyncCrud objects with the same database URL and options.
+
+    Methods:
+        * __init__(logger: Logger, model: BaseSqlModel, url: str, options: EngineOptions): Initializes the AsyncCrud object with a model and a database URL.
+        * dispose(): Releases the shared engine, and closes its pooled connections if it was the last user.
+        * transaction(): Opens a unit of work in which all the CRUD operations share one session.
+        * create_table(): Creates a table for the model in the database.
+        * drop_table(): Drops the table for the model in the database.
+        * create(data: BaseSqlModel): Creates a new record in the database.
+        * creates(data: list[BaseSqlModel]): Creates multiple new records in the database.
+        * bulk_creates(data: Sequence[BaseSqlModel | dict], chunk_size: int, returning: bool): Creates multiple new records with multi-row INSERT statements.
+        * read(primary_key: int): Reads a record from the database by primary key.
+        * reads(): Reads all records from the database.
+        * iter_reads(batch_size: int, filters: Mapping[str, Any]): Streams the records from the database in batches.
+        * read_page(after_uid: int, limit: int, filters: Mapping[str, Any]): Reads a page of records ordered by primary key.
+        * read_by_ids(primary_keys: list[int]): Reads multiple records from the database by their primary keys.
+        * read_by_field(field: str, value: str): Reads records from the database by a specific field value.
+        * update(data: BaseSqlModel): Updates a record in the database.
+        * update_where(filters: Mapping[str, Any], values: Mapping[str, Any]): Updates the records matching filters in the database.
+        * delete(primary_key: int): Deletes a record from the database by primary key.
+        * delete_where(filters: Mapping[str, Any]): Deletes the records matching filters from the database.
+        * delete_by_ids(ids: list[int]): Deletes multiple records from the database by their primary keys.
+        * delete_by_field(field: str, value: str): Deletes records from the database by a specific field value.
+    """
+
+    def __init__(self, logger: Logger, model: BaseSqlModel, url: str, options: EngineOptions | None = None) -> None:
+        """Initializes the AsyncCrud object with a model and a database URL.
+
+        This method gets the SQLAlchemy AsyncEngine for the provided database URL and options from the process-wide engine registry.
+
+        Args:
+            logger (Logger): The logger used to log messages.
+            model (BaseSqlModel): The SQLModel class that represents the table in the database.
+            url (str): The URL of the database, with an asyncio driver.
+            options (EngineOptions | None): The connection-pool options of the engine, default options if None.
+        """
+        self.logger = logger
+        self.model = model
+        self.url = url
+        self.options = options or EngineOptions()
+        self.engine = engine_registry.acquire_async(self.url, self.options)
+        self._released = False
+
+    async def dispose(self) -> None:
+        """Releases the shared engine, and closes its pooled connections if no other AsyncCrud object uses it.
+
+        The other AsyncCrud objects sharing the engine keep their connections, and with them a SQLite in-memory database.
+        The engine stays in the registry and keeps working with a new pool. Use 'engine_registry.dispose_async' to remove the engine from the registry.
+        """
+        if self._released:
+            return
+        self._released = True
+        if await engine_registry.release_async(self.engine):
+            self.logger.debug("Dispose engine.")
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncSession]:
+        """Opens a unit of work in which all the CRUD operations share one session.
+
+        Every CRUD operation awaited inside the context, on this AsyncCrud object or on any other AsyncCrud object
+        sharing the same engine, reuses the session instead of opening its own.
+        The session is committed once on exit, or rolled back if an exception is raised.
+        Nested calls join the outermost transaction.
+
+        Yields:
+            AsyncSession: The session shared by the CRUD operations of the transaction.
+        """
+        sessions = _async_sessions.get()
+        session = sessions.get(self.engine)
+        if session is not None:
+            yield session
+            return
+        async with AsyncSession(self.engine, expire_on_commit=False) as session:
+            token = _async_sessions.set({**sessions, self.engine: session})
+            try:
+                yield session
+                await session.commit()
+            except BaseException:
+                await session.rollback()
+                raise
+            finally:
+                _async_sessions.reset(token)
+
+    async def create_table(self) -> None:
+        """Creates a table for the model in the database, with the indexes declared by the model, also on a table which already exists."""
+        async with self.engine.begin() as connection:
+            await connection.run_sync(functools.partial(_create_table, self.model))
+        self.logger.debug("Create table.")
+
+    async def drop_table(self) -> None:
+        """Drops the table for the model in the database.
+
+        All data in the table will be lost.
+        """
+        async with self.engine.begin() as connection:
+            await connection.run_sync(self.model.metadata.drop_all)
+        self.logger.debug("Drop table.")
+
+    async def create(self, data: BaseSqlModel) -> None:
+        """Creates a new record in the database.
+
+        The instance is refreshed after the INSERT to update the fields set by the database, such as the primary key.
+
+        Args:
+            data (BaseSqlModel): An instance of the model class with the data for the new record.
+        """
+        async with self.transaction() as session:
+            session.add(data)
+            await session.flush()
+            await session.refresh(data)
+        self.logger.debug("Create record.")
+
+    async def creates(self, data: list[BaseSqlModel]) -> None:
+        """Creates multiple new records in the database.
+
+        Args:
+            data (list[BaseSqlModel]): A list of instances of the model class with the data for the new records.
+        """
+        async with self.transaction() as session:
+            session.add_all(data)
+            await session.flush()
+        self.logger.debug("Create records.")
+
+    async def bulk_creates(self, data: Sequence[BaseSqlModel | dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE, *, returning: bool = False) -> list[int]:
+        """Creates multiple new records in the database with bulk INSERT statements.
+
+        See 'Crud.bulk_creates'.
+
+        Args:
+            data (Sequence[BaseSqlModel | dict[str, Any]]): The records to create, as model instances or as dictionaries of column values.
+            chunk_size (int): The maximum number of rows sent per INSERT statement.
+            returning (bool): If True, the generated primary keys are returned in the order of the input records.
+
+        Returns:
+            list[int]: The primary keys of the created records if 'returning' is True, otherwise an empty list.
+
+        Raises:
+            ValueError: If 'chunk_size' is not a positive integer.
+        """
+        if chunk_size < 1:
+            msg = f"chunk_size must be a positive integer, got {chunk_size}."
+            raise ValueError(msg)
+        table = self.model.__table__
+        primary_keys: list[int] = []
+        async with self.transaction() as session:
+            connection = await session.connection()
+            for chunk in _chunks([_to_row(self.model, record) for record in data], chunk_size):
+                for rows in _same_keys(chunk):
+                    if not returning:
+                        await connection.execute(table.insert(), rows)
+                    elif self.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+                        result = await connection.execute(table.insert().returning(table.c.uid, sort_by_parameter_order=True), rows)
+                        primary_keys.extend(result.scalars().all())
+                    else:
+                        for row in rows:
+                            result = await connection.execute(table.insert(), row)
+                            primary_keys.append(result.inserted_primary_key[0])
+        self.logger.debug("Bulk create records.")
+        return primary_keys
+
+    async def read(self, primary_key: int) -> BaseSqlModel:
+        """Reads a record from the database by primary key.
+
+        Args:
+            primary_key (int): The primary key of the record to read.
+
+        Returns:
+            BaseSqlModel: The record read from the database, or None if no record was found.
+        """
+        async with self.transaction() as session:
+            read = (await session.exec(_select_by(self.model, "uid"), params={"value": primary_key})).first()
+            self.logger.debug("Read record.")
+            return read
+
+    async def reads(self) -> list[BaseSqlModel]:
+        """Reads all records from the database.
+
+        Returns:
+            list[BaseSqlModel]: A list of all records from the database.
+        """
+        async with self.transaction() as session:
+            reads = (await session.exec(_select_all(self.model))).all()
+            self.logger.debug("Read records.")
+            return reads
+
+    async def iter_reads(self, batch_size: int = BULK_CHUNK_SIZE, filters: Mapping[str, Any] | None = None) -> AsyncIterator[BaseSqlModel]:
+        """Streams the records from the database.
+
+        The results are fetched in batches of 'batch_size' rows, using a server-side cursor where the backend supports it.
+        The stream uses its own session, unless it runs inside a transaction.
+
+        Args:
+            batch_size (int): The number of rows fetched per batch.
+            filters (Mapping[str, Any] | None): The field values the records must be equal to, combined with AND.
+
+        Yields:
+            BaseSqlModel: The next record read from the database.
+        """
+        statement = select(self.model).where(*_where(self.model, filters or {})).execution_options(yield_per=batch_size)
+        session = _async_sessions.get().get(self.engine)
+        async with contextlib.AsyncExitStack() as stack:
+            if session is None:
+                session = await stack.enter_async_context(AsyncSession(self.engine))
+            async for record in await session.stream_scalars(statement):
+                yield record
+        self.logger.debug("Stream records.")
+
+    async def read_page(self, after_uid: int | None = None, limit: int = 100, filters: Mapping[str, Any] | None = None) -> list[BaseSqlModel]:
+        """Reads a page of records ordered by primary key, with keyset pagination.
+
+        Args:
+            after_uid (int | None): The primary key after which the page starts, None for the first page.
+            limit (int): The maximum number of records in the page.
+            filters (Mapping[str, Any] | None): The field values the records must be equal to, combined with AND.
+
+        Returns:
+            list[BaseSqlModel]: The records of the page, an empty list after the last page.
+        """
+        statement = select(self.model).where(*_where(self.model, filters or {}))
+        if after_uid is not None:
+            statement = statement.where(self.model.uid > after_uid)
+        async with self.transaction() as session:
+            reads = (await session.exec(statement.order_by(self.model.uid).limit(limit))).all()
+            self.logger.debug("Read page of records.")
+            return reads
+
+    async def read_by_ids(self, primary_keys: list[int], chunk_size: int = IDS_CHUNK_SIZE, *, as_mapping: bool = False) -> list[BaseSqlModel] | dict[int, BaseSqlModel]:
+        """Reads multiple records from the database by their primary keys, one IN (...) clause per chunk of 'chunk_size' keys.
+
+        Args:
+            primary_keys (list[int]): The primary keys of the records to read.
+            chunk_size (int): The maximum number of primary keys per SELECT statement.
+            as_mapping (bool): If True, the records are returned as a dictionary keyed by primary key.
+
+        Returns:
+            list[BaseSqlModel] | dict[int, BaseSqlModel]: The records read from the database, in the order of the primary keys.
+                Primary keys without a record are skipped.
+
+        Raises:
+            ValueError: If 'chunk_size' is not a positive integer.
+        """
+        if chunk_size < 1:
+            msg = f"chunk_size must be a positive integer, got {chunk_size}."
+            raise ValueError(msg)
+        records: dict[int, BaseSqlModel] = {}
+        async with self.transaction() as session:
+            for chunk in _chunks(list(dict.fromkeys(primary_keys)), chunk_size):
+                records.update((record.uid, record) for record in await session.exec(_select_in(self.model, "uid"), params={"values": chunk}))
+            self.logger.debug("Read records by primary_keys.")
+        if as_mapping:
+            return {primary_key: records[primary_key] for primary_key in primary_keys if primary_key in records}
+        return [records[primary_key] for primary_key in primary_keys if primary_key in records]
+
+    async def read_by_field(self, field: str, value: str | None) -> list[BaseSqlModel]:
+        """Reads records from the database by a specific field value.
+
+        Args:
+            field (str): The field to filter records by.
+            value (str | None): The value to filter records by, None for the NULL values.
+
+        Returns:
+            list[BaseSqlModel]: A list of the records read from the database.
+        """
+        async with self.transaction() as session:
+            reads = (await session.exec(_select_by(self.model, field, null=value is None), params={"value": value})).all()
+            self.logger.debug("Records read by field.")
+            return reads
+
+    async def update(self, data: BaseSqlModel) -> None:
+        """Updates a record in the database with a single UPDATE statement filtered by its primary key.
+
+        Args:
+            data (BaseSqlModel): An instance of the model class with the updated data for the record.
+        """
+        await self.update_where({"uid": data.uid}, {field: value for field, value in data if field != "uid"})
+        self.logger.debug("Update record")
+
+    async def update_where(self, filters: Mapping[str, Any], values: Mapping[str, Any]) -> int:
+        """Updates the records matching filters in the database with a single UPDATE ... WHERE statement.
+
+        Args:
+            filters (Mapping[str, Any]): The field values the records must be equal to, combined with AND.
+            values (Mapping[str, Any]): The new field values of the records.
+
+        Returns:
+            int: The number of records updated.
+        """
+        async with self.transaction() as session:
+            result = await session.execute(update(self.model).where(*_where(self.model, filters)).values(**values), execution_options={"synchronize_session": False})
+            session.expire_all()
+        self.logger.debug("Update records where.")
+        return result.rowcount
+
+    async def delete(self, primary_key: int) -> None:
+        """Deletes a record from the database by primary key with a single DELETE statement.
+
+        Args:
+            primary_key (int): The primary key of the record to delete.
+        """
+        await self._delete(self.model.uid == primary_key)
+        self.logger.debug("Delete record.")
+
+    async def delete_where(self, filters: Mapping[str, Any]) -> int:
+        """Deletes the records matching filters from the database with a single DELETE ... WHERE statement.
+
+        Args:
+            filters (Mapping[str, Any]): The field values the records must be equal to, combined with AND.
+
+        Returns:
+            int: The number of records deleted.
+        """
+        deleted = await self._delete(*_where(self.model, filters))
+        self.logger.debug("Delete records where.")
+        return deleted
+
+    async def delete_by_ids(self, ids: list[int], chunk_size: int = IDS_CHUNK_SIZE) -> int:
+        """Deletes multiple records from the database by their primary keys, one DELETE statement per chunk of 'chunk_size' keys, in one transaction.
+
+        Args:
+            ids (list[int]): The primary keys of the records to delete.
+            chunk_size (int): The maximum number of primary keys per DELETE statement.
+
+        Returns:
+            int: The number of records deleted.
+
+        Raises:
+            ValueError: If 'chunk_size' is not a positive integer.
+        """
+        if chunk_size < 1:
+            msg = f"chunk_size must be a positive integer, got {chunk_size}."
+            raise ValueError(msg)
+        deleted = 0
+        async with self.transaction():
+            for chunk in _chunks(list(dict.fromkeys(ids)), chunk_size):
+                deleted += await self._delete(self.model.uid.in_(chunk))
+        self.logger.debug("Delete records by primary_keys.")
+        return deleted
+
+    async def delete_by_field(self, field: str, value: str) -> int:
+        """Deletes records from the database by a specific field value with a single DELETE statement.
+
+        Args:
+            field (str): The field to filter records by.
+            value (str): The value to filter records by.
+
+        Returns:
+            int: The number of records deleted.
+        """
+        deleted = await self._delete(*_where(self.model, {field: value}))
+        self.logger.debug("Delete records by field.")
+        return deleted
+
+    async def _delete(self, *clauses: ColumnElement[bool]) -> int:
+        """Deletes the records matching all the clauses with a single DELETE statement.
+
+        Args:
+            *clauses (ColumnElement[bool]): The WHERE clauses, combined with AND.
+
+        Returns:
+            int: The number of records deleted.
+        """
+        async with self.transaction() as session:
+            result = await session.execute(delete(self.model).where(*clauses), execution_options={"synchronize_session": False})
+            session.expire_all()
+        return result.rowcount
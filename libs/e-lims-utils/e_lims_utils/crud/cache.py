@@ -0,0 +1,124 @@
+"""RecordCache class, a size-bounded LRU cache with TTL eviction for records read by primary key."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+
+class RecordCache:
+    """A class to cache records by primary key with LRU and TTL eviction.
+
+    The cache keeps at most 'maxsize' records: when it's full, the least recently used record is evicted.
+    A record older than 'ttl' seconds is evicted when it's read. The cache is thread safe.
+
+    Attributes:
+        * maxsize (int): The maximum number of records in the cache.
+        * ttl (float | None): The number of seconds a record stays valid, None to never expire.
+        * hits (int): The number of reads which found a valid record.
+        * misses (int): The number of reads which found no record or an expired one.
+        * evictions (int): The number of records evicted because the cache was full or the record expired.
+
+    Methods:
+        * get(key: Hashable): Returns the cached record for a key, or None.
+        * put(key: Hashable, record: Any): Caches a record for a key.
+        * invalidate(key: Hashable): Removes the record for a key.
+        * clear(): Removes all the records.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initializes the RecordCache object.
+
+        Args:
+            maxsize (int): The maximum number of records in the cache.
+            ttl (float | None): The number of seconds a record stays valid, None to never expire.
+            clock (Callable[[], float]): The clock used to date the records, in seconds.
+
+        Raises:
+            ValueError: If 'maxsize' is not a positive integer.
+        """
+        if maxsize < 1:
+            msg = f"maxsize must be a positive integer, got {maxsize}."
+            raise ValueError(msg)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._clock = clock
+        self._records: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Returns the number of records in the cache.
+
+        Returns:
+            int: The number of records in the cache, including the expired ones not evicted yet.
+        """
+        return len(self._records)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Returns the ratio of reads which found a valid record.
+
+        Returns:
+            float: The ratio of hits over reads, 0.0 before the first read.
+        """
+        reads = self.hits + self.misses
+        return self.hits / reads if reads else 0.0
+
+    def get(self, key: Hashable) -> Any:  # noqa: ANN401
+        """Returns the cached record for a key, or None.
+
+        Args:
+            key (Hashable): The key of the record, usually its primary key.
+
+        Returns:
+            Any: The cached record, or None if it's not cached or expired.
+        """
+        with self._lock:
+            entry = self._records.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, record = entry
+            if self.ttl is not None and self._clock() - stored_at > self.ttl:
+                del self._records[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self._records.move_to_end(key)
+            self.hits += 1
+            return record
+
+    def put(self, key: Hashable, record: Any) -> None:  # noqa: ANN401
+        """Caches a record for a key, evicting the least recently used record if the cache is full.
+
+        Args:
+            key (Hashable): The key of the record, usually its primary key.
+            record (Any): The record to cache.
+        """
+        with self._lock:
+            self._records[key] = (self._clock(), record)
+            self._records.move_to_end(key)
+            if len(self._records) > self.maxsize:
+                self._records.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Removes the record for a key.
+
+        Args:
+            key (Hashable): The key of the record, usually its primary key.
+        """
+        with self._lock:
+            self._records.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all the records, the counters are kept."""
+        with self._lock:
+            self._records.clear()
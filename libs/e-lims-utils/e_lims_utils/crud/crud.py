@@ -1,13 +1,48 @@
 """Crud class and the BaseSqlModel class."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import contextlib
+import functools
+import itertools
+import time
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
 
-from sqlmodel import Field, Session, SQLModel, create_engine, select
+from sqlalchemy import bindparam, delete, func, inspect, update
+from sqlalchemy import exists as sa_exists
+from sqlalchemy import select as sa_select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Field, Session, SQLModel, select
+
+from e_lims_utils.crud import export, loader
+from e_lims_utils.crud.engine import EngineOptions, engine_registry
+from e_lims_utils.crud.indexes import IndexAdvisor, declared_indexes
+from e_lims_utils.crud.instrumentation import instrumented
+from e_lims_utils.crud.loader import FileFormat, LoadReport
+from e_lims_utils.crud.query import Aggregate, Operator, Predicate, Query
+from e_lims_utils.crud.rows import RowFactory, convert_rows
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+    from pathlib import Path
+
+    import numpy as np
+    import pyarrow as pa
+    from sqlalchemy import ColumnElement, Connection, Engine, Select
+
+    from e_lims_utils.crud.cache import RecordCache
+    from e_lims_utils.crud.instrumentation import Instrumentation
     from e_lims_utils.logger.logger import Logger
 
+BULK_CHUNK_SIZE = 1000
+IDS_CHUNK_SIZE = 900  # Below the default limit of 999 bound parameters of SQLite before 3.32.
+
+_T = TypeVar("_T")
+
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+_sessions: ContextVar[dict[Engine, Session]] = ContextVar("_sessions", default={})
+
 
 class BaseSqlModel(SQLModel):
     """Base SQL model with a primary key.
@@ -15,11 +50,39 @@ class BaseSqlModel(SQLModel):
     This class serves as a base for all SQLModel classes in the application.
     It includes a primary key field named 'uid'.
 
+    Single-column indexes are declared with 'Field(index=True)'. Composite indexes are declared with the '__indexes__'
+    class attribute, a tuple of column-name tuples, and created by 'Crud.create_table'.
+    The '__natural_key__' class attribute declares the columns identifying a record besides 'uid', used by 'Crud.upserts';
+    a unique index is created on them.
+
+    Examples:
+        >>> class Reading(
+        ...     BaseSqlModel,
+        ...     table=True,
+        ... ):  # doctest: +SKIP
+        ...     __indexes__ = (
+        ...         (
+        ...             "instrument",
+        ...             "timestamp",
+        ...         ),
+        ...     )
+        ...     __natural_key__ = (
+        ...         "instrument",
+        ...         "timestamp",
+        ...     )
+        ...     instrument: str = Field(
+        ...         index=True
+        ...     )
+        ...     timestamp: datetime
+        ...     value: float
+
     Attributes:
         uid (int): An integer that represents the primary key. It's the unique identifier for each record in the table.
     """
 
     __table_args__ = {"extend_existing": True}  # noqa: RUF012
+    __indexes__: ClassVar[tuple[tuple[str, ...], ...]] = ()
+    __natural_key__: ClassVar[tuple[str, ...]] = ()
     uid: int = Field(default=None, primary_key=True)
 
 
@@ -33,45 +96,156 @@ class Crud:
         * logger (Logger): The logger used to log messages. It's created from the provided logger class.
         * model (BaseSqlModel): The SQLModel class that represents the table in the database. This is the class that will be used to create, read, update, and delete records.
         * url (str): The URL of the database. This should be a string that SQLAlchemy can recognize as a valid database URL.
-        * engine (Engine): The SQLAlchemy Engine used to connect to the database. It's created from the provided database URL.
+        * options (EngineOptions): The connection-pool options of the engine.
+        * engine (Engine): The SQLAlchemy Engine used to connect to the database. It's shared by all Crud objects with the same database URL and options.
+        * cache (RecordCache | None): The optional read-through cache of the records read by primary key.
+        * index_advisor (IndexAdvisor): The advisor reporting the columns filtered on by the read, query, update and delete methods which have no index.
+        * instrumentation (Instrumentation | None): The optional instrumentation timing the CRUD operations, with their rows and SQL statements.
 
     Methods:
-        * __init__(logger: Logger, model: BaseSqlModel, url: str): Initializes the Crud object with a model and a database URL.
+        * __init__(logger: Logger, model: BaseSqlModel, url: str, options: EngineOptions, cache: RecordCache, instrumentation: Instrumentation): Initializes the Crud object with a model and a database URL.
+        * dispose(): Releases the shared engine, and closes its pooled connections if it was the last user.
+        * transaction(): Opens a unit of work in which all the CRUD operations share one session.
         * create(data: BaseSqlModel): Creates a new record in the database.
         * read(primary_key: int): Reads a record from the database by primary key.
         * update(data: BaseSqlModel): Updates a record in the database.
+        * updates(data: Sequence[BaseSqlModel | dict], chunk_size: int): Updates the changed columns of multiple records by primary key, in one transaction.
+        * update_where(filters: Mapping[str, Any], values: Mapping[str, Any]): Updates the records matching filters in the database.
         * delete(primary_key: int): Deletes a record from the database by primary key.
+        * delete_where(filters: Mapping[str, Any]): Deletes the records matching filters from the database.
         * creates(data: list[BaseSqlModel]): Creates multiple new records in the database.
+        * bulk_creates(data: Sequence[BaseSqlModel | dict], chunk_size: int, returning: bool): Creates multiple new records with multi-row INSERT statements.
+        * upsert(data: BaseSqlModel | dict, key: Sequence[str]): Creates a record, or updates it if a record with the same key already exists.
+        * upserts(data: Sequence[BaseSqlModel | dict], chunk_size: int, key: Sequence[str]): Creates or updates multiple records with INSERT ... ON CONFLICT statements.
+        * load_file(path: Path, file_format: FileFormat, chunk_size: int): Loads the records of a CSV or Parquet file with the fastest bulk path of the database.
         * reads(): Reads all records from the database.
-        * read_by_ids(primary_keys: list[int]): Reads multiple records from the database by their primary keys.
+        * iter_reads(batch_size: int, filters: Mapping[str, Any]): Streams the records from the database in batches.
+        * read_page(after_uid: int, limit: int, filters: Mapping[str, Any]): Reads a page of records ordered by primary key.
+        * read_by_ids(primary_keys: list[int], chunk_size: int, as_mapping: bool): Reads multiple records from the database by their primary keys.
         * read_by_field(field: str, value: str): Reads records from the database by a specific field value.
-        * delete_by_ids(ids: list[int]): Deletes multiple records from the database by their primary keys.
+        * query(): Returns a query on the table, to filter, order, paginate and project records in the database.
+        * count(filters: Mapping[str, Any]): Counts the records matching filters.
+        * exists(filters: Mapping[str, Any]): Checks if a record matches filters.
+        * aggregate(column: str, funcs: Sequence[Aggregate], group_by: Sequence[str], filters: Mapping[str, Any]): Aggregates a column per group in SQL.
+        * iter_columns(query: Query, chunk_size: int): Streams the results of a query as chunks of columns.
+        * to_arrays(query: Query, chunk_size: int): Reads the results of a query as one NumPy array per column.
+        * to_arrow(query: Query, chunk_size: int): Reads the results of a query as an Arrow table.
+        * write_parquet(path: Path, query: Query, chunk_size: int): Writes the results of a query to a Parquet file.
+        * delete_by_ids(ids: list[int], chunk_size: int): Deletes multiple records from the database by their primary keys.
         * delete_by_field(field: str, value: str): Deletes records from the database by a specific field value.
     """
 
-    def __init__(self, logger: Logger, model: BaseSqlModel, url: str) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        logger: Logger,
+        model: BaseSqlModel,
+        url: str,
+        options: EngineOptions | None = None,
+        cache: RecordCache | None = None,
+        *,
+        instrumentation: Instrumentation | None = None,
+    ) -> None:
         """Initializes the Crud object with a model and a database URL.
 
-        This method creates an SQLAlchemy Engine from the provided database URL and assigns it to the 'engine' attribute.
-        It also assigns the provided model to the 'model' attribute.
+        This method gets the SQLAlchemy Engine for the provided database URL and options from the process-wide engine registry
+        and assigns it to the 'engine' attribute. It also assigns the provided model to the 'model' attribute.
 
         Args:
             logger (Logger): The logger used to log messages. It's created from the provided logger class.
             model (BaseSqlModel): The SQLModel class that represents the table in the database. This is the class that will be used to create, read, update, and delete records.
             url (str): The URL of the database. This should be a string that SQLAlchemy can recognize as a valid database URL.
+            options (EngineOptions | None): The connection-pool options of the engine, default options if None.
+            cache (RecordCache | None): The read-through cache of the records read by primary key, no caching if None.
+                The cache is invalidated by the update and delete methods of this Crud object only.
+            instrumentation (Instrumentation | None): The instrumentation timing the CRUD operations and logging the slow ones, no timing if None.
         """
         self.logger = logger
         self.model = model
         self.url = url
-        self.engine = create_engine(self.url)
+        self.options = options or EngineOptions()
+        self.engine = engine_registry.acquire(self.url, self.options)
+        self._released = False
+        self.cache = cache
+        self.index_advisor = IndexAdvisor(logger, model.__table__)
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            instrumentation.attach(self.engine)
+
+    def dispose(self) -> None:
+        """Releases the shared engine, and closes its pooled connections if no other Crud object uses it.
+
+        The other Crud objects sharing the engine keep their connections, and with them a SQLite in-memory database.
+        The engine stays in the registry and keeps working with a new pool, which opens connections on demand.
+        Use 'engine_registry.dispose' to remove the engine from the registry.
+        """
+        if self._released:
+            return
+        self._released = True
+        if engine_registry.release(self.engine):
+            self.logger.debug("Dispose engine.")
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[Session]:
+        """Opens a unit of work in which all the CRUD operations share one session.
+
+        Every CRUD operation called inside the context, on this Crud object or on any other Crud object
+        sharing the same engine, reuses the session and its connection instead of opening its own.
+        The session is committed once on exit, or rolled back if an exception is raised.
+        Nested calls join the outermost transaction.
+
+        Examples:
+            >>> with samples.transaction():  # doctest: +SKIP
+            ...     samples.create(
+            ...         sample
+            ...     )
+            ...     measurements.creates(
+            ...         measurements_of_sample
+            ...     )
+
+        Yields:
+            Session: The session shared by the CRUD operations of the transaction.
+        """
+        sessions = _sessions.get()
+        session = sessions.get(self.engine)
+        if session is not None:
+            yield session
+            return
+        with Session(self.engine, expire_on_commit=False) as session:
+            token = _sessions.set({**sessions, self.engine: session})
+            try:
+                yield session
+                session.commit()
+            except BaseException:
+                session.rollback()
+                raise
+            finally:
+                _sessions.reset(token)
+
+    @contextlib.contextmanager
+    def _read_session(self) -> Iterator[Session]:
+        """Yields the session of the current transaction, or a new session which is not shared.
+
+        Unlike 'transaction', the new session is not registered for the other CRUD operations,
+        so it can be held open across the yields of a generator.
+
+        Yields:
+            Session: The session to read records with.
+        """
+        session = _sessions.get().get(self.engine)
+        if session is not None:
+            yield session
+            return
+        with Session(self.engine) as session:
+            yield session
 
     def create_table(self) -> None:
         """Creates a table for the model in the database.
 
         This method uses the 'metadata.create_all' method of the model class to create a table in the database.
         The table will have columns that correspond to the fields of the model class.
+        The indexes declared by the model are created as well, including on a table which already exists.
         """
-        self.model.metadata.create_all(self.engine)
+        _create_table(self.model, self.engine)
         self.logger.debug("Create table.")
 
     def drop_table(self) -> None:
@@ -83,86 +257,324 @@ class Crud:
         self.model.metadata.drop_all(self.engine)
         self.logger.debug("Drop table.")
 
+    @instrumented
     def create(self, data: BaseSqlModel) -> None:
         """Creates a new record in the database.
 
         This method takes an instance of the model class, adds it to the current session,
-        and commits the session to add the record to the database. After committing, it refreshes
+        and flushes the session to add the record to the database. After flushing, it refreshes
         the instance to update any fields that were automatically set by the database, such as auto-incrementing primary keys.
+        The record is committed on exit, or with the enclosing transaction.
 
         Args:
             data (BaseSqlModel): An instance of the model class with the data for the new record. This instance will be added to the session and committed to the database.
         """
-        with Session(self.engine) as session:
+        with self.transaction() as session:
             session.add(data)
-            session.commit()
+            session.flush()
             session.refresh(data)
         self.logger.debug("Create record.")
 
+    @instrumented
     def creates(self, data: list[BaseSqlModel]) -> None:
         """Creates multiple new records in the database.
 
         This method takes a list of instances of the model class, adds each of them to the current session,
-        and commits the session to add the records to the database.
+        and commits the session, or the enclosing transaction, to add the records to the database.
 
         Args:
             data (list[BaseSqlModel]): A list of instances of the model class with the data for the new records.
         """
-        with Session(self.engine) as session:
-            for record in data:
-                session.add(record)
-            session.commit()
+        with self.transaction() as session:
+            session.add_all(data)
+            session.flush()
         self.logger.debug("Create records.")
 
-    def read(self, primary_key: int) -> BaseSqlModel:
+    @instrumented
+    def bulk_creates(self, data: Sequence[BaseSqlModel | dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE, *, returning: bool = False) -> list[int]:
+        """Creates multiple new records in the database with bulk INSERT statements.
+
+        Unlike 'creates', the records are not tracked by the ORM session: they are converted to plain rows
+        and sent in chunks of 'chunk_size' rows, each chunk as one executemany / multi-row INSERT statement.
+        All chunks are committed in a single transaction, or with the enclosing transaction. The given model instances are not refreshed.
+
+        Args:
+            data (Sequence[BaseSqlModel | dict[str, Any]]): The records to create, as model instances or as dictionaries of column values.
+            chunk_size (int): The maximum number of rows sent per INSERT statement.
+            returning (bool): If True, the generated primary keys are returned in the order of the input records.
+                RETURNING is used when the backend supports it, otherwise the rows are inserted one by one.
+
+        Returns:
+            list[int]: The primary keys of the created records if 'returning' is True, otherwise an empty list.
+
+        Raises:
+            ValueError: If 'chunk_size' is not a positive integer.
+        """
+        if chunk_size < 1:
+            msg = f"chunk_size must be a positive integer, got {chunk_size}."
+            raise ValueError(msg)
+        table = self.model.__table__
+        primary_keys: list[int] = []
+        with self.transaction() as session:
+            connection = session.connection()
+            for chunk in _chunks([_to_row(self.model, record) for record in data], chunk_size):
+                for rows in _same_keys(chunk):
+                    if not returning:
+                        connection.execute(table.insert(), rows)
+                    elif self.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+                        result = connection.execute(table.insert().returning(table.c.uid, sort_by_parameter_order=True), rows)
+                        primary_keys.extend(result.scalars().all())
+                    else:
+                        primary_keys.extend(connection.execute(table.insert(), row).inserted_primary_key[0] for row in rows)
+        self.logger.debug("Bulk create records.")
+        return primary_keys
+
+    @instrumented
+    def upsert(self, data: BaseSqlModel | dict[str, Any], key: Sequence[str] | None = None) -> None:
+        """Creates a record, or updates it if a record with the same key already exists.
+
+        See 'upserts'.
+
+        Args:
+            data (BaseSqlModel | dict[str, Any]): The record to create or update, as a model instance or as a dictionary of column values.
+            key (Sequence[str] | None): The columns identifying the record, the natural key of the model or 'uid' if None.
+        """
+        self.upserts([data], key=key)
+
+    @instrumented
+    def upserts(self, data: Sequence[BaseSqlModel | dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE, key: Sequence[str] | None = None) -> None:
+        """Creates multiple records, or updates the ones for which a record with the same key already exists.
+
+        This method issues INSERT ... ON CONFLICT (key) DO UPDATE statements, one executemany per chunk of 'chunk_size' records,
+        in a single transaction, so that re-sending the same records is idempotent and costs no extra round-trip.
+        The key columns must be the primary key or have a unique index, such as the one created for the natural key of the model.
+        Only SQLite and PostgreSQL are supported.
+
+        Args:
+            data (Sequence[BaseSqlModel | dict[str, Any]]): The records to create or update, as model instances or as dictionaries of column values.
+            chunk_size (int): The maximum number of records sent per statement.
+            key (Sequence[str] | None): The columns identifying the records, the natural key of the model or 'uid' if None.
+
+        Raises:
+            ValueError: If 'chunk_size' is not a positive integer.
+            NotImplementedError: If the database is neither SQLite nor PostgreSQL.
+        """
+        if chunk_size < 1:
+            msg = f"chunk_size must be a positive integer, got {chunk_size}."
+            raise ValueError(msg)
+        insert = _UPSERT_INSERTS.get(self.engine.dialect.name)
+        if insert is None:
+            msg = f"Upsert is not supported by the '{self.engine.dialect.name}' database."
+            raise NotImplementedError(msg)
+        key = tuple(key or self.model.__natural_key__ or ("uid",))
+        rows = [_to_row(self.model, record) for record in data]
+        with self.transaction() as session:
+            connection = session.connection()
+            for chunk in _chunks(rows, chunk_size):
+                for same_keys_rows in _same_keys(chunk):
+                    statement = insert(self.model.__table__)
+                    updated = {column: statement.excluded[column] for column in same_keys_rows[0] if column not in key and column != "uid"}
+                    on_conflict = statement.on_conflict_do_update(index_elements=key, set_=updated) if updated else statement.on_conflict_do_nothing(index_elements=key)
+                    connection.execute(on_conflict, same_keys_rows)
+            session.expire_all()
+        if key == ("uid",):
+            for row in rows:
+                if "uid" in row:
+                    self._invalidate(row["uid"])
+        else:
+            self._invalidate(None)
+        self.logger.debug("Upsert records.")
+
+    @instrumented
+    def load_file(self, path: Path, file_format: FileFormat | None = None, chunk_size: int = BULK_CHUNK_SIZE) -> LoadReport:
+        """Loads the records of a CSV or Parquet file into the table.
+
+        The file is streamed in chunks of 'chunk_size' rows and its values are validated and converted to the types of the columns
+        a whole column at a time, without creating model instances. The columns of the file must be columns of the table,
+        a CSV file must start with a header row of column names, and an empty CSV value is NULL for a nullable column.
+        On PostgreSQL with psycopg or psycopg2, the chunks are sent with COPY ... FROM STDIN, otherwise with executemany INSERT statements.
+        All the chunks are loaded in a single transaction, or with the enclosing transaction. The throughput is logged.
+
+        Args:
+            path (Path): The path of the file.
+            file_format (FileFormat | None): The format of the file, guessed from its suffix if None. Parquet requires PyArrow.
+            chunk_size (int): The number of rows read and sent per chunk.
+
+        Returns:
+            LoadReport: The number of rows loaded, the duration and the throughput of the load.
+
+        Raises:
+            ValueError: If 'chunk_size' is not a positive integer, the format is not supported, or a value is invalid for its column.
+        """
+        if chunk_size < 1:
+            msg = f"chunk_size must be a positive integer, got {chunk_size}."
+            raise ValueError(msg)
+        file_format = file_format or FileFormat.from_path(path)
+        table = self.model.__table__
+        copy = self.engine.dialect.name == "postgresql" and self.engine.dialect.driver in ("psycopg", "psycopg2")
+        rows = 0
+        start = time.perf_counter()
+        with self.transaction() as session:
+            connection = session.connection()
+            for chunk in loader.read_chunks(path, table, file_format, chunk_size):
+                (loader.copy_rows if copy else loader.insert_rows)(connection, table, chunk)
+                rows += len(next(iter(chunk.values()), ()))
+            session.expire_all()
+        self._invalidate(None)
+        report = LoadReport(path, rows, time.perf_counter() - start)
+        self.logger.info(report.__str__)
+        return report
+
+    @instrumented
+    def read(self, primary_key: int, *, row_factory: RowFactory = RowFactory.MODEL) -> BaseSqlModel | Any:  # noqa: ANN401
         """Reads a record from the database by primary key.
 
         This method executes a SELECT statement on the table represented by the model class,
         filtering by the primary key. It returns the first result.
+        With a cache, a valid cached record is returned without querying the database, and the records read
+        outside of a transaction are cached. The cache keeps the field values of a record, and each read from the cache
+        returns a new model instance, so that a caller modifying its record doesn't modify the records of the other callers.
+        Only model instances are cached.
 
         Args:
             primary_key (int): The primary key of the record to read.
+            row_factory (RowFactory): The format of the records: model instances, or SQLAlchemy rows or __slots__ records without validation.
 
         Returns:
-            BaseSqlModel: The record read from the database, or None if no record was found.
+            BaseSqlModel | Any: The record read from the database, or None if no record was found.
         """
-        with Session(self.engine) as session:
-            read = session.exec(select(self.model).where(self.model.uid == primary_key)).first()
+        cacheable = self.cache is not None and row_factory is RowFactory.MODEL and self.engine not in _sessions.get()
+        if cacheable:
+            values = self.cache.get(primary_key)
+            if values is not None:
+                self.logger.debug("Read cached record.")
+                return self.model.model_validate(values)
+        with self.transaction() as session:
+            read = next(self._select(session, _select_by(self.model, "uid", columns=row_factory is not RowFactory.MODEL), row_factory, {"value": primary_key}), None)
             self.logger.debug("Read record.")
-            return read
+        if cacheable and read is not None:
+            self.cache.put(primary_key, read.model_dump())
+        return read
 
-    def reads(self) -> list[BaseSqlModel]:
+    @instrumented
+    def reads(self, *, row_factory: RowFactory = RowFactory.MODEL) -> list[BaseSqlModel] | list[Any]:
         """Reads all records from the database.
 
         This method executes a SELECT statement on the table represented by the model class without any filters.
         It returns all results.
 
+        Args:
+            row_factory (RowFactory): The format of the records: model instances, or SQLAlchemy rows or __slots__ records without validation.
+
         Returns:
-            list[BaseSqlModel]: A list of all records from the database.
+            list[BaseSqlModel] | list[Any]: A list of all records from the database.
         """
-        with Session(self.engine) as session:
-            reads = session.exec(select(self.model)).all()
+        with self.transaction() as session:
+            reads = list(self._select(session, _select_all(self.model, columns=row_factory is not RowFactory.MODEL), row_factory))
             self.logger.debug("Read records.")
             return reads
 
-    def read_by_ids(self, primary_keys: list[int]) -> list[BaseSqlModel]:
+    @instrumented
+    def iter_reads(
+        self,
+        batch_size: int = BULK_CHUNK_SIZE,
+        filters: Mapping[str, Any] | Predicate | None = None,
+        *,
+        row_factory: RowFactory = RowFactory.MODEL,
+    ) -> Iterator[BaseSqlModel | Any]:
+        """Streams the records from the database.
+
+        This method executes a SELECT statement on the table represented by the model class and fetches the results
+        in batches of 'batch_size' rows, using a server-side cursor where the backend supports it,
+        so that memory stays flat whatever the size of the table.
+
+        Args:
+            batch_size (int): The number of rows fetched per batch.
+            filters (Mapping[str, Any] | Predicate | None): The field values the records must be equal to, combined with AND, or a predicate.
+            row_factory (RowFactory): The format of the records: model instances, or SQLAlchemy rows or __slots__ records without validation.
+
+        Yields:
+            BaseSqlModel | Any: The next record read from the database.
+        """
+        statement = _select_all(self.model, columns=row_factory is not RowFactory.MODEL).where(*self._filter(filters or {})).execution_options(yield_per=batch_size)
+        with self._read_session() as session:
+            yield from self._select(session, statement, row_factory)
+        self.logger.debug("Stream records.")
+
+    @instrumented
+    def read_page(
+        self,
+        after_uid: int | None = None,
+        limit: int = 100,
+        filters: Mapping[str, Any] | Predicate | None = None,
+        *,
+        row_factory: RowFactory = RowFactory.MODEL,
+    ) -> list[BaseSqlModel] | list[Any]:
+        """Reads a page of records ordered by primary key.
+
+        This method uses keyset pagination: the page starts right after the primary key 'after_uid',
+        which is the primary key of the last record of the previous page, so its cost does not depend on the page number.
+
+        Args:
+            after_uid (int | None): The primary key after which the page starts, None for the first page.
+            limit (int): The maximum number of records in the page.
+            filters (Mapping[str, Any] | Predicate | None): The field values the records must be equal to, combined with AND, or a predicate.
+            row_factory (RowFactory): The format of the records: model instances, or SQLAlchemy rows or __slots__ records without validation.
+
+        Returns:
+            list[BaseSqlModel] | list[Any]: The records of the page, an empty list after the last page.
+        """
+        statement = _select_all(self.model, columns=row_factory is not RowFactory.MODEL).where(*self._filter(filters or {}))
+        if after_uid is not None:
+            statement = statement.where(self.model.uid > after_uid)
+        with self.transaction() as session:
+            reads = list(self._select(session, statement.order_by(self.model.uid).limit(limit), row_factory))
+            self.logger.debug("Read page of records.")
+            return reads
+
+    @instrumented
+    def read_by_ids(
+        self,
+        primary_keys: list[int],
+        chunk_size: int = IDS_CHUNK_SIZE,
+        *,
+        as_mapping: bool = False,
+        row_factory: RowFactory = RowFactory.MODEL,
+    ) -> list[BaseSqlModel] | dict[int, BaseSqlModel] | list[Any] | dict[int, Any]:
         """Reads multiple records from the database by their primary keys.
 
-        This method executes a SELECT statement on the table represented by the model class,
-        filtering by the primary keys. It returns all matching results.
+        This method executes SELECT statements on the table represented by the model class,
+        filtering by the primary keys. The primary keys are split in chunks of 'chunk_size' keys, one IN (...) clause per chunk,
+        to stay below the bound-parameter limits of the database. All the chunks are read over one connection.
 
         Args:
             primary_keys (list[int]): The primary keys of the records to read.
+            chunk_size (int): The maximum number of primary keys per SELECT statement.
+            as_mapping (bool): If True, the records are returned as a dictionary keyed by primary key.
+            row_factory (RowFactory): The format of the records: model instances, or SQLAlchemy rows or __slots__ records without validation.
 
         Returns:
-            list[BaseSqlModel]: A list of the records read from the database.
+            list[BaseSqlModel] | dict[int, BaseSqlModel] | list[Any] | dict[int, Any]: The records read from the database, in the order of the primary keys.
+                Primary keys without a record are skipped.
+
+        Raises:
+            ValueError: If 'chunk_size' is not a positive integer.
         """
-        with Session(self.engine) as session:
-            reads = session.exec(select(self.model).filter(self.model.uid.in_(primary_keys))).all()
+        if chunk_size < 1:
+            msg = f"chunk_size must be a positive integer, got {chunk_size}."
+            raise ValueError(msg)
+        records: dict[int, Any] = {}
+        statement = _select_in(self.model, "uid", columns=row_factory is not RowFactory.MODEL)
+        with self.transaction() as session:
+            for chunk in _chunks(list(dict.fromkeys(primary_keys)), chunk_size):
+                records.update((record.uid, record) for record in self._select(session, statement, row_factory, {"values": chunk}))
             self.logger.debug("Read records by primary_keys.")
-            return reads
+        if as_mapping:
+            return {primary_key: records[primary_key] for primary_key in primary_keys if primary_key in records}
+        return [records[primary_key] for primary_key in primary_keys if primary_key in records]
 
-    def read_by_field(self, field: str, value: str) -> list[BaseSqlModel]:
+    @instrumented
+    def read_by_field(self, field: str, value: str | None, *, row_factory: RowFactory = RowFactory.MODEL) -> list[BaseSqlModel] | list[Any]:
         """Reads records from the database by a specific field value.
 
         This method executes a SELECT statement on the table represented by the model class,
@@ -170,77 +582,568 @@ class Crud:
 
         Args:
             field (str): The field to filter records by.
-            value (str): The value to filter records by.
+            value (str | None): The value to filter records by, None for the NULL values.
+            row_factory (RowFactory): The format of the records: model instances, or SQLAlchemy rows or __slots__ records without validation.
 
         Returns:
-            list[BaseSqlModel]: A list of the records read from the database.
+            list[BaseSqlModel] | list[Any]: A list of the records read from the database.
         """
-        with Session(self.engine) as session:
-            reads = session.exec(select(self.model).filter(getattr(self.model, field) == value)).all()
+        self.index_advisor.record(field)
+        statement = _select_by(self.model, field, columns=row_factory is not RowFactory.MODEL, null=value is None)
+        with self.transaction() as session:
+            reads = list(self._select(session, statement, row_factory, {"value": value}))
             self.logger.debug("Records read by field.")
             return reads
 
+    def query(self) -> Query:
+        """Returns a query on the table, to filter, order, paginate and project records in the database.
+
+        See the Query class and the predicate functions of the 'e_lims_utils.crud.query' module.
+
+        Returns:
+            Query: A query selecting all the records.
+        """
+        return Query(self)
+
+    @instrumented
+    def count(self, filters: Mapping[str, Any] | Predicate | None = None) -> int:
+        """Counts the records matching filters with a single SELECT COUNT(*) statement.
+
+        Args:
+            filters (Mapping[str, Any] | Predicate | None): The field values the records must be equal to, combined with AND, or a predicate.
+
+        Returns:
+            int: The number of records matching the filters, of the table if None.
+        """
+        statement = sa_select(func.count()).select_from(self.model.__table__).where(*self._filter(filters or {}))
+        with self.transaction() as session:
+            count = session.execute(statement).scalar_one()
+            self.logger.debug("Count records.")
+            return count
+
+    @instrumented
+    def exists(self, filters: Mapping[str, Any] | Predicate | None = None) -> bool:
+        """Checks if a record matches filters with a single SELECT EXISTS statement, which stops at the first match.
+
+        Args:
+            filters (Mapping[str, Any] | Predicate | None): The field values the record must be equal to, combined with AND, or a predicate.
+
+        Returns:
+            bool: True if a record matches the filters, if the table is not empty for None.
+        """
+        statement = sa_select(sa_exists(sa_select(self.model.__table__.c.uid).where(*self._filter(filters or {}))))
+        with self.transaction() as session:
+            found = session.execute(statement).scalar_one()
+            self.logger.debug("Check records exist.")
+            return bool(found)
+
+    @instrumented
+    def aggregate(
+        self,
+        column: str,
+        funcs: Sequence[Aggregate | str] = (Aggregate.COUNT,),
+        group_by: Sequence[str] = (),
+        filters: Mapping[str, Any] | Predicate | None = None,
+    ) -> list[dict[str, Any]]:
+        """Aggregates a column of the records matching filters with a single SELECT ... GROUP BY statement.
+
+        Only the aggregates are transferred: one row for the whole table, or one row per group ordered by the group-by fields.
+
+        Examples:
+            >>> crud.aggregate(
+            ...     "measured_at",
+            ...     [
+            ...         Aggregate.COUNT,
+            ...         Aggregate.MAX,
+            ...     ],
+            ...     group_by=[
+            ...         "instrument"
+            ...     ],
+            ... )  # doctest: +SKIP
+            [{'instrument': 'DMM', 'count_measured_at': 12, 'max_measured_at': datetime.datetime(2024, 1, 2, 3, 4, 5)}]
+
+        Args:
+            column (str): The field to aggregate.
+            funcs (Sequence[Aggregate | str]): The aggregate functions, such as 'MIN' or Aggregate.MIN.
+            group_by (Sequence[str]): The fields to group the records by, none to aggregate all the records.
+            filters (Mapping[str, Any] | Predicate | None): The field values the records must be equal to, combined with AND, or a predicate.
+
+        Returns:
+            list[dict[str, Any]]: The group-by field values and the aggregates, named '<function>_<column>' such as 'max_age', per group.
+
+        Raises:
+            ValueError: If a function is not an aggregate function.
+        """
+        aggregates = [Aggregate(function.upper()) for function in funcs]
+        target = getattr(self.model, column)
+        groups = [getattr(self.model, field) for field in group_by]
+        statement = sa_select(*groups, *(aggregate.function(target) for aggregate in aggregates)).where(*self._filter(filters or {}))
+        if groups:
+            statement = statement.group_by(*groups).order_by(*groups)
+        with self.transaction() as session:
+            results = [row._asdict() for row in session.execute(statement)]
+            self.logger.debug("Aggregate records.")
+            return results
+
+    @instrumented
+    def iter_columns(self, query: Query | None = None, chunk_size: int = BULK_CHUNK_SIZE) -> Iterator[dict[str, tuple[Any, ...]]]:
+        """Streams the results of a query as chunks of columns, without creating model instances.
+
+        The rows are fetched from the cursor 'chunk_size' at a time and transposed to one tuple of values per column.
+
+        Args:
+            query (Query | None): The query to run, None to select all the records. Without a projection, all the columns are selected.
+            chunk_size (int): The number of rows per chunk.
+
+        Yields:
+            dict[str, tuple[Any, ...]]: The values of the next chunk of rows, keyed by column name.
+        """
+        yield from self._iter_columns(self._columnar(query).statement(), chunk_size)
+
+    @instrumented
+    def to_arrays(self, query: Query | None = None, chunk_size: int = BULK_CHUNK_SIZE) -> dict[str, np.ndarray]:
+        """Reads the results of a query as one NumPy array per column.
+
+        Requires NumPy, installed with the 'export' extra.
+
+        Args:
+            query (Query | None): The query to run, None to select all the records. Without a projection, all the columns are selected.
+            chunk_size (int): The number of rows fetched per chunk.
+
+        Returns:
+            dict[str, np.ndarray]: The arrays keyed by column name.
+        """
+        statement = self._columnar(query).statement()
+        return export.to_arrays(statement.selected_columns, self._iter_columns(statement, chunk_size))
+
+    @instrumented
+    def to_arrow(self, query: Query | None = None, chunk_size: int = BULK_CHUNK_SIZE) -> pa.Table:
+        """Reads the results of a query as an Arrow table, one record batch per chunk.
+
+        Requires PyArrow, installed with the 'export' extra.
+
+        Args:
+            query (Query | None): The query to run, None to select all the records. Without a projection, all the columns are selected.
+            chunk_size (int): The number of rows fetched per chunk.
+
+        Returns:
+            pa.Table: The table.
+        """
+        statement = self._columnar(query).statement()
+        return export.to_arrow(statement.selected_columns, self._iter_columns(statement, chunk_size))
+
+    @instrumented
+    def write_parquet(self, path: Path, query: Query | None = None, chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        """Writes the results of a query to a Parquet file, one row group per chunk, so that memory stays flat whatever the number of rows.
+
+        Requires PyArrow, installed with the 'export' extra.
+
+        Args:
+            path (Path): The path of the Parquet file.
+            query (Query | None): The query to run, None to select all the records. Without a projection, all the columns are selected.
+            chunk_size (int): The number of rows fetched and written per chunk.
+
+        Returns:
+            int: The number of rows written.
+        """
+        statement = self._columnar(query).statement()
+        rows = export.write_parquet(path, statement.selected_columns, self._iter_columns(statement, chunk_size))
+        self.logger.debug("Records written to Parquet.")
+        return rows
+
+    @instrumented
     def update(self, data: BaseSqlModel) -> None:
         """Updates a record in the database.
 
-        This method reads a record from the database by its primary key, updates its fields with the data from the provided instance of the model class,
-        adds the updated record to the current session, and commits the session to update the record in the database.
+        This method issues a single UPDATE statement, filtered by the primary key of the provided instance of the model class,
+        which sets all its other fields. The record is not read from the database beforehand.
 
         Args:
             data (BaseSqlModel): An instance of the model class with the updated data for the record.
         """
-        with Session(self.engine) as session:
-            record = self.read(data.uid)
-            for field, _ in data:
-                if field != "uid":
-                    setattr(record, field, getattr(data, field))
-            session.add(record)
-            session.commit()
-            self.logger.debug("Update record")
-            session.refresh(record)
-            self.logger.debug("Update record")
+        self.update_where({"uid": data.uid}, {field: value for field, value in data if field != "uid"})
+        self.logger.debug("Update record")
+
+    @instrumented
+    def updates(self, data: Sequence[BaseSqlModel | dict[str, Any]], chunk_size: int = BULK_CHUNK_SIZE) -> int:
+        """Updates multiple records in the database by primary key, in one transaction.
+
+        Only the changed columns of each record are updated: the keys of a dictionary, the fields set when creating a new model instance,
+        or the fields modified since a model instance was read from the database. The records are grouped by changed columns
+        and sent as one executemany UPDATE ... WHERE uid = ? statement per group and chunk of 'chunk_size' records.
+        The records are not read from the database beforehand.
+
+        Args:
+            data (Sequence[BaseSqlModel | dict[str, Any]]): The records to update, as model instances or as dictionaries of column values, all with a 'uid'.
+            chunk_size (int): The maximum number of records sent per statement.
+
+        Returns:
+            int: The number of records updated.
+
+        Raises:
+            ValueError: If 'chunk_size' is not a positive integer, or if a record has no 'uid'. Nothing is updated then.
+        """
+        if chunk_size < 1:
+            msg = f"chunk_size must be a positive integer, got {chunk_size}."
+            raise ValueError(msg)
+        changed_rows = [_changed_row(record) for record in data]
+        for index, row in enumerate(changed_rows):
+            if row.get("uid") is None:
+                msg = f"Record {index} has no 'uid', updates needs the primary key of every record: {data[index]!r}."
+                raise ValueError(msg)
+        rows = sorted((row for row in changed_rows if len(row) > 1), key=sorted)
+        table = self.model.__table__
+        updated = 0
+        with self.transaction() as session:
+            connection = session.connection()
+            for chunk in _chunks(rows, chunk_size):
+                for same_keys_rows in _same_keys(chunk):
+                    columns = [column for column in same_keys_rows[0] if column != "uid"]
+                    statement = table.update().where(table.c.uid == bindparam("_uid")).values({column: bindparam(column) for column in columns})
+                    result = connection.execute(statement, [{**row, "_uid": row["uid"]} for row in same_keys_rows])
+                    updated += result.rowcount if self.engine.dialect.supports_sane_multi_rowcount else len(same_keys_rows)
+            session.expire_all()
+        for row in rows:
+            self._invalidate(row["uid"])
+        self.logger.debug("Update records.")
+        return updated
+
+    @instrumented
+    def update_where(self, filters: Mapping[str, Any] | Predicate, values: Mapping[str, Any]) -> int:
+        """Updates the records matching filters in the database.
 
+        This method issues a single UPDATE ... WHERE statement, the matching records are not loaded into Python.
+
+        Args:
+            filters (Mapping[str, Any] | Predicate): The field values the records must be equal to, combined with AND, or a predicate.
+            values (Mapping[str, Any]): The new field values of the records.
+
+        Returns:
+            int: The number of records updated.
+        """
+        with self.transaction() as session:
+            result = session.execute(update(self.model).where(*self._filter(filters)).values(**values), execution_options={"synchronize_session": False})
+            session.expire_all()
+        self._invalidate(_filtered_uid(filters))
+        self.logger.debug("Update records where.")
+        return result.rowcount
+
+    @instrumented
     def delete(self, primary_key: int) -> None:
         """Deletes a record from the database by primary key.
 
-        This method reads a record from the database by its primary key, deletes it from the current session, and commits the session to delete the record from the database.
+        This method issues a single DELETE statement filtered by the primary key, the record is not read from the database beforehand.
 
         Args:
             primary_key (int): The primary key of the record to delete.
         """
-        with Session(self.engine) as session:
-            record = self.read(primary_key)
-            session.delete(record)
-            session.commit()
-            self.logger.debug("Delete record.")
+        self._delete(self.model.uid == primary_key)
+        self._invalidate(primary_key)
+        self.logger.debug("Delete record.")
+
+    @instrumented
+    def delete_where(self, filters: Mapping[str, Any] | Predicate) -> int:
+        """Deletes the records matching filters from the database.
 
-    def delete_by_ids(self, ids: list[int]) -> None:
+        This method issues a single DELETE ... WHERE statement, the matching records are not loaded into Python.
+
+        Args:
+            filters (Mapping[str, Any] | Predicate): The field values the records must be equal to, combined with AND, or a predicate.
+
+        Returns:
+            int: The number of records deleted.
+        """
+        deleted = self._delete(*self._filter(filters))
+        self._invalidate(_filtered_uid(filters))
+        self.logger.debug("Delete records where.")
+        return deleted
+
+    @instrumented
+    def delete_by_ids(self, ids: list[int], chunk_size: int = IDS_CHUNK_SIZE) -> int:
         """Deletes multiple records from the database by their primary keys.
 
-        This method reads multiple records from the database by their primary keys, deletes them from the current session, and commits the session to delete the records from the database.
+        This method issues one DELETE ... WHERE uid IN (...) statement per chunk of 'chunk_size' primary keys, in one transaction.
+        The records are not loaded into Python.
 
         Args:
             ids (list[int]): The primary keys of the records to delete.
+            chunk_size (int): The maximum number of primary keys per DELETE statement.
+
+        Returns:
+            int: The number of records deleted.
+
+        Raises:
+            ValueError: If 'chunk_size' is not a positive integer.
         """
-        with Session(self.engine) as session:
-            records = self.read_by_ids(ids)
-            for record in records:
-                session.delete(record)
-            session.commit()
+        if chunk_size < 1:
+            msg = f"chunk_size must be a positive integer, got {chunk_size}."
+            raise ValueError(msg)
+        with self.transaction():
+            deleted = sum(self._delete(self.model.uid.in_(chunk)) for chunk in _chunks(list(dict.fromkeys(ids)), chunk_size))
+        for primary_key in ids:
+            self._invalidate(primary_key)
         self.logger.debug("Delete records by primary_keys.")
+        return deleted
 
-    def delete_by_field(self, field: str, value: str) -> None:
+    @instrumented
+    def delete_by_field(self, field: str, value: str) -> int:
         """Deletes records from the database by a specific field value.
 
-        This method reads records from the database by the value of a specific field, deletes them from the current session, and commits the session to delete the records from the database.
+        This method issues a single DELETE ... WHERE statement, the records are not loaded into Python.
 
         Args:
             field (str): The field to filter records by.
             value (str): The value to filter records by.
+
+        Returns:
+            int: The number of records deleted.
         """
-        with Session(self.engine) as session:
-            records = self.read_by_field(field, value)
-            for record in records:
-                session.delete(record)
-            session.commit()
+        deleted = self._delete(*self._filter({field: value}))
+        self._invalidate(value if field == "uid" else None)
         self.logger.debug("Delete records by field.")
+        return deleted
+
+    def _select(self, session: Session, statement: Select[Any], row_factory: RowFactory, params: Mapping[str, Any] | None = None) -> Iterator[Any]:
+        """Executes a SELECT statement of the model, or of all its columns, and returns the records in a row format.
+
+        Args:
+            session (Session): The session of the transaction.
+            statement (Select[Any]): The statement selecting the model for MODEL, all the columns of its table otherwise.
+            row_factory (RowFactory): The format of the records.
+            params (Mapping[str, Any] | None): The values of the bound parameters of the statement.
+
+        Returns:
+            Iterator[Any]: The records.
+        """
+        if row_factory is RowFactory.MODEL:
+            return iter(session.exec(statement, params=params))
+        return convert_rows(session.execute(statement, params), row_factory, self.model)
+
+    def _filter(self, filters: Mapping[str, Any] | Predicate) -> list[ColumnElement[bool]]:
+        """Builds the WHERE clauses of filters and counts the fields filtered on in the index advisor.
+
+        Args:
+            filters (Mapping[str, Any] | Predicate): The field values the records must be equal to, or a predicate.
+
+        Returns:
+            list[ColumnElement[bool]]: The WHERE clauses.
+        """
+        for field in filters.fields() if isinstance(filters, Predicate) else filters:
+            self.index_advisor.record(field)
+        return _where(self.model, filters)
+
+    def _columnar(self, query: Query | None) -> Query:
+        """Returns a query selecting columns: the query itself with a projection, otherwise the query selecting all the columns.
+
+        Args:
+            query (Query | None): The query to run, None to select all the records.
+
+        Returns:
+            Query: The query with a projection.
+        """
+        query = query or self.query()
+        return query if query.projection else query.columns(*(column.key for column in self.model.__table__.columns))
+
+    def _iter_columns(self, statement: Select[Any], chunk_size: int) -> Iterator[dict[str, tuple[Any, ...]]]:
+        """Streams the results of a statement as chunks of columns, so that the exports build their statement only once.
+
+        Args:
+            statement (Select[Any]): The statement selecting columns.
+            chunk_size (int): The number of rows per chunk.
+
+        Yields:
+            dict[str, tuple[Any, ...]]: The values of the next chunk of rows, keyed by column name.
+        """
+        with self._read_session() as session:
+            result = session.execute(statement.execution_options(yield_per=chunk_size))
+            names = tuple(result.keys())
+            for rows in result.partitions():
+                yield dict(zip(names, zip(*rows, strict=True), strict=True))
+        self.logger.debug("Stream columns.")
+
+    def _invalidate(self, primary_key: int | None) -> None:
+        """Invalidates the cached record of a primary key, or the whole cache.
+
+        Args:
+            primary_key (int | None): The primary key of the modified record, None if the modified records are not known.
+        """
+        if self.cache is None:
+            return
+        if primary_key is None:
+            self.cache.clear()
+        else:
+            self.cache.invalidate(primary_key)
+
+    def _delete(self, *clauses: ColumnElement[bool]) -> int:
+        """Deletes the records matching all the clauses with a single DELETE statement.
+
+        Records of the session are expired, since the statement bypasses the ORM identity map.
+
+        Args:
+            *clauses (ColumnElement[bool]): The WHERE clauses, combined with AND.
+
+        Returns:
+            int: The number of records deleted.
+        """
+        with self.transaction() as session:
+            result = session.execute(delete(self.model).where(*clauses), execution_options={"synchronize_session": False})
+            session.expire_all()
+        return result.rowcount
+
+
+def _create_table(model: type[BaseSqlModel], bind: Engine | Connection) -> None:
+    """Creates the table of a model and the indexes it declares, the indexes also on a table which already exists.
+
+    Args:
+        model (type[BaseSqlModel]): The SQLModel class of the table.
+        bind (Engine | Connection): The engine or connection to create the table with.
+    """
+    indexes = declared_indexes(model)
+    model.metadata.create_all(bind)
+    for index in indexes:
+        index.create(bind, checkfirst=True)
+
+
+def _chunks(items: Sequence[_T], size: int) -> Iterator[Sequence[_T]]:
+    """Splits a sequence into consecutive chunks.
+
+    Args:
+        items (Sequence[_T]): The items to split.
+        size (int): The maximum size of a chunk.
+
+    Yields:
+        Sequence[_T]: The next chunk of items.
+    """
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _same_keys(rows: Sequence[dict[str, Any]]) -> Iterator[list[dict[str, Any]]]:
+    """Groups consecutive rows having the same columns.
+
+    A single INSERT statement can only be executed with rows providing the same set of columns.
+
+    Args:
+        rows (Sequence[dict[str, Any]]): The rows to group.
+
+    Yields:
+        list[dict[str, Any]]: The next run of rows having the same columns, in the original order.
+    """
+    for _, group in itertools.groupby(rows, key=lambda row: row.keys()):
+        yield list(group)
+
+
+def _to_row(model: type[BaseSqlModel], record: BaseSqlModel | dict[str, Any]) -> dict[str, Any]:
+    """Converts a record to a dictionary of column values.
+
+    A primary key set to None is left out so that the database generates it.
+
+    Args:
+        model (type[BaseSqlModel]): The SQLModel class of the record.
+        record (BaseSqlModel | dict[str, Any]): A model instance or a dictionary of column values.
+
+    Returns:
+        dict[str, Any]: The column values of the record.
+    """
+    row = dict(record) if isinstance(record, dict) else {column.key: getattr(record, column.key) for column in model.__table__.columns}
+    if row.get("uid") is None:
+        row.pop("uid", None)
+    return row
+
+
+def _changed_row(record: BaseSqlModel | dict[str, Any]) -> dict[str, Any]:
+    """Returns the primary key and the changed column values of a record.
+
+    Args:
+        record (BaseSqlModel | dict[str, Any]): A dictionary of column values, a new model instance, or a model instance read from the database.
+
+    Returns:
+        dict[str, Any]: The 'uid' and the changed column values of the record.
+    """
+    if isinstance(record, dict):
+        return dict(record)
+    state = inspect(record)
+    changed = {attribute.key for attribute in state.attrs if attribute.history.has_changes()} if state.has_identity else record.model_fields_set
+    return {"uid": record.uid} | {field: getattr(record, field) for field in changed if field != "uid"}
+
+
+@functools.cache
+def _select_all(model: type[BaseSqlModel], *, columns: bool = False) -> Select[Any]:
+    """Returns the SELECT statement of all the records of a model, built once per model.
+
+    Reusing the same statement object skips its construction and the computation of its cache key,
+    SQLAlchemy then finds its compiled form in the compiled cache of the engine.
+
+    Args:
+        model (type[BaseSqlModel]): The SQLModel class to select.
+        columns (bool): If True, the columns of the table are selected instead of the model, in the order of the columns.
+
+    Returns:
+        Select[Any]: The SELECT statement.
+    """
+    return sa_select(*model.__table__.columns) if columns else select(model)
+
+
+@functools.cache
+def _select_by(model: type[BaseSqlModel], field: str, *, columns: bool = False, null: bool = False) -> Select[Any]:
+    """Returns the SELECT statement of the records of a model whose field is equal to the bound parameter 'value', built once per model and field.
+
+    A bound parameter compares with '= NULL', which matches no record, so the NULL value has its own 'IS NULL' statement.
+
+    Args:
+        model (type[BaseSqlModel]): The SQLModel class to select.
+        field (str): The field compared with the parameter.
+        columns (bool): If True, the columns of the table are selected instead of the model, in the order of the columns.
+        null (bool): If True, the records whose field is NULL are selected instead, without parameter.
+
+    Returns:
+        Select[Any]: The SELECT statement.
+    """
+    column = getattr(model, field)
+    return _select_all(model, columns=columns).where(column.is_(None) if null else column == bindparam("value"))
+
+
+@functools.cache
+def _select_in(model: type[BaseSqlModel], field: str, *, columns: bool = False) -> Select[Any]:
+    """Returns the SELECT statement of the records of a model whose field is in the expanding bound parameter 'values', built once per model and field.
+
+    The parameter is expanded to one placeholder per value when the statement is executed, the compiled form is shared by all the list sizes.
+
+    Args:
+        model (type[BaseSqlModel]): The SQLModel class to select.
+        field (str): The field compared with the parameter.
+        columns (bool): If True, the columns of the table are selected instead of the model, in the order of the columns.
+
+    Returns:
+        Select[Any]: The SELECT statement.
+    """
+    return _select_all(model, columns=columns).where(getattr(model, field).in_(bindparam("values", expanding=True)))
+
+
+def _where(model: type[BaseSqlModel], filters: Mapping[str, Any] | Predicate) -> list[ColumnElement[bool]]:
+    """Builds WHERE clauses from field values or from a predicate.
+
+    Args:
+        model (type[BaseSqlModel]): The SQLModel class to filter.
+        filters (Mapping[str, Any] | Predicate): The field values the records must be equal to, or a predicate.
+
+    Returns:
+        list[ColumnElement[bool]]: One clause per field, or the clause of the predicate.
+    """
+    if isinstance(filters, Predicate):
+        return [filters.clause(model)]
+    return [getattr(model, field) == value for field, value in filters.items()]
+
+
+def _filtered_uid(filters: Mapping[str, Any] | Predicate) -> int | None:
+    """Returns the primary key the filters select, if they only filter on the primary key.
+
+    Args:
+        filters (Mapping[str, Any] | Predicate): The field values the records must be equal to, or a predicate.
+
+    Returns:
+        int | None: The primary key, or None if the filters may select other records.
+    """
+    if isinstance(filters, Predicate):
+        return filters.value if filters.operator is Operator.EQ and filters.field == "uid" else None
+    return filters.get("uid") if filters.keys() == {"uid"} else None
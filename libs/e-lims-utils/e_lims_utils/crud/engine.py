@@ -0,0 +1,370 @@
+"""Engine options and the process-wide engine registry."""
+from __future__ import annotations
+
+import dataclasses
+import threading
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import create_engine
+
+if TYPE_CHECKING:
+    from sqlalchemy import Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class JournalMode(StrEnum):
+    """An enumeration class used to represent the journal modes of SQLite.
+
+    Attributes:
+        * DELETE (str): Rollback journal deleted at the end of each transaction, the SQLite default.
+        * TRUNCATE (str): Rollback journal truncated at the end of each transaction.
+        * PERSIST (str): Rollback journal header overwritten at the end of each transaction.
+        * MEMORY (str): Rollback journal kept in memory.
+        * WAL (str): Write-ahead log, readers don't block the writer and the writer doesn't block readers.
+        * OFF (str): No journal, transactions can't be rolled back safely.
+    """
+
+    DELETE = "DELETE"
+    TRUNCATE = "TRUNCATE"
+    PERSIST = "PERSIST"
+    MEMORY = "MEMORY"
+    WAL = "WAL"
+    OFF = "OFF"
+
+
+class Synchronous(StrEnum):
+    """An enumeration class used to represent the synchronous settings of SQLite.
+
+    Attributes:
+        * OFF (str): No sync, a power loss may corrupt the database.
+        * NORMAL (str): Sync at checkpoints, durable in WAL mode except for the last transactions on a power loss.
+        * FULL (str): Sync at each commit, the SQLite default.
+        * EXTRA (str): Sync at each commit and of the directory of the journal.
+    """
+
+    OFF = "OFF"
+    NORMAL = "NORMAL"
+    FULL = "FULL"
+    EXTRA = "EXTRA"
+
+
+class TempStore(StrEnum):
+    """An enumeration class used to represent where SQLite stores temporary tables and indexes.
+
+    Attributes:
+        * DEFAULT (str): The compile-time default, usually files.
+        * FILE (str): Temporary files.
+        * MEMORY (str): Memory.
+    """
+
+    DEFAULT = "DEFAULT"
+    FILE = "FILE"
+    MEMORY = "MEMORY"
+
+
+@dataclasses.dataclass(frozen=True)
+class SqliteProfile:
+    """A class used to represent the tuning PRAGMAs of the SQLite connections of an engine.
+
+    The defaults are tuned for a single machine with concurrent readers: a write-ahead log with synchronous NORMAL,
+    memory-mapped reads, a larger page cache, in-memory temporary tables, and a busy timeout instead of immediate 'database is locked' errors.
+    The PRAGMAs are applied to every new connection of the pool.
+
+    Attributes:
+        * journal_mode (JournalMode): The journal mode of the database.
+        * synchronous (Synchronous): When SQLite syncs the database file to disk.
+        * mmap_size (int): The number of bytes of the database file read through memory-mapped I/O, 0 to disable it.
+        * cache_size (int): The size of the page cache, in pages if positive or in KiB if negative.
+        * temp_store (TempStore): Where temporary tables and indexes are stored.
+        * busy_timeout (int): The number of milliseconds to wait for a lock before failing.
+
+    Methods:
+        * apply(dbapi_connection: Any, connection_record: Any): Executes the PRAGMAs on a new DB-API connection.
+    """
+
+    journal_mode: JournalMode = JournalMode.WAL
+    synchronous: Synchronous = Synchronous.NORMAL
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size: int = -64 * 1024
+    temp_store: TempStore = TempStore.MEMORY
+    busy_timeout: int = 5000
+
+    @property
+    def pragmas(self) -> dict[str, str | int]:
+        """Returns the PRAGMAs of the profile.
+
+        Returns:
+            dict[str, str | int]: The values keyed by PRAGMA name, in the order they are applied.
+        """
+        return {
+            "busy_timeout": self.busy_timeout,
+            "journal_mode": self.journal_mode.value,
+            "synchronous": self.synchronous.value,
+            "mmap_size": self.mmap_size,
+            "cache_size": self.cache_size,
+            "temp_store": self.temp_store.value,
+        }
+
+    def apply(self, dbapi_connection: Any, connection_record: Any) -> None:  # noqa: ANN401, ARG002
+        """Executes the PRAGMAs on a new DB-API connection, as a listener of the 'connect' event of an engine.
+
+        Args:
+            dbapi_connection (Any): The new DB-API connection.
+            connection_record (Any): The pool record of the connection.
+        """
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in self.pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+
+@dataclasses.dataclass(frozen=True)
+class EngineOptions:
+    """A class used to represent the connection-pool options of an engine.
+
+    Options left to None use the SQLAlchemy defaults of the database dialect.
+
+    Attributes:
+        * pool_size (int | None): The number of connections kept open in the pool.
+        * max_overflow (int | None): The number of connections allowed above 'pool_size'.
+        * pool_pre_ping (bool): Whether connections are tested for liveness when they are checked out.
+        * pool_recycle (int): The number of seconds after which a connection is recycled, -1 to never recycle.
+        * sqlite (SqliteProfile | None): The tuning PRAGMAs applied to the connections of a SQLite engine, None to keep the SQLite defaults.
+    """
+
+    pool_size: int | None = None
+    max_overflow: int | None = None
+    pool_pre_ping: bool = False
+    pool_recycle: int = -1
+    sqlite: SqliteProfile | None = None
+
+    @property
+    def engine_kwargs(self) -> dict[str, Any]:
+        """Returns the keyword arguments to pass to 'create_engine'.
+
+        Returns:
+            dict[str, Any]: The keyword arguments of the options which are set.
+        """
+        kwargs: dict[str, Any] = {"pool_pre_ping": self.pool_pre_ping, "pool_recycle": self.pool_recycle}
+        if self.pool_size is not None:
+            kwargs["pool_size"] = self.pool_size
+        if self.max_overflow is not None:
+            kwargs["max_overflow"] = self.max_overflow
+        return kwargs
+
+
+class EngineRegistry:
+    """A class to share engines and their connection pools across the process.
+
+    Engines are created on first use and keyed by database URL and engine options,
+    so that all Crud objects for the same database share one connection pool.
+    Asyncio engines, used by AsyncCrud objects, are kept apart from the synchronous ones.
+    The SQLite profile of the options, if any, is applied to every connection of a SQLite engine.
+    The users of an engine are counted from 'acquire' to 'release', so that its pooled connections are closed by the last one only:
+    closing them destroys a SQLite in-memory database for every user.
+
+    Methods:
+        * get(url: str, options: EngineOptions): Returns the engine for a database URL and options, creating it if needed.
+        * get_async(url: str, options: EngineOptions): Returns the asyncio engine for a database URL and options, creating it if needed.
+        * acquire(url: str, options: EngineOptions): Returns the engine for a database URL and options, and counts one more user of it.
+        * acquire_async(url: str, options: EngineOptions): Returns the asyncio engine for a database URL and options, and counts one more user of it.
+        * release(engine: Engine): Counts one user less of an engine, and closes its pooled connections if it was the last one.
+        * release_async(engine: AsyncEngine): Counts one user less of an asyncio engine, and closes its pooled connections if it was the last one.
+        * dispose(url: str, options: EngineOptions): Disposes the engine for a database URL and options.
+        * dispose_async(url: str, options: EngineOptions): Disposes the asyncio engine for a database URL and options.
+        * dispose_all(): Disposes all the synchronous engines of the registry.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the EngineRegistry object with no engines."""
+        self._engines: dict[tuple[str, EngineOptions], Engine] = {}
+        self._async_engines: dict[tuple[str, EngineOptions], AsyncEngine] = {}
+        self._users: dict[Engine | AsyncEngine, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Returns the number of engines in the registry.
+
+        Returns:
+            int: The number of synchronous and asyncio engines in the registry.
+        """
+        return len(self._engines) + len(self._async_engines)
+
+    def get(self, url: str, options: EngineOptions | None = None) -> Engine:
+        """Returns the engine for a database URL and options, creating it if needed.
+
+        Args:
+            url (str): The URL of the database.
+            options (EngineOptions | None): The engine options, default options if None.
+
+        Returns:
+            Engine: The shared engine.
+        """
+        key = (url, options or EngineOptions())
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is None:
+                engine = create_engine(url, **key[1].engine_kwargs)
+                _apply_profile(engine, key[1])
+                self._engines[key] = engine
+            return engine
+
+    def get_async(self, url: str, options: EngineOptions | None = None) -> AsyncEngine:
+        """Returns the asyncio engine for a database URL and options, creating it if needed.
+
+        Args:
+            url (str): The URL of the database, with an asyncio driver such as 'sqlite+aiosqlite' or 'postgresql+asyncpg'.
+            options (EngineOptions | None): The engine options, default options if None.
+
+        Returns:
+            AsyncEngine: The shared asyncio engine.
+        """
+        key = (url, options or EngineOptions())
+        with self._lock:
+            engine = self._async_engines.get(key)
+            if engine is None:
+                engine = create_async_engine(url, **key[1].engine_kwargs)
+                _apply_profile(engine.sync_engine, key[1])
+                self._async_engines[key] = engine
+            return engine
+
+    def acquire(self, url: str, options: EngineOptions | None = None) -> Engine:
+        """Returns the engine for a database URL and options, creating it if needed, and counts one more user of it.
+
+        Args:
+            url (str): The URL of the database.
+            options (EngineOptions | None): The engine options, default options if None.
+
+        Returns:
+            Engine: The shared engine, to hand back to 'release'.
+        """
+        engine = self.get(url, options)
+        with self._lock:
+            self._users[engine] = self._users.get(engine, 0) + 1
+        return engine
+
+    def acquire_async(self, url: str, options: EngineOptions | None = None) -> AsyncEngine:
+        """Returns the asyncio engine for a database URL and options, creating it if needed, and counts one more user of it.
+
+        Args:
+            url (str): The URL of the database, with an asyncio driver such as 'sqlite+aiosqlite' or 'postgresql+asyncpg'.
+            options (EngineOptions | None): The engine options, default options if None.
+
+        Returns:
+            AsyncEngine: The shared asyncio engine, to hand back to 'release_async'.
+        """
+        engine = self.get_async(url, options)
+        with self._lock:
+            self._users[engine] = self._users.get(engine, 0) + 1
+        return engine
+
+    def release(self, engine: Engine) -> bool:
+        """Counts one user less of an engine, and closes its pooled connections if it was the last one.
+
+        The engine stays in the registry and opens new connections on demand.
+
+        Args:
+            engine (Engine): The engine returned by 'acquire'.
+
+        Returns:
+            bool: True if the pooled connections were closed, False if the engine has other users.
+        """
+        if not self._release(engine):
+            return False
+        engine.dispose()
+        return True
+
+    async def release_async(self, engine: AsyncEngine) -> bool:
+        """Counts one user less of an asyncio engine, and closes its pooled connections if it was the last one.
+
+        The engine stays in the registry and opens new connections on demand.
+
+        Args:
+            engine (AsyncEngine): The asyncio engine returned by 'acquire_async'.
+
+        Returns:
+            bool: True if the pooled connections were closed, False if the engine has other users.
+        """
+        if not self._release(engine):
+            return False
+        await engine.dispose()
+        return True
+
+    def dispose(self, url: str, options: EngineOptions | None = None) -> None:
+        """Disposes the engine for a database URL and options.
+
+        The connections of the pool are closed and the engine is removed from the registry,
+        the next call to 'get' creates a new engine.
+
+        Args:
+            url (str): The URL of the database.
+            options (EngineOptions | None): The engine options, default options if None.
+        """
+        with self._lock:
+            engine = self._engines.pop((url, options or EngineOptions()), None)
+            self._users.pop(engine, None)
+        if engine is not None:
+            engine.dispose()
+
+    async def dispose_async(self, url: str, options: EngineOptions | None = None) -> None:
+        """Disposes the asyncio engine for a database URL and options.
+
+        The connections of the pool are closed and the engine is removed from the registry,
+        the next call to 'get_async' creates a new engine.
+
+        Args:
+            url (str): The URL of the database.
+            options (EngineOptions | None): The engine options, default options if None.
+        """
+        with self._lock:
+            engine = self._async_engines.pop((url, options or EngineOptions()), None)
+            self._users.pop(engine, None)
+        if engine is not None:
+            await engine.dispose()
+
+    def dispose_all(self) -> None:
+        """Disposes all the synchronous engines of the registry.
+
+        Asyncio engines must be disposed from the event loop with 'dispose_async'.
+        """
+        with self._lock:
+            engines = list(self._engines.values())
+            self._engines.clear()
+            for engine in engines:
+                self._users.pop(engine, None)
+        for engine in engines:
+            engine.dispose()
+
+    def _release(self, engine: Engine | AsyncEngine) -> bool:
+        """Counts one user less of an engine.
+
+        Args:
+            engine (Engine | AsyncEngine): The engine returned by 'acquire' or 'acquire_async'.
+
+        Returns:
+            bool: True if the engine has no user left.
+        """
+        with self._lock:
+            users = self._users.pop(engine, 1) - 1
+            if users > 0:
+                self._users[engine] = users
+        return users <= 0
+
+
+def _apply_profile(engine: Engine, options: EngineOptions) -> None:
+    """Registers the SQLite profile of the options on the 'connect' event of a SQLite engine.
+
+    Args:
+        engine (Engine): The new engine, the synchronous engine of an asyncio engine.
+        options (EngineOptions): The engine options.
+    """
+    if options.sqlite is not None and engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", options.sqlite.apply)
+
+
+engine_registry = EngineRegistry()
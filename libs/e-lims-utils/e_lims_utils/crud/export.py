@@ -0,0 +1,134 @@
+"""Columnar export of query results to NumPy arrays, Arrow tables and Parquet files.
+
+NumPy and PyArrow are optional dependencies, installed with the 'export' extra. They are imported when an export function is called.
+"""
+from __future__ import annotations
+
+import datetime as dt
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from pathlib import Path
+
+    import numpy as np
+    import pyarrow as pa
+    from sqlalchemy import ColumnElement
+
+
+def python_type(column: ColumnElement[Any]) -> type | None:
+    """Returns the Python type of the values of a column.
+
+    Args:
+        column (ColumnElement[Any]): The selected column.
+
+    Returns:
+        type | None: The Python type, or None if the SQL type does not define one.
+    """
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def to_arrays(columns: Sequence[ColumnElement[Any]], chunks: Iterable[dict[str, tuple[Any, ...]]]) -> dict[str, np.ndarray]:
+    """Builds one NumPy array per column from chunks of column values.
+
+    Integers, floats, booleans and datetimes are stored in typed arrays, other values and integer columns with NULL values in object arrays.
+
+    Args:
+        columns (Sequence[ColumnElement[Any]]): The selected columns.
+        chunks (Iterable[dict[str, tuple[Any, ...]]]): The chunks of values, keyed by column name.
+
+    Returns:
+        dict[str, np.ndarray]: The arrays keyed by column name.
+    """
+    import numpy as np
+
+    dtypes = {int: np.int64, float: np.float64, bool: np.bool_, dt.datetime: "datetime64[us]"}
+    parts: dict[str, list[np.ndarray]] = {column.key: [] for column in columns}
+    for chunk in chunks:
+        for column in columns:
+            values = chunk[column.key]
+            try:
+                parts[column.key].append(np.asarray(values, dtype=dtypes.get(python_type(column), object)))
+            except (TypeError, ValueError):
+                parts[column.key].append(np.asarray(values, dtype=object))
+    return {name: np.concatenate(arrays) if arrays else np.asarray([]) for name, arrays in parts.items()}
+
+
+def arrow_schema(columns: Sequence[ColumnElement[Any]]) -> pa.Schema:
+    """Returns the Arrow schema of the selected columns.
+
+    Args:
+        columns (Sequence[ColumnElement[Any]]): The selected columns.
+
+    Returns:
+        pa.Schema: The schema, with a string type for the columns of unknown type.
+    """
+    import pyarrow as pa
+
+    types = {
+        int: pa.int64(),
+        float: pa.float64(),
+        bool: pa.bool_(),
+        str: pa.string(),
+        bytes: pa.binary(),
+        dt.datetime: pa.timestamp("us"),
+        dt.date: pa.date32(),
+    }
+    return pa.schema([(column.key, types.get(python_type(column), pa.string())) for column in columns])
+
+
+def _record_batches(schema: pa.Schema, chunks: Iterable[dict[str, tuple[Any, ...]]]) -> Iterable[pa.RecordBatch]:
+    """Converts chunks of column values to Arrow record batches.
+
+    Args:
+        schema (pa.Schema): The schema of the batches.
+        chunks (Iterable[dict[str, tuple[Any, ...]]]): The chunks of values, keyed by column name.
+
+    Yields:
+        pa.RecordBatch: The next record batch.
+    """
+    import pyarrow as pa
+
+    for chunk in chunks:
+        yield pa.RecordBatch.from_arrays([pa.array(chunk[field.name], type=field.type) for field in schema], schema=schema)
+
+
+def to_arrow(columns: Sequence[ColumnElement[Any]], chunks: Iterable[dict[str, tuple[Any, ...]]]) -> pa.Table:
+    """Builds an Arrow table from chunks of column values, one record batch per chunk.
+
+    Args:
+        columns (Sequence[ColumnElement[Any]]): The selected columns.
+        chunks (Iterable[dict[str, tuple[Any, ...]]]): The chunks of values, keyed by column name.
+
+    Returns:
+        pa.Table: The table.
+    """
+    import pyarrow as pa
+
+    schema = arrow_schema(columns)
+    return pa.Table.from_batches(list(_record_batches(schema, chunks)), schema=schema)
+
+
+def write_parquet(path: Path, columns: Sequence[ColumnElement[Any]], chunks: Iterable[dict[str, tuple[Any, ...]]]) -> int:
+    """Writes chunks of column values to a Parquet file, one row group per chunk, without holding the whole data in memory.
+
+    Args:
+        path (Path): The path of the Parquet file.
+        columns (Sequence[ColumnElement[Any]]): The selected columns.
+        chunks (Iterable[dict[str, tuple[Any, ...]]]): The chunks of values, keyed by column name.
+
+    Returns:
+        int: The number of rows written.
+    """
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(columns)
+    rows = 0
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for batch in _record_batches(schema, chunks):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+    return rows
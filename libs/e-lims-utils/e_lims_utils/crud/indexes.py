@@ -0,0 +1,100 @@
+"""Declared indexes of the models and the IndexAdvisor class."""
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING
+
+from sqlalchemy import Index
+
+if TYPE_CHECKING:
+    from sqlalchemy import Table
+
+    from e_lims_utils.crud.crud import BaseSqlModel
+    from e_lims_utils.logger.logger import Logger
+
+
+def declared_indexes(model: type[BaseSqlModel]) -> list[Index]:
+    """Returns the indexes declared by the '__indexes__' and '__natural_key__' attributes of a model, attached to its table.
+
+    Each declared index is a tuple of column names, it's named 'ix_<table>_<column>_<column>...' like the
+    indexes created by 'Field(index=True)'. The natural key gets a unique index named 'ux_<table>_<column>_<column>...'.
+    An index which is already attached to the table is reused.
+
+    Args:
+        model (type[BaseSqlModel]): The SQLModel class declaring the indexes.
+
+    Returns:
+        list[Index]: The declared indexes.
+    """
+    table = model.__table__
+    existing = {index.name: index for index in table.indexes}
+    declared = [(f"ix_{table.name}_{'_'.join(columns)}", columns, False) for columns in model.__indexes__]
+    if model.__natural_key__:
+        declared.append((f"ux_{table.name}_{'_'.join(model.__natural_key__)}", model.__natural_key__, True))
+    return [existing.get(name) or Index(name, *(table.c[column] for column in columns), unique=unique) for name, columns, unique in declared]
+
+
+class IndexAdvisor:
+    """A class to report the columns which are often filtered on but have no index.
+
+    The advisor counts the queries filtering on each column. When a column without index reaches 'threshold' queries,
+    a warning is logged once. A column is considered indexed when it's the primary key or the leading column of an index of the model.
+
+    Attributes:
+        * logger (Logger): The logger used to log the warnings.
+        * table (Table): The table of the model.
+        * threshold (int): The number of queries after which a column without index is reported.
+        * counts (Counter[str]): The number of queries per column.
+
+    Methods:
+        * record(column: str): Counts a query filtering on a column.
+        * unindexed_columns(): Returns the query counts of the columns without index.
+    """
+
+    def __init__(self, logger: Logger, table: Table, threshold: int = 100) -> None:
+        """Initializes the IndexAdvisor object.
+
+        Args:
+            logger (Logger): The logger used to log the warnings.
+            table (Table): The table of the model.
+            threshold (int): The number of queries after which a column without index is reported.
+        """
+        self.logger = logger
+        self.table = table
+        self.threshold = threshold
+        self.counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def indexed_columns(self) -> set[str]:
+        """Returns the columns which can be looked up with an index.
+
+        Returns:
+            set[str]: The primary key columns and the leading columns of the indexes of the table.
+        """
+        columns = {column.name for column in self.table.primary_key.columns}
+        columns.update(next(iter(index.columns)).name for index in self.table.indexes if index.columns)
+        return columns
+
+    def record(self, column: str) -> None:
+        """Counts a query filtering on a column, and warns when an unindexed column reaches the threshold.
+
+        Args:
+            column (str): The column filtered on.
+        """
+        with self._lock:
+            self.counts[column] += 1
+            count = self.counts[column]
+        if count == self.threshold and column not in self.indexed_columns:
+            msg = f"Column '{self.table.name}.{column}' was queried {count} times without index, consider declaring one."
+            self.logger.warning(msg)
+
+    def unindexed_columns(self) -> dict[str, int]:
+        """Returns the query counts of the columns without index.
+
+        Returns:
+            dict[str, int]: The query counts of the columns without index, most queried first.
+        """
+        indexed = self.indexed_columns
+        return {column: count for column, count in self.counts.most_common() if column not in indexed}
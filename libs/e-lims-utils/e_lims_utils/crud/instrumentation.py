@@ -0,0 +1,354 @@
+"""Timing instrumentation of the Crud operations: latency histograms and slow-operation log."""
+from __future__ import annotations
+
+import bisect
+import contextlib
+import dataclasses
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from sqlalchemy import Connection, Engine
+
+    from e_lims_utils.logger.logger import Logger
+
+_F = TypeVar("_F", bound="Callable[..., Any]")
+_T = TypeVar("_T")
+
+DEFAULT_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+_ROW_COUNT_OPERATIONS = frozenset({"delete_where", "delete_by_ids", "delete_by_field", "update_where", "updates", "write_parquet"})
+
+
+@dataclasses.dataclass
+class StatementTiming:
+    """A class used to represent a SQL statement executed by a Crud operation.
+
+    Attributes:
+        * statement (str): The SQL statement, with its bound-parameter placeholders.
+        * seconds (float): The execution time of the statement, in seconds.
+        * rowcount (int): The number of rows affected, -1 if the driver doesn't report it.
+    """
+
+    statement: str
+    seconds: float
+    rowcount: int
+
+
+@dataclasses.dataclass
+class OperationTiming:
+    """A class used to represent a timed Crud operation.
+
+    Attributes:
+        * operation (str): The name of the Crud method.
+        * table (str): The name of the table of the Crud object.
+        * seconds (float): The wall time of the operation, in seconds.
+        * rows (int | None): The number of rows affected, or returned if no statement reports affected rows, None if unknown.
+        * statements (list[StatementTiming]): The SQL statements executed by the operation.
+    """
+
+    operation: str
+    table: str
+    seconds: float = 0.0
+    rows: int | None = None
+    statements: list[StatementTiming] = dataclasses.field(default_factory=list)
+
+
+_current: ContextVar[OperationTiming | None] = ContextVar("_current", default=None)
+
+
+@dataclasses.dataclass
+class LatencyHistogram:
+    """A class used to represent the distribution of the latencies of an operation, with fixed bucket bounds.
+
+    Attributes:
+        * bounds (tuple[float, ...]): The upper bounds of the buckets, in seconds, in ascending order. A last bucket holds the larger latencies.
+        * counts (list[int]): The number of latencies per bucket.
+        * count (int): The number of latencies.
+        * total (float): The sum of the latencies, in seconds.
+        * maximum (float): The largest latency, in seconds.
+
+    Methods:
+        * record(seconds: float): Adds a latency to the histogram.
+        * percentile(fraction: float): Returns the upper bound of the bucket holding a percentile.
+    """
+
+    bounds: tuple[float, ...] = DEFAULT_BOUNDS
+    counts: list[int] = dataclasses.field(init=False)
+    count: int = 0
+    total: float = 0.0
+    maximum: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Initializes the empty buckets."""
+        self.counts = [0] * (len(self.bounds) + 1)
+
+    @property
+    def mean(self) -> float:
+        """Returns the mean latency.
+
+        Returns:
+            float: The mean latency in seconds, 0.0 without latencies.
+        """
+        return self.total / self.count if self.count else 0.0
+
+    def record(self, seconds: float) -> None:
+        """Adds a latency to the histogram.
+
+        Args:
+            seconds (float): The latency, in seconds.
+        """
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+
+    def percentile(self, fraction: float) -> float:
+        """Returns the upper bound of the bucket holding a percentile, such as 0.99 for the 99th percentile.
+
+        Args:
+            fraction (float): The percentile, between 0 and 1.
+
+        Returns:
+            float: The upper bound of the bucket in seconds, the maximum latency for the last bucket, 0.0 without latencies.
+        """
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        cumulated = 0
+        for bound, count in zip(self.bounds, self.counts, strict=False):
+            cumulated += count
+            if cumulated >= rank:
+                return min(bound, self.maximum)
+        return self.maximum
+
+
+class Instrumentation:
+    """A class to time the Crud operations and log the slow ones.
+
+    The operations of a Crud object created with an Instrumentation object are timed, with the SQL statements they execute,
+    which are captured from the 'before_cursor_execute' and 'after_cursor_execute' events of the engine.
+    Each operation adds its wall time to the latency histogram of its name. An operation slower than 'threshold' seconds
+    is logged at WARNING with its row count and statements, and kept in 'slow_operations'.
+    An Instrumentation object can be shared by several Crud objects, their latencies are then merged per operation name.
+
+    Attributes:
+        * logger (Logger): The logger used to log the slow operations.
+        * threshold (float): The number of seconds above which an operation is slow.
+        * bounds (tuple[float, ...]): The upper bounds of the buckets of the histograms, in seconds.
+        * histograms (dict[str, LatencyHistogram]): The latency histograms keyed by operation name.
+        * slow_operations (deque[OperationTiming]): The latest slow operations, at most 'keep'.
+
+    Methods:
+        * attach(engine: Engine): Captures the statements executed on an engine.
+        * timed(operation: str, table: str): Times the operation run in the context.
+        * timed_iterator(operation: str, table: str, items: Iterator): Times an iterator from its first to its last item.
+        * reset(): Removes the latencies and the slow operations.
+    """
+
+    def __init__(self, logger: Logger, threshold: float = 0.5, bounds: tuple[float, ...] = DEFAULT_BOUNDS, keep: int = 100) -> None:
+        """Initializes the Instrumentation object.
+
+        Args:
+            logger (Logger): The logger used to log the slow operations.
+            threshold (float): The number of seconds above which an operation is slow.
+            bounds (tuple[float, ...]): The upper bounds of the buckets of the histograms, in seconds.
+            keep (int): The number of slow operations kept.
+        """
+        self.logger = logger
+        self.threshold = threshold
+        self.bounds = bounds
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self.slow_operations: deque[OperationTiming] = deque(maxlen=keep)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def attach(engine: Engine) -> None:
+        """Captures the statements executed on an engine for the timed operations. Attaching an engine twice has no effect.
+
+        Args:
+            engine (Engine): The engine, the synchronous engine of an asyncio engine.
+        """
+        if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    @contextlib.contextmanager
+    def timed(self, operation: str, table: str) -> Iterator[OperationTiming | None]:
+        """Times the operation run in the context. Operations nested in a timed operation are part of it and are not timed.
+
+        Args:
+            operation (str): The name of the operation.
+            table (str): The name of the table.
+
+        Yields:
+            OperationTiming | None: The timing, to set the number of rows returned on, None for a nested operation.
+        """
+        if _current.get() is not None:
+            yield None
+            return
+        timing = OperationTiming(operation, table)
+        token = _current.set(timing)
+        start = time.perf_counter()
+        try:
+            yield timing
+        finally:
+            _current.reset(token)
+            self._record(timing, time.perf_counter() - start)
+
+    def timed_iterator(self, operation: str, table: str, items: Iterator[_T]) -> Iterator[_T]:
+        """Times an iterator from its first to its last item, its rows are the number of items.
+
+        The statements are captured while an item is produced only, not while the caller processes it.
+
+        Args:
+            operation (str): The name of the operation.
+            table (str): The name of the table.
+            items (Iterator[_T]): The iterator to time.
+
+        Yields:
+            _T: The next item of the iterator.
+        """
+        if _current.get() is not None:
+            yield from items
+            return
+        timing = OperationTiming(operation, table, rows=0)
+        start = time.perf_counter()
+        try:
+            while True:
+                token = _current.set(timing)
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+                finally:
+                    _current.reset(token)
+                timing.rows += 1
+                yield item
+        finally:
+            self._record(timing, time.perf_counter() - start)
+
+    def reset(self) -> None:
+        """Removes the latencies and the slow operations."""
+        with self._lock:
+            self.histograms.clear()
+            self.slow_operations.clear()
+
+    def _record(self, timing: OperationTiming, seconds: float) -> None:
+        """Adds a finished operation to its histogram and logs it if it's slow.
+
+        The rows affected reported by the statements take precedence over the rows returned.
+
+        Args:
+            timing (OperationTiming): The finished operation.
+            seconds (float): The wall time of the operation, in seconds.
+        """
+        timing.seconds = seconds
+        affected = [statement.rowcount for statement in timing.statements if statement.rowcount >= 0]
+        if affected:
+            timing.rows = sum(affected)
+        with self._lock:
+            self.histograms.setdefault(timing.operation, LatencyHistogram(self.bounds)).record(timing.seconds)
+            slow = timing.seconds > self.threshold
+            if slow:
+                self.slow_operations.append(timing)
+        if slow:
+            statements = "; ".join(statement.statement for statement in timing.statements)
+            msg = f"Slow Crud.{timing.operation} on '{timing.table}': {timing.seconds * 1000:.1f} ms, {timing.rows} rows, {len(timing.statements)} statements: {statements}"
+            self.logger.warning(msg)
+
+
+def _before_cursor_execute(connection: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:  # noqa: ANN401, ARG001, FBT001, PLR0913
+    """Stores the start time of a statement executed in a timed operation on its execution context.
+
+    The start time lives and dies with the context of the statement, so a statement which fails leaves nothing behind.
+    """
+    if _current.get() is not None and context is not None:
+        context._instrumentation_start = time.perf_counter()  # noqa: SLF001
+
+
+def _after_cursor_execute(connection: Connection, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:  # noqa: ANN401, ARG001, FBT001, PLR0913
+    """Adds a statement executed in a timed operation to the operation."""
+    timing = _current.get()
+    start = getattr(context, "_instrumentation_start", None)
+    if timing is not None and start is not None:
+        timing.statements.append(StatementTiming(statement, time.perf_counter() - start, cursor.rowcount))
+
+
+def _returned_rows(operation: str, result: Any) -> int | None:  # noqa: ANN401
+    """Returns the number of rows returned by an operation.
+
+    An integer is a number of rows for the operations which return the rows they deleted, updated or wrote only,
+    the integer returned by another operation, such as count, is a single row.
+
+    Args:
+        operation (str): The name of the operation.
+        result (Any): The value returned by the operation: a record, records, a count, a mapping of records or columns, or a report.
+
+    Returns:
+        int | None: The number of rows, None if unknown.
+    """
+    if result is None:
+        return 0
+    if isinstance(result, int) and not isinstance(result, bool) and operation in _ROW_COUNT_OPERATIONS:
+        return result
+    if isinstance(result, list | tuple):
+        return len(result)
+    if isinstance(result, dict):
+        first = next(iter(result.values()), None)
+        return len(first) if hasattr(first, "shape") else len(result)
+    for attribute in ("rows", "num_rows"):
+        if isinstance(getattr(result, attribute, None), int):
+            return getattr(result, attribute)
+    return 1
+
+
+def instrumented(method: _F) -> _F:
+    """Decorates a method of a Crud or Query object to time it when the Crud object has an Instrumentation object.
+
+    The method is called directly when the 'instrumentation' attribute of the Crud object is None. The operation is named
+    after the method, prefixed with 'query.' for a Query method. A generator method is timed from its first to its last item.
+
+    Args:
+        method (_F): The method to time.
+
+    Returns:
+        _F: The decorated method.
+    """
+
+    def operation(owner: Any) -> tuple[Instrumentation | None, str, str]:  # noqa: ANN401
+        crud = getattr(owner, "crud", owner)
+        name = method.__name__ if crud is owner else f"query.{method.__name__}"
+        return crud.instrumentation, name, crud.model.__table__.name
+
+    if inspect.isgeneratorfunction(method):
+
+        @functools.wraps(method)
+        def generator_wrapper(self: Any, *args: Any, **kwargs: Any) -> Iterator[Any]:  # noqa: ANN401
+            instrumentation, name, table = operation(self)
+            if instrumentation is None:
+                return method(self, *args, **kwargs)
+            return instrumentation.timed_iterator(name, table, method(self, *args, **kwargs))
+
+        return generator_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(method)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:  # noqa: ANN401
+        instrumentation, name, table = operation(self)
+        if instrumentation is None:
+            return method(self, *args, **kwargs)
+        with instrumentation.timed(name, table) as timing:
+            result = method(self, *args, **kwargs)
+            if timing is not None:
+                timing.rows = _returned_rows(method.__name__, result)
+            return result
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,254 @@
+"""Bulk loading of CSV and Parquet files into the table of a Crud object.
+
+PyArrow is an optional dependency, installed with the 'export' extra. It's imported when a Parquet file is read.
+"""
+from __future__ import annotations
+
+import csv
+import dataclasses
+import datetime as dt
+import io
+import itertools
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from e_lims_utils.crud import export
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+    from pathlib import Path
+
+    from sqlalchemy import Column, Connection, Table
+
+_BOOLEANS = {"true": True, "t": True, "yes": True, "1": True, "false": False, "f": False, "no": False, "0": False}
+
+
+class FileFormat(StrEnum):
+    """An enumeration class used to represent the formats of the files loaded into a table.
+
+    Attributes:
+        * CSV (str): Comma-separated values with a header row of column names.
+        * PARQUET (str): Apache Parquet columnar file.
+    """
+
+    CSV = "csv"
+    PARQUET = "parquet"
+
+    @classmethod
+    def from_path(cls: type[FileFormat], path: Path) -> FileFormat:
+        """Returns the format of a file from its suffix.
+
+        Args:
+            path (Path): The path of the file.
+
+        Returns:
+            FileFormat: The format of the file.
+
+        Raises:
+            ValueError: If the suffix is not a supported format.
+        """
+        try:
+            return cls(path.suffix.lstrip(".").lower())
+        except ValueError:
+            msg = f"Unsupported file format '{path.suffix}', expected one of {[file_format.value for file_format in cls]}."
+            raise ValueError(msg) from None
+
+
+@dataclasses.dataclass(frozen=True)
+class LoadReport:
+    """A class used to represent the result of a bulk load.
+
+    Attributes:
+        * path (Path): The path of the loaded file.
+        * rows (int): The number of rows loaded.
+        * seconds (float): The duration of the load, in seconds.
+        * rows_per_second (float): The throughput of the load.
+    """
+
+    path: Path
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Returns the throughput of the load.
+
+        Returns:
+            float: The number of rows loaded per second, 0.0 for an instantaneous load.
+        """
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        """Returns the summary of the load, as logged by Crud.load_file."""
+        return f"Loaded {self.rows} rows from '{self.path.name}' in {self.seconds:.3f} s ({self.rows_per_second:.0f} rows/s)."
+
+
+def _check_columns(table: Table, names: Sequence[str]) -> list[Column[Any]]:
+    """Returns the columns of a table matching the column names of a file.
+
+    Args:
+        table (Table): The table loaded into.
+        names (Sequence[str]): The column names of the file.
+
+    Returns:
+        list[Column[Any]]: The columns, in the order of the names.
+
+    Raises:
+        ValueError: If a name is not a column of the table.
+    """
+    unknown = [name for name in names if name not in table.c]
+    if unknown:
+        msg = f"Columns {unknown} are not columns of table '{table.name}'."
+        raise ValueError(msg)
+    return [table.c[name] for name in names]
+
+
+def _parser(column: Column[Any]) -> Callable[[str], Any]:
+    """Returns the function parsing the CSV values of a column to its Python type.
+
+    Args:
+        column (Column[Any]): The column of the values.
+
+    Returns:
+        Callable[[str], Any]: The parser, which raises ValueError or KeyError on an invalid value.
+    """
+    parsers: dict[type | None, Callable[[str], Any]] = {
+        int: int,
+        float: float,
+        bool: lambda value: _BOOLEANS[value.lower()],
+        dt.datetime: dt.datetime.fromisoformat,
+        dt.date: dt.date.fromisoformat,
+    }
+    parse = parsers.get(export.python_type(column), str)
+    if column.nullable:
+        return lambda value: parse(value) if value != "" else None
+    return parse
+
+
+def _parse_column(column: Column[Any], values: Sequence[str], first_line: int) -> list[Any]:
+    """Parses the CSV values of a column to its Python type.
+
+    Args:
+        column (Column[Any]): The column of the values.
+        values (Sequence[str]): The values of the column for a chunk of lines.
+        first_line (int): The line number of the first value in the file, for the error messages.
+
+    Returns:
+        list[Any]: The parsed values.
+
+    Raises:
+        ValueError: If a value can't be parsed to the type of the column.
+    """
+    parse = _parser(column)
+    try:
+        return list(map(parse, values))
+    except (ValueError, KeyError):
+        for line, value in enumerate(values, first_line):
+            try:
+                parse(value)
+            except (ValueError, KeyError):  # noqa: PERF203
+                msg = f"Invalid value {value!r} for column '{column.name}' at line {line}."
+                raise ValueError(msg) from None
+        raise
+
+
+def _read_csv(path: Path, table: Table, chunk_size: int) -> Iterator[dict[str, list[Any]]]:
+    """Streams a CSV file in chunks of columns parsed to the types of the table.
+
+    Args:
+        path (Path): The path of the CSV file, with a header row of column names.
+        table (Table): The table loaded into.
+        chunk_size (int): The number of lines per chunk.
+
+    Yields:
+        dict[str, list[Any]]: The values of the next chunk of lines, keyed by column name.
+    """
+    with path.open(newline="", encoding="utf-8") as file:
+        reader = csv.reader(file)
+        names = next(reader, [])
+        columns = _check_columns(table, names)
+        line = 2
+        while True:
+            lines = list(itertools.islice(reader, chunk_size))
+            if not lines:
+                return
+            yield {column.name: _parse_column(column, values, line) for column, values in zip(columns, zip(*lines, strict=True), strict=True)}
+            line += len(lines)
+
+
+def _read_parquet(path: Path, table: Table, chunk_size: int) -> Iterator[dict[str, list[Any]]]:
+    """Streams a Parquet file in chunks of columns cast to the types of the table.
+
+    The values are cast by Arrow, a whole column at a time, and a lossy cast raises an error.
+
+    Args:
+        path (Path): The path of the Parquet file.
+        table (Table): The table loaded into.
+        chunk_size (int): The number of rows per chunk.
+
+    Yields:
+        dict[str, list[Any]]: The values of the next chunk of rows, keyed by column name.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    parquet = pq.ParquetFile(path)
+    schema = export.arrow_schema(_check_columns(table, parquet.schema_arrow.names))
+    for batch in parquet.iter_batches(batch_size=chunk_size):
+        yield pa.Table.from_batches([batch]).cast(schema).to_pydict()
+
+
+def read_chunks(path: Path, table: Table, file_format: FileFormat, chunk_size: int) -> Iterator[dict[str, list[Any]]]:
+    """Streams a file in chunks of columns validated against the types of a table.
+
+    Args:
+        path (Path): The path of the file.
+        table (Table): The table loaded into.
+        file_format (FileFormat): The format of the file.
+        chunk_size (int): The number of rows per chunk.
+
+    Returns:
+        Iterator[dict[str, list[Any]]]: The chunks of values, keyed by column name.
+    """
+    readers = {FileFormat.CSV: _read_csv, FileFormat.PARQUET: _read_parquet}
+    return readers[file_format](path, table, chunk_size)
+
+
+def copy_rows(connection: Connection, table: Table, chunk: dict[str, list[Any]]) -> None:
+    """Loads a chunk of columns into a PostgreSQL table with COPY ... FROM STDIN.
+
+    psycopg (version 3) rows are written with 'Cursor.copy', psycopg2 rows are streamed as CSV with 'cursor.copy_expert'.
+
+    Args:
+        connection (Connection): The connection of the transaction.
+        table (Table): The table loaded into.
+        chunk (dict[str, list[Any]]): The values of the chunk, keyed by column name.
+    """
+    preparer = connection.dialect.identifier_preparer
+    names = ", ".join(preparer.quote(name) for name in chunk)
+    rows = zip(*chunk.values(), strict=True)
+    cursor = connection.connection.cursor()
+    try:
+        if hasattr(cursor, "copy"):
+            with cursor.copy(f"COPY {preparer.format_table(table)} ({names}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+        else:
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            cursor.copy_expert(f"COPY {preparer.format_table(table)} ({names}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def insert_rows(connection: Connection, table: Table, chunk: dict[str, list[Any]]) -> None:
+    """Loads a chunk of columns into a table with one executemany INSERT statement.
+
+    Args:
+        connection (Connection): The connection of the transaction.
+        table (Table): The table loaded into.
+        chunk (dict[str, list[Any]]): The values of the chunk, keyed by column name.
+    """
+    names = list(chunk)
+    connection.execute(table.insert(), [dict(zip(names, row, strict=True)) for row in zip(*chunk.values(), strict=True)])
@@ -0,0 +1,385 @@
+"""Query builder of the Crud class: predicates, ordering, pagination and projection."""
+from __future__ import annotations
+
+import dataclasses
+import enum
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import and_, func, or_
+from sqlmodel import select
+
+from e_lims_utils.crud.instrumentation import instrumented
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlalchemy import ColumnElement, Row, Select
+
+    from e_lims_utils.crud.crud import BaseSqlModel, Crud
+
+
+class Operator(enum.StrEnum):
+    """Enum class representing the operators of the predicates.
+
+    Attributes:
+        EQ (str): Equal to the value.
+        NE (str): Not equal to the value.
+        LT (str): Lower than the value.
+        LE (str): Lower than or equal to the value.
+        GT (str): Greater than the value.
+        GE (str): Greater than or equal to the value.
+        IN (str): In the sequence of values.
+        BETWEEN (str): Between the two bounds of the value, inclusive.
+        LIKE (str): Matching the SQL LIKE pattern of the value.
+        AND (str): All the predicates are true.
+        OR (str): At least one of the predicates is true.
+    """
+
+    EQ = "EQ"
+    NE = "NE"
+    LT = "LT"
+    LE = "LE"
+    GT = "GT"
+    GE = "GE"
+    IN = "IN"
+    BETWEEN = "BETWEEN"
+    LIKE = "LIKE"
+    AND = "AND"
+    OR = "OR"
+
+
+class Aggregate(enum.StrEnum):
+    """Enum class representing the SQL aggregate functions of Crud.aggregate.
+
+    Attributes:
+        COUNT (str): The number of non-NULL values.
+        SUM (str): The sum of the values.
+        MIN (str): The smallest value.
+        MAX (str): The largest value.
+        AVG (str): The mean of the values.
+    """
+
+    COUNT = "COUNT"
+    SUM = "SUM"
+    MIN = "MIN"
+    MAX = "MAX"
+    AVG = "AVG"
+
+    def label(self, field: str) -> str:
+        """Returns the name of the aggregate of a field in the results, such as 'max_age'.
+
+        Args:
+            field (str): The aggregated field.
+
+        Returns:
+            str: The lowercase function name and the field, joined by an underscore.
+        """
+        return f"{self.value.lower()}_{field}"
+
+    def function(self, column: ColumnElement[Any]) -> ColumnElement[Any]:
+        """Returns the SQL aggregate of a column, labelled.
+
+        Args:
+            column (ColumnElement[Any]): The aggregated column.
+
+        Returns:
+            ColumnElement[Any]: The aggregate expression.
+        """
+        return getattr(func, self.value.lower())(column).label(self.label(column.key))
+
+
+@dataclasses.dataclass(frozen=True)
+class Predicate:
+    """A class used to represent a filter on the records, compiled to a SQL WHERE clause.
+
+    A predicate is either a comparison of a field with a value, or a combination of predicates with AND or OR.
+    Predicates are built with the functions of this module and combined with the '&' and '|' operators.
+
+    Examples:
+        >>> predicate = (
+        ...     eq(
+        ...         "operator",
+        ...         "Jane",
+        ...     )
+        ...     | eq(
+        ...         "operator",
+        ...         "John",
+        ...     )
+        ... ) & between(
+        ...     "age", 20, 30
+        ... )
+        >>> sorted(
+        ...     predicate.fields()
+        ... )
+        ['age', 'operator', 'operator']
+
+    Attributes:
+        operator (Operator): The operator of the predicate.
+        field (str | None): The field compared, None for a combination.
+        value (Any): The value compared with, the combined predicates for a combination.
+    """
+
+    operator: Operator
+    field: str | None = None
+    value: Any = None
+
+    def __and__(self, other: Predicate) -> Predicate:
+        """Combines two predicates with AND."""
+        return and_predicates(self, other)
+
+    def __or__(self, other: Predicate) -> Predicate:
+        """Combines two predicates with OR."""
+        return or_predicates(self, other)
+
+    def fields(self) -> Iterator[str]:
+        """Returns the fields compared by the predicate and its combined predicates.
+
+        Yields:
+            str: The next field compared.
+        """
+        if self.field is not None:
+            yield self.field
+        elif self.operator in (Operator.AND, Operator.OR):
+            for predicate in self.value:
+                yield from predicate.fields()
+
+    def clause(self, model: type[BaseSqlModel]) -> ColumnElement[bool]:
+        """Compiles the predicate to a WHERE clause on a model.
+
+        Args:
+            model (type[BaseSqlModel]): The SQLModel class to filter.
+
+        Returns:
+            ColumnElement[bool]: The WHERE clause.
+        """
+        if self.operator is Operator.AND:
+            return and_(*(predicate.clause(model) for predicate in self.value))
+        if self.operator is Operator.OR:
+            return or_(*(predicate.clause(model) for predicate in self.value))
+        column = getattr(model, self.field)
+        clauses = {
+            Operator.EQ: lambda: column == self.value,
+            Operator.NE: lambda: column != self.value,
+            Operator.LT: lambda: column < self.value,
+            Operator.LE: lambda: column <= self.value,
+            Operator.GT: lambda: column > self.value,
+            Operator.GE: lambda: column >= self.value,
+            Operator.IN: lambda: column.in_(self.value),
+            Operator.BETWEEN: lambda: column.between(*self.value),
+            Operator.LIKE: lambda: column.like(self.value),
+        }
+        return clauses[self.operator]()
+
+
+def eq(field: str, value: Any) -> Predicate:  # noqa: ANN401
+    """Returns a predicate true when a field is equal to a value."""
+    return Predicate(Operator.EQ, field, value)
+
+
+def ne(field: str, value: Any) -> Predicate:  # noqa: ANN401
+    """Returns a predicate true when a field is not equal to a value."""
+    return Predicate(Operator.NE, field, value)
+
+
+def lt(field: str, value: Any) -> Predicate:  # noqa: ANN401
+    """Returns a predicate true when a field is lower than a value."""
+    return Predicate(Operator.LT, field, value)
+
+
+def le(field: str, value: Any) -> Predicate:  # noqa: ANN401
+    """Returns a predicate true when a field is lower than or equal to a value."""
+    return Predicate(Operator.LE, field, value)
+
+
+def gt(field: str, value: Any) -> Predicate:  # noqa: ANN401
+    """Returns a predicate true when a field is greater than a value."""
+    return Predicate(Operator.GT, field, value)
+
+
+def ge(field: str, value: Any) -> Predicate:  # noqa: ANN401
+    """Returns a predicate true when a field is greater than or equal to a value."""
+    return Predicate(Operator.GE, field, value)
+
+
+def in_(field: str, values: list[Any] | tuple[Any, ...]) -> Predicate:
+    """Returns a predicate true when a field is in a sequence of values."""
+    return Predicate(Operator.IN, field, tuple(values))
+
+
+def between(field: str, low: Any, high: Any) -> Predicate:  # noqa: ANN401
+    """Returns a predicate true when a field is between two bounds, inclusive."""
+    return Predicate(Operator.BETWEEN, field, (low, high))
+
+
+def like(field: str, pattern: str) -> Predicate:
+    """Returns a predicate true when a field matches a SQL LIKE pattern, such as 'SN-%'."""
+    return Predicate(Operator.LIKE, field, pattern)
+
+
+def and_predicates(*predicates: Predicate) -> Predicate:
+    """Returns a predicate true when all the predicates are true."""
+    return Predicate(Operator.AND, None, predicates)
+
+
+def or_predicates(*predicates: Predicate) -> Predicate:
+    """Returns a predicate true when at least one of the predicates is true."""
+    return Predicate(Operator.OR, None, predicates)
+
+
+@dataclasses.dataclass(frozen=True)
+class Query:
+    """A class to build and run a SELECT statement on the table of a Crud object.
+
+    Queries are immutable: each builder method returns a new query. Filtering, ordering and pagination are executed by the database.
+    With a projection, only the selected columns are transferred and the records are returned as lightweight rows or dictionaries
+    instead of model instances.
+
+    Examples:
+        >>> query = (
+        ...     crud.query()
+        ...     .where(
+        ...         like(
+        ...             "serial",
+        ...             "SN-%",
+        ...         ),
+        ...         operator="Jane",
+        ...     )
+        ...     .order_by(
+        ...         "-age"
+        ...     )
+        ...     .limit(10)
+        ... )  # doctest: +SKIP
+        >>> query.columns(
+        ...     "uid", "age"
+        ... ).dicts()  # doctest: +SKIP
+        [{'uid': 4, 'age': 31}, {'uid': 2, 'age': 22}]
+
+    Attributes:
+        crud (Crud): The Crud object the query runs on.
+        predicates (tuple[Predicate, ...]): The predicates the records must satisfy, combined with AND.
+        ordering (tuple[str, ...]): The fields to order by, prefixed with '-' for a descending order.
+        limit_to (int | None): The maximum number of records, None for no limit.
+        offset_by (int | None): The number of records to skip, None to skip none.
+        projection (tuple[str, ...]): The fields to select, empty to select the model.
+
+    Methods:
+        * where(*predicates: Predicate, **equalities: Any): Adds predicates and field equalities.
+        * order_by(*fields: str): Sets the fields to order by.
+        * limit(limit: int): Sets the maximum number of records.
+        * offset(offset: int): Sets the number of records to skip.
+        * columns(*fields: str): Sets the fields to select.
+        * statement(): Returns the SELECT statement of the query.
+        * all(): Runs the query and returns the records.
+        * first(): Runs the query and returns the first record.
+        * dicts(): Runs the query and returns the records as dictionaries.
+    """
+
+    crud: Crud
+    predicates: tuple[Predicate, ...] = ()
+    ordering: tuple[str, ...] = ()
+    limit_to: int | None = None
+    offset_by: int | None = None
+    projection: tuple[str, ...] = ()
+
+    def where(self, *predicates: Predicate, **equalities: Any) -> Query:  # noqa: ANN401
+        """Returns a query with additional predicates and field equalities, combined with AND.
+
+        Args:
+            *predicates (Predicate): The predicates the records must satisfy.
+            **equalities (Any): The field values the records must be equal to.
+
+        Returns:
+            Query: The new query.
+        """
+        return dataclasses.replace(self, predicates=(*self.predicates, *predicates, *(eq(field, value) for field, value in equalities.items())))
+
+    def order_by(self, *fields: str) -> Query:
+        """Returns a query ordered by fields.
+
+        Args:
+            *fields (str): The fields to order by, prefixed with '-' for a descending order.
+
+        Returns:
+            Query: The new query.
+        """
+        return dataclasses.replace(self, ordering=fields)
+
+    def limit(self, limit: int) -> Query:
+        """Returns a query limited to a number of records.
+
+        Args:
+            limit (int): The maximum number of records.
+
+        Returns:
+            Query: The new query.
+        """
+        return dataclasses.replace(self, limit_to=limit)
+
+    def offset(self, offset: int) -> Query:
+        """Returns a query skipping a number of records.
+
+        Args:
+            offset (int): The number of records to skip.
+
+        Returns:
+            Query: The new query.
+        """
+        return dataclasses.replace(self, offset_by=offset)
+
+    def columns(self, *fields: str) -> Query:
+        """Returns a query selecting only some fields.
+
+        Args:
+            *fields (str): The fields to select.
+
+        Returns:
+            Query: The new query.
+        """
+        return dataclasses.replace(self, projection=fields)
+
+    def statement(self) -> Select[Any]:
+        """Returns the SELECT statement of the query.
+
+        Returns:
+            Select[Any]: The SELECT statement.
+        """
+        model = self.crud.model
+        statement = select(*(getattr(model, field) for field in self.projection)) if self.projection else select(model)
+        statement = statement.where(*(clause for predicate in self.predicates for clause in self.crud._filter(predicate)))  # noqa: SLF001
+        for field in self.ordering:
+            statement = statement.order_by(getattr(model, field[1:]).desc() if field.startswith("-") else getattr(model, field))
+        if self.limit_to is not None:
+            statement = statement.limit(self.limit_to)
+        if self.offset_by is not None:
+            statement = statement.offset(self.offset_by)
+        return statement
+
+    @instrumented
+    def all(self) -> list[BaseSqlModel] | list[Row[Any]]:
+        """Runs the query and returns the records.
+
+        Returns:
+            list[BaseSqlModel] | list[Row[Any]]: The model instances, or the rows of the selected fields with a projection.
+        """
+        with self.crud.transaction() as session:
+            reads = session.execute(self.statement()).all() if self.projection else session.exec(self.statement()).all()
+            self.crud.logger.debug("Query records.")
+            return reads
+
+    def first(self) -> BaseSqlModel | Row[Any] | None:
+        """Runs the query limited to one record and returns it.
+
+        Returns:
+            BaseSqlModel | Row[Any] | None: The first record, or None if no record matches.
+        """
+        reads = self.limit(1).all()
+        return reads[0] if reads else None
+
+    def dicts(self) -> list[dict[str, Any]]:
+        """Runs the query and returns the records as dictionaries, without creating model instances.
+
+        Returns:
+            list[dict[str, Any]]: The values of the selected fields, or of all the columns without a projection, per record.
+        """
+        query = self if self.projection else self.columns(*(column.key for column in self.crud.model.__table__.columns))
+        return [row._asdict() for row in query.all()]
@@ -0,0 +1,72 @@
+"""Lightweight row formats of the Crud reads: SQLAlchemy rows and generated __slots__ records."""
+from __future__ import annotations
+
+import dataclasses
+import functools
+import itertools
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any
+
+from e_lims_utils.crud import export
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from sqlalchemy import Row
+
+    from e_lims_utils.crud.crud import BaseSqlModel
+
+
+class RowFactory(StrEnum):
+    """An enumeration class used to represent the formats of the records returned by the Crud reads.
+
+    Attributes:
+        * MODEL (str): Model instances, validated and tracked by the session.
+        * ROW (str): SQLAlchemy Row tuples of the column values, also accessible by field name.
+        * RECORD (str): Instances of a __slots__ dataclass generated per model, with the fields of the model.
+    """
+
+    MODEL = "MODEL"
+    ROW = "ROW"
+    RECORD = "RECORD"
+
+
+@functools.cache
+def record_class(model: type[BaseSqlModel]) -> type:
+    """Returns the __slots__ dataclass of the records of a model, generated once per model.
+
+    The dataclass has one field per column of the table of the model, in the order of the columns.
+    Its instances are created without validation and take a fraction of the memory of the model instances.
+
+    Examples:
+        >>> record_class(model)(
+        ...     uid=1,
+        ...     name="John",
+        ...     age=25,
+        ... )  # doctest: +SKIP
+        ModelRecord(uid=1, name='John', age=25)
+
+    Args:
+        model (type[BaseSqlModel]): The SQLModel class.
+
+    Returns:
+        type: The dataclass, named after the model with a 'Record' suffix.
+    """
+    fields = [(column.key, export.python_type(column) or Any) for column in model.__table__.columns]
+    return dataclasses.make_dataclass(f"{model.__name__}Record", fields, slots=True)
+
+
+def convert_rows(rows: Iterable[Row[Any]], row_factory: RowFactory, model: type[BaseSqlModel]) -> Iterator[Any]:
+    """Converts the rows of the columns of a model to a row format.
+
+    Args:
+        rows (Iterable[Row[Any]]): The rows of all the columns of the table of the model, in the order of the columns.
+        row_factory (RowFactory): The format of the records, ROW or RECORD.
+        model (type[BaseSqlModel]): The SQLModel class.
+
+    Returns:
+        Iterator[Any]: The records.
+    """
+    if row_factory is RowFactory.RECORD:
+        return itertools.starmap(record_class(model), rows)
+    return iter(rows)
@@ -15,10 +15,12 @@ class FileSuffix(StrEnum):
 
     Attributes:
         * LOG (str): log file suffix
+        * JSONL (str): JSON lines file suffix
         * NONE (str): no file suffix
     """
 
     LOG = "log"
+    JSONL = "jsonl"
     NONE = ""
 
 
@@ -5,7 +5,18 @@ It provides a standard way to generate log messages in the application.
 
 Enumerations:
     LoggerLevel: An enumeration class used to represent the different levels of logging.
+    OverflowPolicy: An enumeration class used to represent what a queued sink does with a message when its queue is full.
+    Compression: An enumeration class used to represent the compression of the rotated log segments.
 
 Classes:
     Logger: A custom logger for the application.
+    QueueOptions: A class used to represent the options of the queued sinks of a Logger.
+    QueuedSink: A class to write the formatted log messages of a loguru handler on a background thread.
+    BufferOptions: A class used to represent the options of the buffered file sink of a Logger.
+    BufferedSink: A class to write the formatted log messages of a loguru handler to a file in large writes.
+    LogRotation: A class used to represent when the log file is rotated and how long the rotated segments are kept.
+    RotatingFile: A class to write log messages to a file which is rotated by size and by time.
+    BlockIndex: A class used to represent a block of records of a structured log file, as described by a line of its index.
+    JsonLinesSink: A class to write log records as JSON lines, with a sparse index of their blocks.
+    StructuredLogReader: A class to query a structured log file through its sparse index.
 """
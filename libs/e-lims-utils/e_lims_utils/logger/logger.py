@@ -1,15 +1,28 @@
 """A module for configuring and using a logger with loguru."""
 from __future__ import annotations
 
+import copy
+import dataclasses
 import enum
 import sys
-from typing import TYPE_CHECKING
+from pathlib import PurePath
+from typing import IO, TYPE_CHECKING, Any
 
 from loguru._logger import Core as _Core
 from loguru._logger import Logger as _Logger
 
+from e_lims_utils.files.files import FileSuffix
+from e_lims_utils.logger.rotation import RotatingFile
+from e_lims_utils.logger.sinks import BufferedSink, QueuedSink
+from e_lims_utils.logger.structured import JsonLinesSink
+
 if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
     from e_lims_utils.files.files import FileProperties
+    from e_lims_utils.logger.rotation import LogRotation
+    from e_lims_utils.logger.sinks import BufferOptions, QueueOptions
 
 
 class LoggerLevel(enum.StrEnum):
@@ -34,19 +47,89 @@ class LoggerLevel(enum.StrEnum):
     CRITICAL = "CRITICAL"
 
 
+_LEVELS = _Core().levels
+# Keyed by the plain level names: the LoggerLevel members, which are str, hash and compare as their names.
+_LEVEL_NUMBERS = {level.value: _LEVELS[level.value].no for level in LoggerLevel}
+# The level numbers of the logging methods, as module constants: an enum member lookup costs more than the level check.
+_TRACE = _LEVEL_NUMBERS[LoggerLevel.TRACE]
+_DEBUG = _LEVEL_NUMBERS[LoggerLevel.DEBUG]
+_INFO = _LEVEL_NUMBERS[LoggerLevel.INFO]
+_SUCCESS = _LEVEL_NUMBERS[LoggerLevel.SUCCESS]
+_WARNING = _LEVEL_NUMBERS[LoggerLevel.WARNING]
+_ERROR = _LEVEL_NUMBERS[LoggerLevel.ERROR]
+_CRITICAL = _LEVEL_NUMBERS[LoggerLevel.CRITICAL]
+
+
 class Logger:
-    """A class for configuring and using a logger with loguru."""
+    """A class for configuring and using a logger with loguru.
+
+    With queue options, the messages are written to stdout and to the file by background threads, through bounded queues,
+    so that logging never waits on I/O unless the overflow policy says so. The queued messages are written when a handler
+    is removed and when the interpreter exits.
 
-    def __init__(self, file: FileProperties, level: LoggerLevel, *, backtrace: bool = True, diagnose: bool = True) -> None:
-        """Initializes the Logger object after its attributes have been set."""
+    With a rotation, the file is rotated by size, by time or both, and the rotated segments are compressed and pruned
+    by a background thread. See RotatingFile.
+
+    With buffer options, the messages of the file handler are written in large writes, when the buffer is full, when
+    its interval has passed, or at once from the ERROR level. See BufferedSink. The queued sinks already write in batches,
+    so the buffer and the queue options are exclusive.
+
+    With structured set, the records are also written as JSON lines, with their bound context, to a '.jsonl' file next to
+    the log file, with a sparse index queried by StructuredLogReader. See JsonLinesSink. The index holds byte offsets into
+    a single file, so a structured Logger takes no rotation.
+
+    The logging methods take a message, formatted with str.format only if args or kwargs are given, or a function without
+    arguments returning the message. Neither the formatting nor the function runs when no handler accepts the level,
+    so that a filtered message costs a comparison.
+
+    Examples:
+        >>> logger.debug(
+        ...     "Read {} records from '{table}'.",
+        ...     len(records),
+        ...     table=name,
+        ... )  # doctest: +SKIP
+        >>> logger.debug(
+        ...     lambda: f"Values: {values!r}"
+        ... )  # doctest: +SKIP
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        file: FileProperties,
+        level: LoggerLevel,
+        *,
+        backtrace: bool = True,
+        diagnose: bool = True,
+        queue: QueueOptions | None = None,
+        rotation: LogRotation | None = None,
+        structured: bool = False,
+        buffer: BufferOptions | None = None,
+    ) -> None:
+        """Initializes the Logger object after its attributes have been set.
+
+        Raises:
+            ValueError: If both queue and buffer options are given, or if a structured Logger has a rotation.
+        """
+        if queue is not None and buffer is not None:
+            msg = "A Logger takes queue or buffer options, not both: the queued sinks already write in batches."
+            raise ValueError(msg)
+        if structured and rotation is not None:
+            msg = "A structured Logger can't rotate its files: the index of the structured log file would point into rotated segments."
+            raise ValueError(msg)
         self.file = file
         self.level = level
         self.backtrace = backtrace
         self.diagnose = diagnose
+        self.queue = queue
+        self.rotation = rotation
+        self.structured = structured
+        self.buffer = buffer
+        self._sinks: dict[str, QueuedSink | BufferedSink] = {}
+        # The depth of 1 skips the frame of the logging methods below, so that the records carry the name, function and line of their caller.
         self._logger = _Logger(
             core=_Core(),
             exception=None,
-            depth=0,
+            depth=1,
             record=False,
             lazy=False,
             colors=False,
@@ -55,67 +138,168 @@ class Logger:
             patchers=[],
             extra={},
         )
-        self._logger.add(sink=sys.stdout, level=self.level.value, backtrace=self.backtrace, diagnose=self.diagnose)
-        self._logger.add(sink=str(file.file_path), level=self.level.value, backtrace=self.backtrace, diagnose=self.diagnose)
+        self._core = self._logger._core  # noqa: SLF001
+        self._logger.add(sink=self._sink("stdout", sys.stdout), level=self.level.value, backtrace=self.backtrace, diagnose=self.diagnose)
+        if self.structured:
+            self._logger.add(sink=self._sink("structured", JsonLinesSink(self.structured_path)), level=self.level.value, backtrace=self.backtrace, diagnose=self.diagnose)
+        self._logger.add(sink=self._sink("file", self._file_target()), level=self.level.value, backtrace=self.backtrace, diagnose=self.diagnose)
+
+    @property
+    def structured_path(self) -> Path:
+        """Returns the path of the structured log file, the path of the log file with a '.jsonl' suffix.
+
+        Returns:
+            Path: The path of the structured log file.
+        """
+        return dataclasses.replace(self.file, suffix=FileSuffix.JSONL).file_path
+
+    def _file_target(self) -> Path | RotatingFile:
+        """Returns the target of the file handler, a rotating file if the Logger has a rotation.
+
+        Returns:
+            Path | RotatingFile: The path of the file, or the rotating file.
+        """
+        if self.rotation is not None:
+            return RotatingFile(self.file.file_path, self.rotation)
+        return self.file.file_path
+
+    def _sink(self, name: str, target: Path | IO[str] | RotatingFile | JsonLinesSink) -> QueuedSink | BufferedSink | IO[str] | RotatingFile | JsonLinesSink | str:
+        """Returns the sink of a handler, a queued sink if the Logger has queue options, a buffered file sink if it has buffer options.
+
+        Args:
+            name (str): The name of the handler, 'stdout', 'structured' or 'file'.
+            target (Path | IO[str] | RotatingFile | JsonLinesSink): The file, the stream or the file sink of the handler.
+
+        Returns:
+            QueuedSink | BufferedSink | IO[str] | RotatingFile | JsonLinesSink | str: The sink to add to loguru.
+        """
+        if self.queue is not None:
+            self._sinks[name] = QueuedSink(target, self.queue)
+            return self._sinks[name]
+        if self.buffer is not None and name == "file":
+            self._sinks[name] = BufferedSink(target, self.buffer)
+            return self._sinks[name]
+        return str(target) if isinstance(target, PurePath) else target
 
     def set_file_level(self, level: LoggerLevel) -> None:
         """Set the file handler level."""
         if self.level != level.value:
-            self._logger.remove(list(self._logger._core.handlers.keys())[-1])  # noqa: SLF001
-            self._logger.add(sink=str(self.file.file_path), level=level.value, backtrace=self.backtrace, diagnose=self.diagnose)
+            self._logger.remove(list(self._core.handlers.keys())[-1])
+            self._logger.add(sink=self._sink("file", self._file_target()), level=level.value, backtrace=self.backtrace, diagnose=self.diagnose)
+
+    def bind(self, **context: Any) -> Logger:  # noqa: ANN401
+        """Returns a Logger which adds context values to its records, sharing the handlers of this Logger.
+
+        The context is written by the structured sink, in the 'extra' field of the records.
+
+        Examples:
+            >>> instrument_logger = logger.bind(
+            ...     instrument="X",
+            ...     run=42,
+            ... )  # doctest: +SKIP
+
+        Args:
+            **context (Any): The context values, keyed by name.
+
+        Returns:
+            Logger: The bound Logger.
+        """
+        bound = copy.copy(self)
+        bound._logger = self._logger.bind(**context)  # noqa: SLF001
+        return bound
+
+    def is_enabled(self, level: LoggerLevel | str) -> bool:
+        """Returns whether a message of a level is logged by at least one handler.
+
+        The lookup of a LoggerLevel member on its class costs more than the check itself on Python 3.11: in a hot loop, pass the
+        level name ("DEBUG") or a member bound once to a local variable.
+
+        Args:
+            level (LoggerLevel | str): The level of the message, or its name.
+
+        Returns:
+            bool: True if the level is not lower than the lowest level of the handlers.
+        """
+        return _LEVEL_NUMBERS[level] >= self._core.min_level
+
+    def drain(self) -> None:
+        """Waits until the queued messages are written and writes the buffered ones, returns immediately without queue or buffer options."""
+        for sink in self._sinks.values():
+            sink.drain()
 
-    def trace(self, message: str) -> None:
+    def trace(self, message: str | Callable[[], str], *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
         """Log a trace message.
 
         Args:
-            message (str): The message to log.
+            message (str | Callable[[], str]): The message to log, or a function returning it.
+            *args (Any): The positional arguments of the message format.
+            **kwargs (Any): The keyword arguments of the message format.
         """
-        self._logger.trace(message)
+        if self._core.min_level <= _TRACE:
+            self._logger.trace(message() if callable(message) else message, *args, **kwargs)
 
-    def debug(self, message: str) -> None:
+    def debug(self, message: str | Callable[[], str], *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
         """Log a debug message.
 
         Args:
-            message (str): The message to log.
+            message (str | Callable[[], str]): The message to log, or a function returning it.
+            *args (Any): The positional arguments of the message format.
+            **kwargs (Any): The keyword arguments of the message format.
         """
-        self._logger.debug(message)
+        if self._core.min_level <= _DEBUG:
+            self._logger.debug(message() if callable(message) else message, *args, **kwargs)
 
-    def info(self, message: str) -> None:
+    def info(self, message: str | Callable[[], str], *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
         """Log an info message.
 
         Args:
-            message (str): The message to log.
+            message (str | Callable[[], str]): The message to log, or a function returning it.
+            *args (Any): The positional arguments of the message format.
+            **kwargs (Any): The keyword arguments of the message format.
         """
-        self._logger.info(message)
+        if self._core.min_level <= _INFO:
+            self._logger.info(message() if callable(message) else message, *args, **kwargs)
 
-    def success(self, message: str) -> None:
+    def success(self, message: str | Callable[[], str], *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
         """Log a success message.
 
         Args:
-            message (str): The message to log.
+            message (str | Callable[[], str]): The message to log, or a function returning it.
+            *args (Any): The positional arguments of the message format.
+            **kwargs (Any): The keyword arguments of the message format.
         """
-        self._logger.success(message)
+        if self._core.min_level <= _SUCCESS:
+            self._logger.success(message() if callable(message) else message, *args, **kwargs)
 
-    def warning(self, message: str) -> None:
+    def warning(self, message: str | Callable[[], str], *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
         """Log a warning message.
 
         Args:
-            message (str): The message to log.
+            message (str | Callable[[], str]): The message to log, or a function returning it.
+            *args (Any): The positional arguments of the message format.
+            **kwargs (Any): The keyword arguments of the message format.
         """
-        self._logger.warning(message)
+        if self._core.min_level <= _WARNING:
+            self._logger.warning(message() if callable(message) else message, *args, **kwargs)
 
-    def error(self, message: str) -> None:
+    def error(self, message: str | Callable[[], str], *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
         """Log an error message.
 
         Args:
-            message (str): The message to log.
+            message (str | Callable[[], str]): The message to log, or a function returning it.
+            *args (Any): The positional arguments of the message format.
+            **kwargs (Any): The keyword arguments of the message format.
         """
-        self._logger.error(message)
+        if self._core.min_level <= _ERROR:
+            self._logger.error(message() if callable(message) else message, *args, **kwargs)
 
-    def critical(self, message: str) -> None:
+    def critical(self, message: str | Callable[[], str], *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
         """Log a critical message.
 
         Args:
-            message (str): The message to log.
+            message (str | Callable[[], str]): The message to log, or a function returning it.
+            *args (Any): The positional arguments of the message format.
+            **kwargs (Any): The keyword arguments of the message format.
         """
-        self._logger.critical(message)
+        if self._core.min_level <= _CRITICAL:
+            self._logger.critical(message() if callable(message) else message, *args, **kwargs)
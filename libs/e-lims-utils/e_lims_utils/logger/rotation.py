@@ -0,0 +1,216 @@
+"""Rotation of the Logger file by size and by time, with retention and background compression of the rotated segments.
+
+zstandard is an optional dependency, installed with the 'zstd' extra. It's imported when a rotation compresses to zstd.
+"""
+from __future__ import annotations
+
+import dataclasses
+import datetime as dt
+import enum
+import gzip
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from pathlib import Path
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class Compression(enum.StrEnum):
+    """Enum class representing the compression of the rotated log segments.
+
+    Attributes:
+        NONE (str): The segments are kept as they are.
+        GZIP (str): The segments are compressed with gzip, to '.gz' files.
+        ZSTD (str): The segments are compressed with zstandard, to '.zst' files. Requires the 'zstd' extra.
+    """
+
+    NONE = "NONE"
+    GZIP = "GZIP"
+    ZSTD = "ZSTD"
+
+    @property
+    def extension(self) -> str:
+        """Returns the extension added to a compressed segment.
+
+        Returns:
+            str: The extension, with its leading dot, empty without compression.
+        """
+        return {Compression.NONE: "", Compression.GZIP: ".gz", Compression.ZSTD: ".zst"}[self]
+
+
+@dataclasses.dataclass(frozen=True)
+class LogRotation:
+    """A class used to represent when the log file is rotated and how long the rotated segments are kept.
+
+    The file is rotated when it reaches 'max_bytes', when it has been open for 'interval', or on the first of both.
+    The rotated segments are compressed, then the segments beyond 'keep' or older than 'max_age' are deleted.
+
+    Attributes:
+        * max_bytes (int | None): The size of the file that triggers a rotation, None to not rotate by size.
+        * interval (dt.timedelta | None): The time after which the file is rotated, None to not rotate by time.
+        * keep (int | None): The maximum number of rotated segments, None to keep them all.
+        * max_age (dt.timedelta | None): The age after which a rotated segment is deleted, None to keep them all.
+        * compression (Compression): The compression of the rotated segments.
+    """
+
+    max_bytes: int | None = None
+    interval: dt.timedelta | None = None
+    keep: int | None = None
+    max_age: dt.timedelta | None = None
+    compression: Compression = Compression.GZIP
+
+    def __post_init__(self) -> None:
+        """Checks that the rotation has a trigger and that zstandard is installed for the ZSTD compression.
+
+        Raises:
+            ValueError: If neither max_bytes nor interval is set.
+        """
+        if self.max_bytes is None and self.interval is None:
+            msg = "A LogRotation needs max_bytes, interval or both."
+            raise ValueError(msg)
+        if self.compression is Compression.ZSTD:
+            import zstandard  # noqa: F401
+
+
+def _compress(segment: Path, compression: Compression) -> Path:
+    """Compresses a rotated segment next to it and deletes it.
+
+    Args:
+        segment (Path): The rotated segment.
+        compression (Compression): The compression, GZIP or ZSTD.
+
+    Returns:
+        Path: The compressed segment.
+    """
+    target = segment.with_name(segment.name + compression.extension)
+    with segment.open("rb") as source:
+        if compression is Compression.GZIP:
+            with gzip.open(target, "wb") as destination:
+                shutil.copyfileobj(source, destination, _CHUNK_SIZE)
+        else:
+            import zstandard
+
+            with target.open("wb") as file, zstandard.ZstdCompressor().stream_writer(file) as destination:
+                shutil.copyfileobj(source, destination, _CHUNK_SIZE)
+    segment.unlink()
+    return target
+
+
+class RotatingFile:
+    """A class to write log messages to a file which is rotated by size and by time.
+
+    A rotated segment is renamed after the file with the time of the rotation, such as 'run.20240101_120000_000000.log',
+    then compressed and pruned by a background thread, so that the logging thread only pays for the rename.
+    The RotatingFile object is a loguru sink, and a target of QueuedSink.
+
+    Attributes:
+        * path (Path): The path of the active file.
+        * rotation (LogRotation): When the file is rotated and how long the segments are kept.
+
+    Methods:
+        * write(message: str): Writes a message and rotates the file first if it's due.
+        * writelines(messages: Iterable[str]): Writes messages, rotating the file between them when it's due.
+        * flush(): Flushes the active file.
+        * rotate(): Rotates the file now.
+        * segments(): Returns the rotated segments, oldest first.
+        * stop(): Closes the file and waits for the background compression.
+    """
+
+    def __init__(self, path: Path, rotation: LogRotation, clock: Callable[[], float] = time.time) -> None:
+        """Initializes the RotatingFile object and opens the file in append mode.
+
+        Args:
+            path (Path): The path of the active file.
+            rotation (LogRotation): When the file is rotated and how long the segments are kept.
+            clock (Callable[[], float]): The clock used to time the rotation interval, in seconds.
+        """
+        self.path = path
+        self.rotation = rotation
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"RotatingFile({path.name})")
+        self._open()
+
+    def _open(self) -> None:
+        """Opens the active file and starts its size and time counts."""
+        self._file = self.path.open("ab")
+        self._size = self._file.tell()
+        self._deadline = self._clock() + self.rotation.interval.total_seconds() if self.rotation.interval else float("inf")
+
+    def _due(self) -> bool:
+        """Returns whether the active file has to be rotated before the next write.
+
+        Returns:
+            bool: True if the file reached its maximum size or its interval.
+        """
+        if self.rotation.max_bytes is not None and self._size >= self.rotation.max_bytes:
+            return True
+        return self._clock() >= self._deadline
+
+    def write(self, message: str) -> None:
+        """Writes a message and rotates the file first if it's due.
+
+        Args:
+            message (str): The formatted message.
+        """
+        if self._size and self._due():
+            self.rotate()
+        data = message.encode("utf-8")
+        self._file.write(data)
+        self._size += len(data)
+
+    def writelines(self, messages: Iterable[str]) -> None:
+        """Writes messages, rotating the file between them when it's due.
+
+        Args:
+            messages (Iterable[str]): The formatted messages.
+        """
+        for message in messages:
+            self.write(message)
+
+    def flush(self) -> None:
+        """Flushes the active file."""
+        self._file.flush()
+
+    def rotate(self) -> None:
+        """Rotates the file now: renames it to a segment, reopens it and hands the segment to the background thread."""
+        self._file.close()
+        stamp = dt.datetime.now(tz=dt.timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+        segment = self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}")
+        self.path.rename(segment)
+        self._open()
+        self._executor.submit(self._archive, segment)
+
+    def segments(self) -> list[Path]:
+        """Returns the rotated segments, compressed or not, oldest first.
+
+        Returns:
+            list[Path]: The paths of the segments.
+        """
+        segments = [path for path in self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}*") if path != self.path]
+        return sorted(segments, key=lambda path: path.name)
+
+    def _archive(self, segment: Path) -> None:
+        """Compresses a rotated segment and deletes the segments beyond the retention, on the background thread.
+
+        Args:
+            segment (Path): The rotated segment.
+        """
+        if self.rotation.compression is not Compression.NONE and segment.exists():
+            _compress(segment, self.rotation.compression)
+        segments = self.segments()
+        expired = segments[: max(0, len(segments) - self.rotation.keep)] if self.rotation.keep is not None else []
+        if self.rotation.max_age is not None:
+            oldest = time.time() - self.rotation.max_age.total_seconds()
+            expired += [path for path in segments if path.stat().st_mtime < oldest]
+        for path in expired:
+            path.unlink(missing_ok=True)
+
+    def stop(self) -> None:
+        """Closes the file and waits until the rotated segments are compressed, called by loguru when the handler is removed."""
+        self._file.close()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,306 @@
+"""Queued and buffered sinks of the Logger class, which write the log messages in batches."""
+from __future__ import annotations
+
+import atexit
+import dataclasses
+import enum
+import queue
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from loguru._logger import Core as _Core
+
+if TYPE_CHECKING:
+    from loguru import Message
+
+    from e_lims_utils.logger.rotation import RotatingFile
+
+_LEVEL_NUMBERS = {name: level.no for name, level in _Core().levels.items()}
+_STOP = object()
+_BLOCK_TIMEOUT = 0.1  # The number of seconds between two checks of a stopped sink by a caller waiting for a slot.
+
+
+class OverflowPolicy(enum.StrEnum):
+    """Enum class representing what a queued sink does with a message when its queue is full.
+
+    Attributes:
+        BLOCK (str): The caller waits until the writer thread frees a slot, no message is lost.
+        DROP_OLDEST (str): The oldest queued message is dropped to make room, the caller never waits.
+        DROP_BELOW_LEVEL (str): Messages below the drop level are dropped, the other ones wait for a slot.
+    """
+
+    BLOCK = "BLOCK"
+    DROP_OLDEST = "DROP_OLDEST"
+    DROP_BELOW_LEVEL = "DROP_BELOW_LEVEL"
+
+
+@dataclasses.dataclass(frozen=True)
+class QueueOptions:
+    """A class used to represent the options of the queued sinks of a Logger.
+
+    Attributes:
+        * maxsize (int): The maximum number of messages waiting to be written.
+        * overflow (OverflowPolicy): What to do with a message when the queue is full.
+        * drop_level (str): The name of the level below which messages are dropped with the DROP_BELOW_LEVEL policy, such as LoggerLevel.WARNING.
+    """
+
+    maxsize: int = 10000
+    overflow: OverflowPolicy = OverflowPolicy.BLOCK
+    drop_level: str = "WARNING"
+
+
+@dataclasses.dataclass(frozen=True)
+class BufferOptions:
+    """A class used to represent the options of the buffered file sink of a Logger.
+
+    Attributes:
+        * size (int): The number of buffered characters which triggers a write.
+        * interval (float): The maximum number of seconds a message stays in the buffer.
+        * flush_level (str): The name of the level from which a message is written at once with the buffer, such as LoggerLevel.ERROR.
+    """
+
+    size: int = 65536
+    interval: float = 1.0
+    flush_level: str = "ERROR"
+
+
+class QueuedSink:
+    """A class to write the formatted log messages of a loguru handler on a background thread.
+
+    The handler hands each message to the bounded queue of the sink and returns, the writer thread writes the queued messages
+    in batches to a file or a stream and flushes after each batch. When the queue is full, the overflow policy applies.
+    The sink is stopped, after all the queued messages are written, when its handler is removed or the interpreter exits.
+
+    Attributes:
+        * target (Path | IO[str] | RotatingFile): The file, opened in append mode by the writer thread, or the stream to write to.
+        * options (QueueOptions): The size of the queue and the overflow policy.
+        * dropped (int): The number of messages dropped by the overflow policy, or because the sink was stopped.
+
+    Methods:
+        * write(message: Message): Queues a formatted message, called by the loguru handler.
+        * drain(): Waits until all the queued messages are written.
+        * stop(): Writes the queued messages, stops the writer thread and closes the file, or stops the target if it can be stopped.
+    """
+
+    def __init__(self, target: Path | IO[str] | RotatingFile, options: QueueOptions | None = None) -> None:
+        """Initializes the QueuedSink object and starts its writer thread.
+
+        Args:
+            target (Path | IO[str] | RotatingFile): The path of the file to append to, or the stream or rotating file to write to.
+            options (QueueOptions | None): The size of the queue and the overflow policy, default options if None.
+        """
+        self.target = target
+        self.options = options or QueueOptions()
+        self.dropped = 0
+        self._drop_below = _LEVEL_NUMBERS[str(self.options.drop_level)]
+        self._queue: queue.Queue[object] = queue.Queue(self.options.maxsize)
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=f"QueuedSink({target})", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def write(self, message: Message) -> None:
+        """Queues a formatted message, applying the overflow policy when the queue is full.
+
+        A message written to a stopped sink is dropped, as no writer thread would write it.
+
+        Args:
+            message (Message): The formatted message, with its record.
+        """
+        if self._stopped:
+            self._drop()
+            return
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self._overflow(message)
+
+    def _overflow(self, message: Message) -> None:
+        """Applies the overflow policy to a message which doesn't fit in the queue.
+
+        A caller waiting for a slot gives up and drops its message if the sink is stopped meanwhile.
+
+        Args:
+            message (Message): The formatted message, with its record.
+        """
+        policy = self.options.overflow
+        if policy is OverflowPolicy.DROP_BELOW_LEVEL and message.record["level"].no < self._drop_below:
+            self._drop()
+            return
+        if policy is OverflowPolicy.DROP_OLDEST:
+            while True:
+                try:
+                    self._queue.put_nowait(message)
+                except queue.Full:  # noqa: PERF203
+                    try:
+                        self._queue.get_nowait()
+                        self._queue.task_done()
+                    except queue.Empty:
+                        continue
+                    self._drop()
+                else:
+                    return
+        while not self._stopped:
+            try:
+                self._queue.put(message, timeout=_BLOCK_TIMEOUT)
+            except queue.Full:
+                continue
+            return
+        self._drop()
+
+    def _drop(self) -> None:
+        """Counts a dropped message."""
+        with self._lock:
+            self.dropped += 1
+
+    def drain(self) -> None:
+        """Waits until all the queued messages are written."""
+        if not self._stopped:
+            self._queue.join()
+
+    def stop(self) -> None:
+        """Writes the queued messages, stops the writer thread and closes the file, or stops the target if it has a stop method.
+
+        Stopping a stopped sink has no effect.
+        """
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+        while self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=_BLOCK_TIMEOUT)
+            except queue.Full:
+                continue
+            break
+        self._thread.join()
+        atexit.unregister(self.stop)
+        if hasattr(self.target, "stop"):
+            self.target.stop()
+
+    def _run(self) -> None:
+        """Writes the queued messages in batches until the sink is stopped, the loop of the writer thread.
+
+        A batch which fails to be written is reported on stderr, like loguru reports the errors of its handlers, and the loop goes on.
+        """
+        stream = self.target.open("a", encoding="utf-8") if isinstance(self.target, Path) else self.target
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.options.maxsize:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:  # noqa: PERF203
+                        break
+                stop = _STOP in batch
+                try:
+                    stream.writelines(message for message in batch if message is not _STOP)
+                    stream.flush()
+                except Exception:  # noqa: BLE001
+                    sys.stderr.write(f"--- Logging error in {self._thread.name} ---\n")
+                    traceback.print_exc(file=sys.stderr)
+                    sys.stderr.write(f"--- {len(batch) - stop} queued messages lost ---\n")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            if stream is not self.target:
+                stream.close()
+
+
+class BufferedSink:
+    """A class to write the formatted log messages of a loguru handler to a file in large writes.
+
+    The messages are buffered and written together, then flushed, when the buffer reaches its size, when the oldest
+    buffered message is 'interval' seconds old, or with a message from the flush level, so that an error is on disk
+    before the program goes on. A background thread writes the buffer when no message comes to trigger the interval.
+    The buffer is written when the handler is removed and when the interpreter exits.
+
+    Attributes:
+        * target (Path | RotatingFile): The file, opened in append mode, or the rotating file to write to.
+        * options (BufferOptions): The size and interval of the buffer, and the flush level.
+
+    Methods:
+        * write(message: Message): Buffers a formatted message, called by the loguru handler.
+        * drain(): Writes and flushes the buffered messages.
+        * stop(): Writes the buffered messages, stops the background thread and closes the file.
+    """
+
+    def __init__(self, target: Path | RotatingFile, options: BufferOptions | None = None) -> None:
+        """Initializes the BufferedSink object, opens the file and starts its background thread.
+
+        Args:
+            target (Path | RotatingFile): The path of the file to append to, or the rotating file to write to.
+            options (BufferOptions | None): The size and interval of the buffer and the flush level, default options if None.
+        """
+        self.target = target
+        self.options = options or BufferOptions()
+        self._flush_from = _LEVEL_NUMBERS[str(self.options.flush_level)]
+        self._stream = target.open("a", encoding="utf-8") if isinstance(target, Path) else target
+        self._buffer: list[str] = []
+        self._size = 0
+        self._deadline = float("inf")
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"BufferedSink({target})", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def write(self, message: Message) -> None:
+        """Buffers a formatted message, and writes the buffer if it's full, due or if the message is from the flush level.
+
+        Args:
+            message (Message): The formatted message, with its record.
+        """
+        with self._lock:
+            if not self._buffer:
+                self._deadline = time.monotonic() + self.options.interval
+            self._buffer.append(message)
+            self._size += len(message)
+            if self._size >= self.options.size or message.record["level"].no >= self._flush_from or time.monotonic() >= self._deadline:
+                self._write()
+
+    def _write(self) -> None:
+        """Writes and flushes the buffered messages, the lock being held."""
+        if self._buffer:
+            self._stream.writelines(self._buffer)
+            self._stream.flush()
+            self._buffer.clear()
+            self._size = 0
+            self._deadline = float("inf")
+
+    def drain(self) -> None:
+        """Writes and flushes the buffered messages."""
+        with self._lock:
+            self._write()
+
+    def stop(self) -> None:
+        """Writes the buffered messages, stops the background thread and closes the file, or stops the target if it has a stop method.
+
+        Stopping a stopped sink has no effect.
+        """
+        with self._lock:
+            if self._stopped.is_set():
+                return
+            self._stopped.set()
+            self._write()
+        self._thread.join()
+        atexit.unregister(self.stop)
+        if self._stream is not self.target:
+            self._stream.close()
+        elif hasattr(self.target, "stop"):
+            self.target.stop()
+
+    def _run(self) -> None:
+        """Writes the buffer when its oldest message is due, the loop of the background thread."""
+        while not self._stopped.wait(self.options.interval / 2):
+            with self._lock:
+                if time.monotonic() >= self._deadline:
+                    self._write()
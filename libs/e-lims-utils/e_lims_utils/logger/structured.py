@@ -0,0 +1,315 @@
+"""Structured JSON-lines log files with a sparse index of their blocks, and their reader.
+
+The log file holds one JSON object per record. The records are grouped in blocks of consecutive lines, and each block
+is described by a line of the sidecar index file: its byte range, its time range and the mask of its levels.
+A query reads the index, then seeks to the blocks which may hold matching records instead of scanning the whole file.
+"""
+from __future__ import annotations
+
+import dataclasses
+import json
+from typing import IO, TYPE_CHECKING, Any
+
+from loguru._logger import Core as _Core
+
+if TYPE_CHECKING:
+    import datetime as dt
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+    from loguru import Message
+
+_LEVEL_NUMBERS = {name: level.no for name, level in _Core().levels.items()}
+_INDEX_SUFFIX = ".idx"
+
+
+def index_path(path: Path) -> Path:
+    """Returns the path of the sidecar index of a structured log file.
+
+    Args:
+        path (Path): The path of the structured log file.
+
+    Returns:
+        Path: The path of the index, the path of the file with an '.idx' extension added.
+    """
+    return path.with_name(path.name + _INDEX_SUFFIX)
+
+
+def _level_bit(level_no: int) -> int:
+    """Returns the bit of a level number in the level masks, one bit per 5 level numbers up to 315.
+
+    Args:
+        level_no (int): The level number.
+
+    Returns:
+        int: The bit, as an integer with one bit set.
+    """
+    return 1 << min(level_no // 5, 63)
+
+
+def _records(lines: Iterable[bytes]) -> Iterator[dict[str, Any]]:
+    """Returns the records of JSON lines, skipping the lines torn by an interrupted write.
+
+    Args:
+        lines (Iterable[bytes]): The JSON lines.
+
+    Yields:
+        dict[str, Any]: The records.
+    """
+    for line in lines:
+        try:
+            yield json.loads(line)
+        except ValueError:  # noqa: PERF203
+            continue
+
+
+@dataclasses.dataclass(frozen=True)
+class BlockIndex:
+    """A class used to represent a block of records of a structured log file, as described by a line of its index.
+
+    Attributes:
+        * offset (int): The position of the first byte of the block in the file.
+        * length (int): The number of bytes of the block.
+        * first (float): The POSIX timestamp of the earliest record of the block.
+        * last (float): The POSIX timestamp of the latest record of the block.
+        * levels (int): The mask of the levels of the records of the block.
+        * count (int): The number of records of the block.
+
+    Methods:
+        * matches(start: float, end: float, minimum: int): Returns whether the block may hold records in a time range from a level.
+    """
+
+    offset: int
+    length: int
+    first: float
+    last: float
+    levels: int
+    count: int
+
+    def matches(self, start: float, end: float, minimum: int) -> bool:
+        """Returns whether the block may hold records in a time range from a level.
+
+        Args:
+            start (float): The POSIX timestamp of the start of the range.
+            end (float): The POSIX timestamp of the end of the range.
+            minimum (int): The minimum level number.
+
+        Returns:
+            bool: True if the time ranges overlap and the block holds a level not lower than the minimum.
+        """
+        return self.first <= end and self.last >= start and self.levels >= _level_bit(minimum)
+
+
+class JsonLinesSink:
+    """A class to write log records as JSON lines, with a sparse index of their blocks.
+
+    Each line holds the time, the level, the message, the location and the bound context ('extra') of a record.
+    A block is indexed when it reaches 'block_records' records and when the sink is stopped, so that the last block
+    of a running program is not indexed yet; the reader scans it. The JsonLinesSink object is a loguru sink, and a target of QueuedSink.
+
+    Attributes:
+        * path (Path): The path of the structured log file, opened in append mode.
+        * block_records (int): The number of records per indexed block.
+
+    Methods:
+        * write(message: Message): Writes a record.
+        * writelines(messages: Iterable[Message]): Writes records.
+        * flush(): Flushes the file.
+        * stop(): Indexes the last block and closes the files.
+    """
+
+    def __init__(self, path: Path, block_records: int = 1000) -> None:
+        """Initializes the JsonLinesSink object and opens the file and its index in append mode.
+
+        Args:
+            path (Path): The path of the structured log file.
+            block_records (int): The number of records per indexed block.
+        """
+        self.path = path
+        self.block_records = block_records
+        self._file = path.open("ab")
+        self._index: IO[str] = index_path(path).open("a", encoding="utf-8")
+        self._offset = self._file.tell()
+        self._recover()
+
+    def _recover(self) -> None:
+        """Starts the first block at the end of the indexed blocks, with the records written after them by a previous sink."""
+        blocks = StructuredLogReader(self.path).blocks()
+        self._start_block(blocks[-1].offset + blocks[-1].length if blocks else 0)
+        with self.path.open("rb") as file:
+            file.seek(self._block_offset)
+            for record in _records(file):
+                self._add(record["timestamp"], record["level_no"])
+
+    def _start_block(self, offset: int) -> None:
+        """Starts a new block at an offset of the file.
+
+        Args:
+            offset (int): The position of the first byte of the block.
+        """
+        self._block_offset = offset
+        self._first = float("inf")
+        self._last = float("-inf")
+        self._levels = 0
+        self._count = 0
+
+    def _end_block(self) -> None:
+        """Writes the index line of the current block, if it has records, and starts a new one."""
+        if self._count:
+            block = BlockIndex(self._block_offset, self._offset - self._block_offset, self._first, self._last, self._levels, self._count)
+            self._index.write(json.dumps(dataclasses.asdict(block)) + "\n")
+            self._index.flush()
+        self._start_block(self._offset)
+
+    def write(self, message: Message) -> None:
+        """Writes a record as a JSON line.
+
+        Args:
+            message (Message): The formatted message, with its record.
+        """
+        record = message.record
+        timestamp = record["time"].timestamp()
+        level = record["level"]
+        exception = record["exception"]
+        line = {
+            "time": record["time"].isoformat(),
+            "timestamp": timestamp,
+            "level": level.name,
+            "level_no": level.no,
+            "message": record["message"],
+            "name": record["name"],
+            "function": record["function"],
+            "line": record["line"],
+            "extra": record["extra"],
+            "exception": None if exception is None else f"{exception.type.__name__ if exception.type else None}: {exception.value}",
+        }
+        data = (json.dumps(line, default=str) + "\n").encode("utf-8")
+        self._file.write(data)
+        self._offset += len(data)
+        self._add(timestamp, level.no)
+        if self._count >= self.block_records:
+            self._file.flush()
+            self._end_block()
+
+    def _add(self, timestamp: float, level_no: int) -> None:
+        """Adds a record to the time range, the level mask and the count of the current block.
+
+        Args:
+            timestamp (float): The POSIX timestamp of the record.
+            level_no (int): The level number of the record.
+        """
+        self._first = min(self._first, timestamp)
+        self._last = max(self._last, timestamp)
+        self._levels |= _level_bit(level_no)
+        self._count += 1
+
+    def writelines(self, messages: Iterable[Message]) -> None:
+        """Writes records as JSON lines.
+
+        Args:
+            messages (Iterable[Message]): The formatted messages, with their records.
+        """
+        for message in messages:
+            self.write(message)
+
+    def flush(self) -> None:
+        """Flushes the file."""
+        self._file.flush()
+
+    def stop(self) -> None:
+        """Indexes the last block and closes the files, called by loguru when the handler is removed."""
+        self._file.flush()
+        self._end_block()
+        self._file.close()
+        self._index.close()
+
+
+class StructuredLogReader:
+    """A class to query a structured log file through its sparse index.
+
+    Examples:
+        >>> reader = StructuredLogReader(
+        ...     path
+        ... )  # doctest: +SKIP
+        >>> errors = list(
+        ...     reader.query(
+        ...         start=t1,
+        ...         end=t2,
+        ...         level=LoggerLevel.ERROR,
+        ...         instrument="X",
+        ...     )
+        ... )  # doctest: +SKIP
+
+    Attributes:
+        * path (Path): The path of the structured log file.
+
+    Methods:
+        * blocks(): Returns the indexed blocks of the file.
+        * query(start, end, level, **context): Returns the records in a time range, from a level, with context values.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initializes the StructuredLogReader object.
+
+        Args:
+            path (Path): The path of the structured log file.
+        """
+        self.path = path
+
+    def blocks(self) -> list[BlockIndex]:
+        """Returns the indexed blocks of the file, in the order of the file.
+
+        Returns:
+            list[BlockIndex]: The blocks, empty without index.
+        """
+        path = index_path(self.path)
+        if not path.exists():
+            return []
+        with path.open(encoding="utf-8") as file:
+            return [BlockIndex(**json.loads(line)) for line in file if line.strip()]
+
+    def query(self, *, start: dt.datetime | None = None, end: dt.datetime | None = None, level: str | None = None, **context: Any) -> Iterator[dict[str, Any]]:  # noqa: ANN401
+        """Returns the records in a time range, from a level, with context values, reading the matching blocks only.
+
+        The records written after the last indexed block are scanned.
+
+        Args:
+            start (dt.datetime | None): The earliest time of the records, None for no lower bound.
+            end (dt.datetime | None): The latest time of the records, None for no upper bound.
+            level (str | None): The name of the minimum level of the records, such as LoggerLevel.ERROR, None for all the levels.
+            **context (Any): The values of the bound context of the records.
+
+        Yields:
+            dict[str, Any]: The matching records, in the order of the file.
+        """
+        first = start.timestamp() if start is not None else float("-inf")
+        last = end.timestamp() if end is not None else float("inf")
+        minimum = _LEVEL_NUMBERS[str(level)] if level is not None else 0
+        blocks = self.blocks()
+        indexed_end = blocks[-1].offset + blocks[-1].length if blocks else 0
+        with self.path.open("rb") as file:
+            for block in blocks:
+                if block.matches(first, last, minimum):
+                    file.seek(block.offset)
+                    yield from self._filter(file.read(block.length).splitlines(), first, last, minimum, context)
+            file.seek(indexed_end)
+            yield from self._filter(file, first, last, minimum, context)
+
+    @staticmethod
+    def _filter(lines: Iterable[bytes], first: float, last: float, minimum: int, context: dict[str, Any]) -> Iterator[dict[str, Any]]:
+        """Returns the records of JSON lines in a time range, from a level, with context values.
+
+        Args:
+            lines (Iterable[bytes]): The JSON lines.
+            first (float): The earliest POSIX timestamp.
+            last (float): The latest POSIX timestamp.
+            minimum (int): The minimum level number.
+            context (dict[str, Any]): The values of the bound context.
+
+        Yields:
+            dict[str, Any]: The matching records.
+        """
+        for record in _records(lines):
+            extra = record["extra"]
+            if first <= record["timestamp"] <= last and record["level_no"] >= minimum and all(extra.get(key) == value for key, value in context.items()):
+                yield record
@@ -0,0 +1,78 @@
+"""e-lims-utils tests crud fixtures."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Generator
+
+import pytest
+from sqlmodel import Field
+
+from e_lims_utils.crud.crud import BaseSqlModel, Crud
+from e_lims_utils.files.files import FileProperties, FileSuffix
+from e_lims_utils.files.timestamp import Timestamp
+from e_lims_utils.logger.logger import Logger, LoggerLevel
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture()
+def fx_logger(tmp_path: Path) -> Generator[Logger, None, None]:
+    """Pytest fixture for the Logger class, writing its file in a temporary directory.
+
+    Args:
+        tmp_path (Path): A temporary directory.
+
+    Returns:
+        Logger: A Logger object.
+    """
+    file = FileProperties(
+        name="test_crud",
+        suffix=FileSuffix.LOG,
+        path=tmp_path,
+        timestamp=Timestamp(datetime.now(tz=timezone.utc)),
+    )
+    logger = Logger(file=file, level=LoggerLevel.TRACE, backtrace=True, diagnose=True)
+    yield logger
+    logger._logger.remove()  # noqa: SLF001
+
+
+@pytest.fixture()
+def fx_model() -> BaseSqlModel:
+    """Return the SQLModel on which to perform CRUD operations.
+
+    Returns:
+        Model: The SQLModel on which to perform CRUD operations.
+    """
+
+    class Model(BaseSqlModel, table=True):
+        """The SQLModel representing a model.
+
+        Attributes:
+            uid (int): The unique identifier.
+            name (str): The name of the model.
+            age (int): The age of the model.
+        """
+
+        uid: int = Field(default=None, primary_key=True)
+        name: str
+        age: int
+
+    return Model
+
+
+@pytest.fixture()
+def fx_crud_instance(fx_logger: Logger, fx_model: BaseSqlModel) -> Generator[Crud, None, None]:
+    """Return the Crud object of an empty table in an in-memory SQLite database.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+
+    Returns:
+        Crud: The Crud object.
+    """
+    crud = Crud(fx_logger, fx_model, "sqlite:///:memory:")
+    crud.create_table()
+    yield crud
+    crud.drop_table()
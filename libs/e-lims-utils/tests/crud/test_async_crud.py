@@ -0,0 +1,170 @@
+"""e-lims-utils tests crud async_crud."""
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlmodel import Field
+
+from e_lims_utils.crud.async_crud import AsyncCrud
+from e_lims_utils.crud.crud import IDS_CHUNK_SIZE, BaseSqlModel
+
+if TYPE_CHECKING:
+    from e_lims_utils.logger.logger import Logger
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture()
+def fx_crud_instance(fx_logger: Logger, fx_model: BaseSqlModel) -> AsyncCrud:
+    """Return the AsyncCrud object.
+
+    The table is created and dropped by the tests, inside their event loop.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+
+    Returns:
+        AsyncCrud: The AsyncCrud object.
+    """
+    return AsyncCrud(fx_logger, fx_model, "sqlite+aiosqlite:///:memory:")
+
+
+def test_create_and_read(fx_crud_instance: AsyncCrud, fx_model: BaseSqlModel) -> None:
+    """Test the create(), creates(), bulk_creates() and read methods.
+
+    Args:
+        fx_crud_instance (AsyncCrud): The AsyncCrud object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+    """
+
+    async def scenario() -> None:
+        await fx_crud_instance.create_table()
+        data = fx_model(name="John", age=25)
+        await fx_crud_instance.create(data)
+        assert data.uid == 1  # nosec B101
+        await fx_crud_instance.creates([fx_model(name="Jane", age=22)])
+        assert await fx_crud_instance.bulk_creates([{"name": "Jack", "age": 40}], returning=True) == [3]  # nosec B101
+        assert (await fx_crud_instance.read(1)).name == "John"  # nosec B101
+        assert [record.name for record in await fx_crud_instance.reads()] == ["John", "Jane", "Jack"]  # nosec B101
+        assert [record.uid for record in await fx_crud_instance.read_by_ids([1, 3])] == [1, 3]  # nosec B101
+        assert [record.uid for record in await fx_crud_instance.read_by_field("name", "Jane")] == [2]  # nosec B101
+        assert [record.uid async for record in fx_crud_instance.iter_reads(batch_size=1)] == [1, 2, 3]  # nosec B101
+        assert [record.uid for record in await fx_crud_instance.read_page(after_uid=1, limit=1)] == [2]  # nosec B101
+        await fx_crud_instance.drop_table()
+        await fx_crud_instance.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_update_and_delete(fx_crud_instance: AsyncCrud, fx_model: BaseSqlModel) -> None:
+    """Test the update and delete methods.
+
+    Args:
+        fx_crud_instance (AsyncCrud): The AsyncCrud object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+    """
+    updated_age = 26
+
+    async def scenario() -> None:
+        await fx_crud_instance.create_table()
+        await fx_crud_instance.bulk_creates([fx_model(name=name, age=age) for name, age in (("John", 25), ("Jane", 22), ("Jack", 40), ("Jill", 31))])
+        await fx_crud_instance.update(fx_model(uid=1, name="John", age=updated_age))
+        assert (await fx_crud_instance.read(1)).age == updated_age  # nosec B101
+        assert await fx_crud_instance.update_where({"name": "Jane"}, {"age": updated_age}) == 1  # nosec B101
+        await fx_crud_instance.delete(1)
+        assert await fx_crud_instance.delete_where({"age": updated_age}) == 1  # nosec B101
+        assert await fx_crud_instance.delete_by_ids([3]) == 1  # nosec B101
+        assert await fx_crud_instance.delete_by_field("name", "Jill") == 1  # nosec B101
+        assert not await fx_crud_instance.reads()  # nosec B101
+        await fx_crud_instance.drop_table()
+        await fx_crud_instance.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_ids_chunks(fx_crud_instance: AsyncCrud) -> None:
+    """Test that read_by_ids() and delete_by_ids() handle more primary keys than a chunk holds, in the order of the primary keys, and reject a non positive chunk size.
+
+    Args:
+        fx_crud_instance (AsyncCrud): The AsyncCrud object.
+    """
+    records = 2 * IDS_CHUNK_SIZE + 10
+    primary_keys = [*range(records, 0, -1), records + 1, 1]
+
+    async def scenario() -> None:
+        await fx_crud_instance.create_table()
+        await fx_crud_instance.bulk_creates([{"name": f"name_{index}", "age": index} for index in range(records)])
+        read_data = await fx_crud_instance.read_by_ids(primary_keys)
+        assert [record.uid for record in read_data] == [*range(records, 0, -1), 1]  # nosec B101
+        mapping = await fx_crud_instance.read_by_ids(primary_keys, chunk_size=2, as_mapping=True)
+        assert list(mapping) == list(range(records, 0, -1))  # nosec B101
+        assert mapping[10].name == "name_9"  # nosec B101
+        assert await fx_crud_instance.delete_by_ids([*range(2, records + 2), 2]) == records - 1  # nosec B101
+        assert [record.uid for record in await fx_crud_instance.reads()] == [1]  # nosec B101
+        with pytest.raises(ValueError, match="chunk_size"):
+            await fx_crud_instance.read_by_ids([1], chunk_size=0)
+        with pytest.raises(ValueError, match="chunk_size"):
+            await fx_crud_instance.delete_by_ids([1], chunk_size=0)
+        await fx_crud_instance.drop_table()
+        await fx_crud_instance.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_transaction_rollback(fx_crud_instance: AsyncCrud, fx_model: BaseSqlModel) -> None:
+    """Test that a transaction is rolled back when an exception is raised.
+
+    Args:
+        fx_crud_instance (AsyncCrud): The AsyncCrud object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+    """
+
+    async def creates_and_fail() -> None:
+        async with fx_crud_instance.transaction():
+            await fx_crud_instance.creates([fx_model(name="John", age=25)])
+            msg = "rollback"
+            raise RuntimeError(msg)
+
+    async def scenario() -> None:
+        await fx_crud_instance.create_table()
+        with pytest.raises(RuntimeError, match="rollback"):
+            await creates_and_fail()
+        assert not await fx_crud_instance.reads()  # nosec B101
+        await fx_crud_instance.drop_table()
+        await fx_crud_instance.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_read_by_field_null(fx_logger: Logger) -> None:
+    """Test that read_by_field() reads the records whose field is NULL.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+    """
+
+    class NullableModel(BaseSqlModel, table=True):
+        """The SQLModel representing a model with a nullable field.
+
+        Attributes:
+            uid (int): The unique identifier.
+            name (str | None): The name of the model.
+        """
+
+        uid: int = Field(default=None, primary_key=True)
+        name: str | None = None
+
+    crud = AsyncCrud(fx_logger, NullableModel, "sqlite+aiosqlite:///:memory:")
+
+    async def scenario() -> None:
+        await crud.create_table()
+        await crud.bulk_creates([{"name": "John"}, {"name": None}, {"name": None}])
+        assert [record.uid for record in await crud.read_by_field("name", None)] == [2, 3]  # nosec B101
+        assert [record.uid for record in await crud.read_by_field("name", "John")] == [1]  # nosec B101
+        await crud.drop_table()
+        await crud.dispose()
+
+    asyncio.run(scenario())
@@ -0,0 +1,77 @@
+"""e-lims-utils tests crud cache."""
+from __future__ import annotations
+
+import pytest
+
+from e_lims_utils.crud.cache import RecordCache
+
+
+class FakeClock:
+    """A clock which only moves when told to.
+
+    Attributes:
+        now (float): The current time in seconds.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the FakeClock object at time 0."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Returns the current time.
+
+        Returns:
+            float: The current time in seconds.
+        """
+        return self.now
+
+
+def test_get_and_put() -> None:
+    """Test that a cached record is returned and counted as a hit."""
+    cache = RecordCache(maxsize=2)
+    assert cache.get(1) is None  # nosec B101
+    cache.put(1, "record")
+    assert cache.get(1) == "record"  # nosec B101
+    assert (cache.hits, cache.misses, cache.hit_ratio) == (1, 1, 0.5)  # nosec B101
+
+
+def test_lru_eviction() -> None:
+    """Test that the least recently used record is evicted when the cache is full."""
+    cache = RecordCache(maxsize=2)
+    cache.put(1, "first")
+    cache.put(2, "second")
+    cache.get(1)
+    cache.put(3, "third")
+    assert cache.get(2) is None  # nosec B101
+    assert cache.get(1) == "first"  # nosec B101
+    assert cache.get(3) == "third"  # nosec B101
+    assert cache.evictions == 1  # nosec B101
+
+
+def test_ttl_eviction() -> None:
+    """Test that an expired record is evicted when it's read."""
+    clock = FakeClock()
+    cache = RecordCache(maxsize=2, ttl=10, clock=clock)
+    cache.put(1, "record")
+    clock.now = 10
+    assert cache.get(1) == "record"  # nosec B101
+    clock.now = 10.5
+    assert cache.get(1) is None  # nosec B101
+    assert len(cache) == 0  # nosec B101
+
+
+def test_invalidate_and_clear() -> None:
+    """Test that invalidated records are removed."""
+    cache = RecordCache()
+    cache.put(1, "first")
+    cache.put(2, "second")
+    cache.invalidate(1)
+    assert cache.get(1) is None  # nosec B101
+    cache.clear()
+    assert len(cache) == 0  # nosec B101
+
+
+def test_invalid_maxsize() -> None:
+    """Test that a non positive maxsize is rejected."""
+    with pytest.raises(ValueError, match="maxsize"):
+        RecordCache(maxsize=0)
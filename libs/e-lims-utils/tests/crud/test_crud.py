@@ -9,7 +9,10 @@ import pytest
 from sqlalchemy import inspect
 from sqlmodel import Field
 
+from e_lims_utils.crud.cache import RecordCache
 from e_lims_utils.crud.crud import BaseSqlModel, Crud
+from e_lims_utils.crud.engine import engine_registry
+from e_lims_utils.crud.rows import RowFactory
 from e_lims_utils.files.files import FileProperties, FileSuffix
 from e_lims_utils.files.timestamp import Timestamp
 from e_lims_utils.logger.logger import Logger, LoggerLevel
@@ -247,7 +250,7 @@ def test_delete_by_ids(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple
     """
     data_to_write, _ = fx_data_to_write_and_check
     fx_crud_instance.creates(data_to_write)
-    fx_crud_instance.delete_by_ids([1])
+    assert fx_crud_instance.delete_by_ids([1]) == 1  # nosec B101
     assert not fx_crud_instance.read_by_ids([1])  # nosec B101
 
 
@@ -260,5 +263,432 @@ def test_delete_by_field(fx_crud_instance: Crud, fx_data_to_write_and_check: tup
     """
     data_to_write, _ = fx_data_to_write_and_check
     fx_crud_instance.creates(data_to_write)
-    fx_crud_instance.delete_by_field("name", "John")
+    assert fx_crud_instance.delete_by_field("name", "John") == 1  # nosec B101
     assert not fx_crud_instance.read_by_field("name", "John")  # nosec B101
+
+
+def test_bulk_creates(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test the bulk_creates() method with model instances and dictionaries.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, data_to_check = fx_data_to_write_and_check
+    primary_keys = fx_crud_instance.bulk_creates([data_to_write[0], {"name": "Jane", "age": 22}], chunk_size=1, returning=True)
+    assert primary_keys == [data_to_check[0].uid, data_to_check[1].uid]  # nosec B101
+    read_data = fx_crud_instance.reads()
+    assert len(read_data) == len(data_to_check)  # nosec B101
+    for index, data in enumerate(read_data):
+        assert data.uid == data_to_check[index].uid  # nosec B101
+        assert data.name == data_to_check[index].name  # nosec B101
+        assert data.age == data_to_check[index].age  # nosec B101
+
+
+def test_bulk_creates_without_returning(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test the bulk_creates() method without returning the primary keys.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, data_to_check = fx_data_to_write_and_check
+    assert fx_crud_instance.bulk_creates(data_to_write) == []  # nosec B101
+    assert len(fx_crud_instance.reads()) == len(data_to_check)  # nosec B101
+
+
+def test_bulk_creates_invalid_chunk_size(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test that the bulk_creates() method rejects a non positive chunk size.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, _ = fx_data_to_write_and_check
+    with pytest.raises(ValueError, match="chunk_size"):
+        fx_crud_instance.bulk_creates(data_to_write, chunk_size=0)
+
+
+def test_shared_engine(fx_crud_instance: Crud, fx_logger: Logger, fx_model: BaseSqlModel, fx_database_url: str) -> None:
+    """Test that Crud objects for the same database share one engine.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_logger (Logger): A Logger object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+        fx_database_url (str): The database URL.
+    """
+    assert Crud(fx_logger, fx_model, fx_database_url).engine is fx_crud_instance.engine  # nosec B101
+
+
+def test_transaction(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test that the operations of a transaction share one session.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    updated_age = 26
+    data_to_write, data_to_check = fx_data_to_write_and_check
+    with fx_crud_instance.transaction() as session:
+        fx_crud_instance.creates(data_to_write)
+        with fx_crud_instance.transaction() as nested_session:
+            assert nested_session is session  # nosec B101
+            fx_crud_instance.update(data_to_write[0].model_copy(update={"age": updated_age}))
+        fx_crud_instance.delete(data_to_check[1].uid)
+        assert fx_crud_instance.read(data_to_check[0].uid).age == updated_age  # nosec B101
+    read_data = fx_crud_instance.reads()
+    assert len(read_data) == 1  # nosec B101
+    assert read_data[0].age == updated_age  # nosec B101
+
+
+def test_transaction_rollback(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test that a transaction is rolled back when an exception is raised.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, _ = fx_data_to_write_and_check
+
+    def creates_and_fail() -> None:
+        with fx_crud_instance.transaction():
+            fx_crud_instance.creates(data_to_write)
+            msg = "rollback"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="rollback"):
+        creates_and_fail()
+    assert not fx_crud_instance.reads()  # nosec B101
+
+
+def test_update_where(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test the update_where() method.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    updated_age = 30
+    data_to_write, data_to_check = fx_data_to_write_and_check
+    fx_crud_instance.creates(data_to_write)
+    assert fx_crud_instance.update_where({"name": "Jane"}, {"age": updated_age}) == 1  # nosec B101
+    assert fx_crud_instance.read(data_to_check[1].uid).age == updated_age  # nosec B101
+    assert fx_crud_instance.read(data_to_check[0].uid).age == data_to_check[0].age  # nosec B101
+
+
+def test_delete_where(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test the delete_where() method.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, data_to_check = fx_data_to_write_and_check
+    fx_crud_instance.creates(data_to_write)
+    assert fx_crud_instance.delete_where({"name": "John", "age": 99}) == 0  # nosec B101
+    assert fx_crud_instance.delete_where({"name": "John", "age": 25}) == 1  # nosec B101
+    assert [data.uid for data in fx_crud_instance.reads()] == [data_to_check[1].uid]  # nosec B101
+
+
+def test_iter_reads(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test the iter_reads() method.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, data_to_check = fx_data_to_write_and_check
+    fx_crud_instance.creates(data_to_write)
+    read_data = list(fx_crud_instance.iter_reads(batch_size=1))
+    assert [data.uid for data in read_data] == [data.uid for data in data_to_check]  # nosec B101
+    assert [data.name for data in fx_crud_instance.iter_reads(filters={"age": 22})] == ["Jane"]  # nosec B101
+
+
+def test_read_page(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test the read_page() method.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, data_to_check = fx_data_to_write_and_check
+    fx_crud_instance.creates(data_to_write)
+    first_page = fx_crud_instance.read_page(limit=1)
+    assert [data.uid for data in first_page] == [data_to_check[0].uid]  # nosec B101
+    second_page = fx_crud_instance.read_page(after_uid=first_page[-1].uid, limit=1)
+    assert [data.uid for data in second_page] == [data_to_check[1].uid]  # nosec B101
+    assert not fx_crud_instance.read_page(after_uid=second_page[-1].uid, limit=1)  # nosec B101
+
+
+def test_dispose_keeps_shared_engine(fx_logger: Logger, fx_model: BaseSqlModel, tmp_path: Path) -> None:
+    """Test that dispose() keeps the engine shared with the other Crud objects, and closes the pooled connections once they are disposed too.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+        tmp_path (Path): A temporary directory.
+    """
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    crud = Crud(fx_logger, fx_model, url)
+    other = Crud(fx_logger, fx_model, url)
+    crud.create_table()
+    other.create(fx_model(name="John", age=25))
+    crud.dispose()
+    crud.dispose()
+    assert crud.engine.pool.checkedin() == 1  # nosec B101
+    assert engine_registry.get(url) is other.engine is crud.engine  # nosec B101
+    assert [data.name for data in other.reads()] == ["John"]  # nosec B101
+    other.dispose()
+    assert crud.engine.pool.checkedin() == 0  # nosec B101
+    engine_registry.dispose(url)
+
+
+def test_dispose_keeps_memory_database(fx_crud_instance: Crud, fx_logger: Logger, fx_model: BaseSqlModel, fx_database_url: str) -> None:
+    """Test that dispose() on one of the Crud objects sharing a SQLite in-memory database keeps the database for the others.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_logger (Logger): A Logger object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+        fx_database_url (str): The database URL, of an in-memory database.
+    """
+    fx_crud_instance.create(fx_model(name="John", age=25))
+    Crud(fx_logger, fx_model, fx_database_url).dispose()
+    assert [data.name for data in fx_crud_instance.reads()] == ["John"]  # nosec B101
+
+
+def test_read_cache(fx_logger: Logger, fx_model: BaseSqlModel, fx_database_url: str, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test that read() goes through the cache without sharing its records, and that updates and deletes invalidate it.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+        fx_database_url (str): The database URL.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    updated_age = 26
+    data_to_write, data_to_check = fx_data_to_write_and_check
+    crud = Crud(fx_logger, fx_model, fx_database_url, cache=RecordCache(maxsize=8))
+    crud.create_table()
+    crud.creates(data_to_write)
+    uid = data_to_check[0].uid
+    read_data = crud.read(uid)
+    read_data.age = updated_age
+    assert crud.read(uid) is not read_data  # nosec B101
+    assert crud.read(uid).age == data_to_check[0].age  # nosec B101
+    assert (crud.cache.hits, crud.cache.misses) == (2, 1)  # nosec B101
+    crud.update(data_to_check[0].model_copy(update={"age": updated_age}))
+    assert crud.read(uid).age == updated_age  # nosec B101
+    crud.delete_by_field("name", "John")
+    assert crud.read(uid) is None  # nosec B101
+    with crud.transaction():
+        crud.read(data_to_check[1].uid)
+    assert len(crud.cache) == 0  # nosec B101
+    crud.drop_table()
+
+
+def test_read_by_ids_chunks(fx_crud_instance: Crud, fx_model: BaseSqlModel) -> None:
+    """Test that read_by_ids() keeps the order of the primary keys across chunks.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+    """
+    fx_crud_instance.bulk_creates([fx_model(name=f"name_{index}", age=index) for index in range(10)])
+    primary_keys = [7, 42, 3, 10, 1, 3]
+    read_data = fx_crud_instance.read_by_ids(primary_keys, chunk_size=2)
+    assert [data.uid for data in read_data] == [7, 3, 10, 1, 3]  # nosec B101
+    mapping = fx_crud_instance.read_by_ids(primary_keys, chunk_size=2, as_mapping=True)
+    assert list(mapping) == [7, 3, 10, 1]  # nosec B101
+    assert mapping[10].name == "name_9"  # nosec B101
+
+
+def test_delete_by_ids_chunks(fx_crud_instance: Crud, fx_model: BaseSqlModel) -> None:
+    """Test that delete_by_ids() deletes the records of all the chunks.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+    """
+    deleted_ids = [1, 2, 3, 4, 5]
+    fx_crud_instance.bulk_creates([fx_model(name=f"name_{index}", age=index) for index in range(10)])
+    assert fx_crud_instance.delete_by_ids([*deleted_ids, 42], chunk_size=2) == len(deleted_ids)  # nosec B101
+    assert [data.uid for data in fx_crud_instance.reads()] == [6, 7, 8, 9, 10]  # nosec B101
+
+
+def test_ids_invalid_chunk_size(fx_crud_instance: Crud) -> None:
+    """Test that the read_by_ids() and delete_by_ids() methods reject a non positive chunk size.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    with pytest.raises(ValueError, match="chunk_size"):
+        fx_crud_instance.read_by_ids([1, 2], chunk_size=0)
+    with pytest.raises(ValueError, match="chunk_size"):
+        fx_crud_instance.delete_by_ids([1, 2], chunk_size=-1)
+
+
+def test_index_advisor_counts(fx_crud_instance: Crud) -> None:
+    """Test that read_by_field() and delete_by_field() feed the index advisor.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    fx_crud_instance.read_by_field("name", "John")
+    fx_crud_instance.delete_by_field("name", "John")
+    assert fx_crud_instance.index_advisor.unindexed_columns() == {"name": 2}  # nosec B101
+
+
+class Reading(BaseSqlModel, table=True):
+    """The SQLModel representing a reading identified by a natural key.
+
+    It's defined once for the module, redefining it would attach its unique index to the table twice.
+
+    Attributes:
+        uid (int): The unique identifier.
+        instrument (str): The instrument of the reading, first column of the natural key.
+        channel (int): The channel of the reading, second column of the natural key.
+        value (float): The value of the reading.
+    """
+
+    __natural_key__ = ("instrument", "channel")
+    uid: int = Field(default=None, primary_key=True)
+    instrument: str
+    channel: int
+    value: float
+
+
+def test_upserts(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test the upsert() and upserts() methods keyed on the primary key.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    updated_age = 26
+    data_to_write, data_to_check = fx_data_to_write_and_check
+    fx_crud_instance.upserts(data_to_write)
+    fx_crud_instance.upserts([data_to_check[0].model_copy(update={"age": updated_age}), {"uid": 3, "name": "Jack", "age": 40}])
+    fx_crud_instance.upsert({"uid": 3, "name": "Jack", "age": 41})
+    read_data = fx_crud_instance.reads()
+    assert [(data.uid, data.name, data.age) for data in read_data] == [(1, "John", updated_age), (2, "Jane", 22), (3, "Jack", 41)]  # nosec B101
+
+
+def test_upserts_natural_key(fx_logger: Logger, fx_database_url: str) -> None:
+    """Test that upserts() re-sending a batch updates the records with the same natural key.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+        fx_database_url (str): The database URL.
+    """
+    crud = Crud(fx_logger, Reading, fx_database_url)
+    crud.create_table()
+    crud.upserts([Reading(instrument="DMM", channel=channel, value=0.0) for channel in range(3)], chunk_size=2)
+    crud.upserts([{"instrument": "DMM", "channel": channel, "value": 1.5} for channel in range(1, 4)], chunk_size=2)
+    read_data = crud.reads()
+    assert [(data.uid, data.channel, data.value) for data in read_data] == [(1, 0, 0.0), (2, 1, 1.5), (3, 2, 1.5), (4, 3, 1.5)]  # nosec B101
+    crud.drop_table()
+
+
+def test_updates(fx_crud_instance: Crud, fx_model: BaseSqlModel, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test that updates() only updates the changed columns of the records.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, _ = fx_data_to_write_and_check
+    fx_crud_instance.creates(data_to_write)
+    fx_crud_instance.create(fx_model(name="Jack", age=40))
+    read_data = fx_crud_instance.reads()
+    read_data[0].age = 30
+    records = [read_data[0], read_data[1], fx_model(uid=3, name="Jacky"), {"uid": 42, "age": 1}]
+    assert fx_crud_instance.updates(records, chunk_size=1) == len(records) - 2  # nosec B101
+    read_data = fx_crud_instance.reads()
+    assert [(data.uid, data.name, data.age) for data in read_data] == [(1, "John", 30), (2, "Jane", 22), (3, "Jacky", 40)]  # nosec B101
+
+
+def test_updates_without_uid(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test that updates() raises a ValueError naming the record without 'uid', before updating any record.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, _ = fx_data_to_write_and_check
+    fx_crud_instance.creates(data_to_write)
+    with pytest.raises(ValueError, match=r"Record 1 has no 'uid'.*'Jack'"):
+        fx_crud_instance.updates([{"uid": 1, "age": 30}, {"name": "Jack", "age": 41}], chunk_size=1)
+    assert fx_crud_instance.read(1).age == data_to_write[0].age  # nosec B101
+
+
+def test_cached_statements(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test that read(), read_by_ids() and read_by_field() reuse one compiled statement whatever their parameters.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, _ = fx_data_to_write_and_check
+    fx_crud_instance.creates(data_to_write)
+    fx_crud_instance.read(1)
+    fx_crud_instance.read_by_ids([1])
+    fx_crud_instance.read_by_field("name", "John")
+    compiled = len(fx_crud_instance.engine._compiled_cache)  # noqa: SLF001
+    assert fx_crud_instance.read(2).name == "Jane"  # nosec B101
+    assert [data.uid for data in fx_crud_instance.read_by_ids([2, 1])] == [2, 1]  # nosec B101
+    assert [data.uid for data in fx_crud_instance.read_by_field("name", "Jane")] == [2]  # nosec B101
+    assert len(fx_crud_instance.engine._compiled_cache) == compiled  # noqa: SLF001 # nosec B101
+
+
+def test_row_factory(fx_crud_instance: Crud, fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]) -> None:
+    """Test that the read methods return SQLAlchemy rows or __slots__ records with the fields of the model.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        fx_data_to_write_and_check: tuple[list[BaseSqlModel], list[BaseSqlModel]]: The SQLModel on which to perform CRUD operations.
+    """
+    data_to_write, data_to_check = fx_data_to_write_and_check
+    fx_crud_instance.creates(data_to_write)
+    expected = [(data.uid, data.name, data.age) for data in data_to_check]
+    rows = fx_crud_instance.reads(row_factory=RowFactory.ROW)
+    assert [tuple(row) for row in rows] == expected  # nosec B101
+    assert rows[0]._fields == ("uid", "name", "age")  # nosec B101
+    records = fx_crud_instance.reads(row_factory=RowFactory.RECORD)
+    assert [(record.uid, record.name, record.age) for record in records] == expected  # nosec B101
+    assert not hasattr(records[0], "__dict__")  # nosec B101
+    assert isinstance(fx_crud_instance.read(1, row_factory=RowFactory.RECORD), type(records[0]))  # nosec B101
+    assert fx_crud_instance.read(3, row_factory=RowFactory.ROW) is None  # nosec B101
+    assert list(fx_crud_instance.read_by_ids([2, 1], as_mapping=True, row_factory=RowFactory.RECORD)) == [2, 1]  # nosec B101
+    assert [record.uid for record in fx_crud_instance.read_by_field("name", "Jane", row_factory=RowFactory.RECORD)] == [2]  # nosec B101
+    assert [tuple(row) for row in fx_crud_instance.iter_reads(batch_size=1, row_factory=RowFactory.ROW)] == expected  # nosec B101
+    assert [row.uid for row in fx_crud_instance.read_page(after_uid=1, row_factory=RowFactory.ROW)] == [2]  # nosec B101
+
+
+def test_read_by_field_null(fx_logger: Logger) -> None:
+    """Test that read_by_field() reads the records whose field is NULL, with every row factory.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+    """
+
+    class NullableModel(BaseSqlModel, table=True):
+        """The SQLModel representing a model with a nullable field.
+
+        Attributes:
+            uid (int): The unique identifier.
+            name (str | None): The name of the model.
+        """
+
+        uid: int = Field(default=None, primary_key=True)
+        name: str | None = None
+
+    crud = Crud(fx_logger, NullableModel, "sqlite:///:memory:")
+    crud.create_table()
+    crud.bulk_creates([{"name": "John"}, {"name": None}, {"name": None}])
+    assert [data.uid for data in crud.read_by_field("name", None)] == [2, 3]  # nosec B101
+    assert [data.uid for data in crud.read_by_field("name", None, row_factory=RowFactory.RECORD)] == [2, 3]  # nosec B101
+    assert [data.uid for data in crud.read_by_field("name", "John")] == [1]  # nosec B101
+    crud.drop_table()
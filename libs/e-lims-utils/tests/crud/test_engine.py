@@ -0,0 +1,101 @@
+"""e-lims-utils tests crud engine."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Generator
+
+import pytest
+from sqlalchemy import text
+
+from e_lims_utils.crud.engine import EngineOptions, EngineRegistry, JournalMode, SqliteProfile, Synchronous
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture()
+def fx_registry() -> Generator[EngineRegistry, None, None]:
+    """Pytest fixture for the EngineRegistry class.
+
+    Returns:
+        EngineRegistry: An empty EngineRegistry object, disposed after the test.
+    """
+    registry = EngineRegistry()
+    yield registry
+    registry.dispose_all()
+
+
+def test_engine_options_kwargs() -> None:
+    """Test that only the pool options which are set are passed to the engine."""
+    assert EngineOptions().engine_kwargs == {"pool_pre_ping": False, "pool_recycle": -1}  # nosec B101
+    options = EngineOptions(pool_size=2, max_overflow=3, pool_pre_ping=True, pool_recycle=60)
+    assert options.engine_kwargs == {"pool_size": 2, "max_overflow": 3, "pool_pre_ping": True, "pool_recycle": 60}  # nosec B101
+
+
+def test_get_shares_engine(fx_registry: EngineRegistry) -> None:
+    """Test that the same URL and options return the same engine.
+
+    Args:
+        fx_registry (EngineRegistry): The EngineRegistry object.
+    """
+    engine = fx_registry.get("sqlite:///:memory:")
+    assert fx_registry.get("sqlite:///:memory:", EngineOptions()) is engine  # nosec B101
+    assert fx_registry.get("sqlite:///:memory:", EngineOptions(pool_pre_ping=True)) is not engine  # nosec B101
+
+
+def test_release(fx_registry: EngineRegistry) -> None:
+    """Test that the pooled connections of an engine are closed by its last user only, and that the engine stays in the registry.
+
+    Args:
+        fx_registry (EngineRegistry): The EngineRegistry object.
+    """
+    engine = fx_registry.acquire("sqlite:///:memory:")
+    assert fx_registry.acquire("sqlite:///:memory:") is engine  # nosec B101
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE kept (uid INTEGER)"))
+    assert not fx_registry.release(engine)  # nosec B101
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT COUNT(*) FROM kept")).scalar() == 0  # nosec B101
+    assert fx_registry.release(engine)  # nosec B101
+    assert fx_registry.get("sqlite:///:memory:") is engine  # nosec B101
+
+
+def test_dispose(fx_registry: EngineRegistry) -> None:
+    """Test that a disposed engine is removed from the registry.
+
+    Args:
+        fx_registry (EngineRegistry): The EngineRegistry object.
+    """
+    engine = fx_registry.get("sqlite:///:memory:")
+    fx_registry.dispose("sqlite:///:memory:")
+    assert len(fx_registry) == 0  # nosec B101
+    assert fx_registry.get("sqlite:///:memory:") is not engine  # nosec B101
+
+
+def test_dispose_all(fx_registry: EngineRegistry) -> None:
+    """Test that all the engines are removed from the registry.
+
+    Args:
+        fx_registry (EngineRegistry): The EngineRegistry object.
+    """
+    fx_registry.get("sqlite:///:memory:")
+    fx_registry.get("sqlite:///:memory:", EngineOptions(pool_recycle=60))
+    fx_registry.dispose_all()
+    assert len(fx_registry) == 0  # nosec B101
+
+
+def test_sqlite_profile(fx_registry: EngineRegistry, tmp_path: Path) -> None:
+    """Test that the SQLite profile is applied to the connections of the engine.
+
+    Args:
+        fx_registry (EngineRegistry): The EngineRegistry object.
+        tmp_path (Path): A temporary directory.
+    """
+    profile = SqliteProfile(busy_timeout=1234, cache_size=-2048)
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    with fx_registry.get(url, EngineOptions(sqlite=profile)).connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == JournalMode.WAL.lower()  # nosec B101
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == list(Synchronous).index(Synchronous.NORMAL)  # nosec B101
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == profile.busy_timeout  # nosec B101
+        assert connection.execute(text("PRAGMA cache_size")).scalar() == profile.cache_size  # nosec B101
+    with fx_registry.get(f"sqlite:///{tmp_path / 'default.db'}").connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == JournalMode.DELETE.lower()  # nosec B101
@@ -0,0 +1,130 @@
+"""e-lims-utils tests crud export."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlmodel import Field
+
+from e_lims_utils.crud.crud import BaseSqlModel, Crud
+from e_lims_utils.crud.query import gt
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture()
+def fx_model() -> BaseSqlModel:
+    """Return the SQLModel to export.
+
+    Returns:
+        Model: The SQLModel to export.
+    """
+
+    class ExportModel(BaseSqlModel, table=True):
+        """The SQLModel representing a model.
+
+        Attributes:
+            uid (int): The unique identifier.
+            name (str): The name of the model.
+            age (int): The age of the model.
+            score (float | None): The optional score of the model.
+        """
+
+        uid: int = Field(default=None, primary_key=True)
+        name: str
+        age: int
+        score: float | None = None
+
+    return ExportModel
+
+
+@pytest.fixture()
+def fx_crud_instance(fx_crud_instance: Crud) -> Crud:
+    """Return the Crud object with four records.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object of an empty table.
+
+    Returns:
+        Crud: The Crud object.
+    """
+    fx_crud_instance.bulk_creates(
+        [
+            {"name": "John", "age": 25, "score": 1.5},
+            {"name": "Jane", "age": 22, "score": None},
+            {"name": "Jack", "age": 40, "score": 3.0},
+            {"name": "Jill", "age": 31, "score": 4.5},
+        ],
+    )
+    return fx_crud_instance
+
+
+def test_iter_columns(fx_crud_instance: Crud) -> None:
+    """Test that iter_columns() streams chunks of columns.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    chunks = list(fx_crud_instance.iter_columns(chunk_size=3))
+    assert [chunk["uid"] for chunk in chunks] == [(1, 2, 3), (4,)]  # nosec B101
+    assert list(chunks[0]) == ["uid", "name", "age", "score"]  # nosec B101
+    query = fx_crud_instance.query().where(gt("age", 24)).columns("name")
+    assert list(fx_crud_instance.iter_columns(query)) == [{"name": ("John", "Jack", "Jill")}]  # nosec B101
+
+
+def test_export_index_advisor(fx_crud_instance: Crud) -> None:
+    """Test that an export records the filtered fields in the index advisor once.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    pytest.importorskip("numpy")
+    fx_crud_instance.to_arrays(fx_crud_instance.query().where(name="John"))
+    assert fx_crud_instance.index_advisor.unindexed_columns() == {"name": 1}  # nosec B101
+
+
+def test_to_arrays(fx_crud_instance: Crud) -> None:
+    """Test that to_arrays() returns typed NumPy arrays.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    np = pytest.importorskip("numpy")
+    arrays = fx_crud_instance.to_arrays(chunk_size=3)
+    assert arrays["age"].dtype == np.int64  # nosec B101
+    assert arrays["age"].tolist() == [25, 22, 40, 31]  # nosec B101
+    assert np.isnan(arrays["score"][1])  # nosec B101
+    assert arrays["name"].tolist() == ["John", "Jane", "Jack", "Jill"]  # nosec B101
+    empty = fx_crud_instance.to_arrays(fx_crud_instance.query().where(name="Nobody").columns("age"))
+    assert list(empty) == ["age"]  # nosec B101
+    assert not len(empty["age"])  # nosec B101
+
+
+def test_to_arrow(fx_crud_instance: Crud) -> None:
+    """Test that to_arrow() returns an Arrow table with one batch per chunk.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    pa = pytest.importorskip("pyarrow")
+    table = fx_crud_instance.to_arrow(fx_crud_instance.query().order_by("-age"), chunk_size=2)
+    assert table.schema.field("age").type == pa.int64()  # nosec B101
+    assert table.column("name").to_pylist() == ["Jack", "Jill", "John", "Jane"]  # nosec B101
+    assert table.column("score").null_count == 1  # nosec B101
+    assert len(table.to_batches()) == len(table) // 2  # nosec B101
+
+
+def test_write_parquet(fx_crud_instance: Crud, tmp_path: Path) -> None:
+    """Test that write_parquet() streams the records to a Parquet file.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        tmp_path (Path): A temporary directory.
+    """
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "records.parquet"
+    assert fx_crud_instance.write_parquet(path, chunk_size=3) == len(fx_crud_instance.reads())  # nosec B101
+    parquet = pq.ParquetFile(path)
+    assert parquet.num_row_groups == len(fx_crud_instance.reads()) // 2  # nosec B101
+    assert parquet.read().column("name").to_pylist() == ["John", "Jane", "Jack", "Jill"]  # nosec B101
@@ -0,0 +1,116 @@
+"""e-lims-utils tests crud indexes."""
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlmodel import Field
+
+from e_lims_utils.crud.async_crud import AsyncCrud
+from e_lims_utils.crud.crud import BaseSqlModel, Crud
+from e_lims_utils.crud.indexes import IndexAdvisor, declared_indexes
+
+if TYPE_CHECKING:
+    from e_lims_utils.logger.logger import Logger
+
+
+class IndexedModel(BaseSqlModel, table=True):
+    """The SQLModel representing a model with indexes.
+
+    It's defined once for the module, redefining it would attach its indexes to the table twice.
+
+    Attributes:
+        uid (int): The unique identifier.
+        serial (str): The serial number, with a single-column index.
+        operator (str): The operator, leading column of a composite index.
+        age (int): The age of the model.
+        comment (str): A comment, without index.
+    """
+
+    __indexes__ = (("operator", "age"),)
+    uid: int = Field(default=None, primary_key=True)
+    serial: str = Field(index=True)
+    operator: str
+    age: int
+    comment: str
+
+
+class RecordingLogger:
+    """A logger recording the warnings it receives.
+
+    Attributes:
+        warnings (list[str]): The warning messages.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the RecordingLogger object with no warnings."""
+        self.warnings: list[str] = []
+
+    def warning(self, message: str) -> None:
+        """Record a warning message.
+
+        Args:
+            message (str): The message to record.
+        """
+        self.warnings.append(message)
+
+
+def test_declared_indexes() -> None:
+    """Test that the declared indexes are built once."""
+    indexes = declared_indexes(IndexedModel)
+    assert [index.name for index in indexes] == ["ix_indexedmodel_operator_age"]  # nosec B101
+    assert [column.name for column in indexes[0].columns] == ["operator", "age"]  # nosec B101
+    assert declared_indexes(IndexedModel)[0] is indexes[0]  # nosec B101
+
+
+def test_create_table_creates_indexes(fx_logger: Logger) -> None:
+    """Test that create_table() creates the declared indexes, also on an existing table.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+    """
+    crud = Crud(fx_logger, IndexedModel, "sqlite:///:memory:")
+    crud.create_table()
+    crud.create_table()
+    indexes = {index["name"]: index["column_names"] for index in inspect(crud.engine).get_indexes(IndexedModel.__tablename__)}
+    assert indexes == {"ix_indexedmodel_serial": ["serial"], "ix_indexedmodel_operator_age": ["operator", "age"]}  # nosec B101
+    crud.drop_table()
+
+
+def test_async_create_table_creates_indexes(fx_logger: Logger) -> None:
+    """Test that AsyncCrud.create_table() creates the declared indexes, also on an existing table.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+    """
+    pytest.importorskip("aiosqlite")
+    crud = AsyncCrud(fx_logger, IndexedModel, "sqlite+aiosqlite:///:memory:")
+
+    async def scenario() -> dict[str, list[str]]:
+        await crud.create_table()
+        async with crud.engine.begin() as connection:
+            await connection.execute(text("DROP INDEX ix_indexedmodel_operator_age"))
+        await crud.create_table()
+        async with crud.engine.connect() as connection:
+            indexes = await connection.run_sync(lambda sync_connection: inspect(sync_connection).get_indexes(IndexedModel.__tablename__))
+        await crud.drop_table()
+        await crud.dispose()
+        return {index["name"]: index["column_names"] for index in indexes}
+
+    indexes = asyncio.run(scenario())
+    assert indexes == {"ix_indexedmodel_serial": ["serial"], "ix_indexedmodel_operator_age": ["operator", "age"]}  # nosec B101
+
+
+def test_index_advisor() -> None:
+    """Test that the advisor warns once about hot columns without index."""
+    declared_indexes(IndexedModel)
+    logger = RecordingLogger()
+    advisor = IndexAdvisor(logger, IndexedModel.__table__, threshold=2)
+    for column in ("serial", "operator", "comment", "comment", "comment", "age"):
+        advisor.record(column)
+    assert advisor.indexed_columns == {"uid", "serial", "operator"}  # nosec B101
+    assert advisor.unindexed_columns() == {"comment": 3, "age": 1}  # nosec B101
+    assert len(logger.warnings) == 1  # nosec B101
+    assert "indexedmodel.comment" in logger.warnings[0]  # nosec B101
@@ -0,0 +1,115 @@
+"""e-lims-utils tests crud instrumentation."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from e_lims_utils.crud.crud import BaseSqlModel, Crud
+from e_lims_utils.crud.instrumentation import Instrumentation, LatencyHistogram
+
+if TYPE_CHECKING:
+    from e_lims_utils.logger.logger import Logger
+
+
+class RecordingLogger:
+    """A logger recording the warnings it receives.
+
+    Attributes:
+        warnings (list[str]): The warning messages.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the RecordingLogger object with no warnings."""
+        self.warnings: list[str] = []
+
+    def warning(self, message: str) -> None:
+        """Record a warning message.
+
+        Args:
+            message (str): The message to record.
+        """
+        self.warnings.append(message)
+
+
+def test_latency_histogram() -> None:
+    """Test the buckets, mean and percentiles of a histogram."""
+    histogram = LatencyHistogram(bounds=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.05, 0.05, 0.5, 3.0):
+        histogram.record(seconds)
+    assert histogram.counts == [1, 2, 1, 1]  # nosec B101
+    assert histogram.mean == pytest.approx(3.605 / histogram.count)  # nosec B101
+    assert histogram.percentile(0.5) == histogram.bounds[1]  # nosec B101
+    assert histogram.percentile(1.0) == histogram.maximum  # nosec B101
+    assert LatencyHistogram().percentile(0.99) == 0.0  # noqa: PLR2004 # nosec B101
+
+
+def test_instrumented_operations(fx_logger: Logger, fx_model: BaseSqlModel) -> None:
+    """Test that the operations are timed with their rows and statements, and the nested operations are not timed.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+    """
+    instrumentation = Instrumentation(fx_logger, threshold=60)
+    crud = Crud(fx_logger, fx_model, "sqlite:///:memory:", instrumentation=instrumentation)
+    crud.create_table()
+    crud.bulk_creates([{"name": "John", "age": 25}, {"name": "Jane", "age": 22}, {"name": "Jack", "age": 40}])
+    crud.read(1)
+    assert len(list(crud.iter_reads(batch_size=2))) == len(crud.reads())  # nosec B101
+    crud.update(fx_model(uid=1, name="John", age=26))
+    crud.query().where(name="Jane").all()
+    assert sorted(instrumentation.histograms) == ["bulk_creates", "iter_reads", "query.all", "read", "reads", "update"]  # nosec B101
+    assert all(histogram.count == 1 for histogram in instrumentation.histograms.values())  # nosec B101
+    assert not instrumentation.slow_operations  # nosec B101
+    crud.drop_table()
+
+
+def test_slow_operations(fx_logger: Logger, fx_model: BaseSqlModel) -> None:
+    """Test that the slow operations are logged at WARNING and kept with their rows and statements.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+    """
+    logger = RecordingLogger()
+    instrumentation = Instrumentation(logger, threshold=0.0)
+    crud = Crud(fx_logger, fx_model, "sqlite:///:memory:", instrumentation=instrumentation)
+    crud.create_table()
+    crud.bulk_creates([{"name": "John", "age": 25}, {"name": "Jane", "age": 22}, {"name": "Jack", "age": 40}])
+    crud.update_where({"age": 22}, {"age": 23})
+    crud.reads()
+    assert crud.count() == 3  # noqa: PLR2004 # nosec B101
+    created, updated, read, counted = instrumentation.slow_operations
+    assert (created.operation, created.rows) == ("bulk_creates", len(crud.reads()))  # nosec B101
+    assert created.statements[0].statement.startswith("INSERT INTO")  # nosec B101
+    assert (updated.operation, updated.rows) == ("update_where", 1)  # nosec B101
+    assert (read.operation, read.rows) == ("reads", len(crud.reads()))  # nosec B101
+    assert (counted.operation, counted.rows) == ("count", 1)  # nosec B101
+    assert logger.warnings[1].startswith("Slow Crud.update_where on 'model'")  # nosec B101
+    instrumentation.reset()
+    assert not instrumentation.histograms  # nosec B101
+    crud.drop_table()
+
+
+def test_failing_statement(fx_logger: Logger, fx_model: BaseSqlModel) -> None:
+    """Test that a statement which fails is not kept and leaves nothing on the connection, and that the next statements are timed.
+
+    Args:
+        fx_logger (Logger): A Logger object.
+        fx_model (SQLModel): The SQLModel on which to perform CRUD operations.
+    """
+    instrumentation = Instrumentation(fx_logger, threshold=0.0)
+    crud = Crud(fx_logger, fx_model, "sqlite:///:memory:", instrumentation=instrumentation)
+    with pytest.raises(OperationalError, match="no such table"):
+        crud.reads()
+    crud.create_table()
+    crud.reads()
+    failed, read = instrumentation.slow_operations
+    assert (failed.operation, failed.statements) == ("reads", [])  # nosec B101
+    assert len(read.statements) == 1  # nosec B101
+    assert read.statements[0].seconds <= read.seconds  # nosec B101
+    with crud.engine.connect() as connection:
+        assert not connection.info  # nosec B101
+    crud.drop_table()
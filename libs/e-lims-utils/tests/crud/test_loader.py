@@ -0,0 +1,95 @@
+"""e-lims-utils tests crud loader."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlmodel import Field
+
+from e_lims_utils.crud.crud import BaseSqlModel, Crud
+from e_lims_utils.crud.loader import FileFormat
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture()
+def fx_model() -> BaseSqlModel:
+    """Return the SQLModel to load files into.
+
+    Returns:
+        Model: The SQLModel to load files into.
+    """
+
+    class LoadModel(BaseSqlModel, table=True):
+        """The SQLModel representing a measure.
+
+        Attributes:
+            uid (int): The unique identifier.
+            serial (str): The serial number of the instrument.
+            value (float): The measured value.
+            valid (bool): Whether the measure is valid.
+            measured_at (datetime | None): The optional time of the measure.
+        """
+
+        uid: int = Field(default=None, primary_key=True)
+        serial: str
+        value: float
+        valid: bool
+        measured_at: datetime | None = None
+
+    return LoadModel
+
+
+def test_load_csv(fx_crud_instance: Crud, tmp_path: Path) -> None:
+    """Test that load_file() streams a CSV file in chunks and converts its values to the column types.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        tmp_path (Path): A temporary directory.
+    """
+    path = tmp_path / "measures.csv"
+    path.write_text("serial,value,valid,measured_at\nSN-1,1.5,true,2024-01-02T03:04:05\nSN-2,2,0,\nSN-3,-3.25,False,2024-01-03\n", encoding="utf-8")
+    report = fx_crud_instance.load_file(path, chunk_size=2)
+    records = fx_crud_instance.reads()
+    assert report.rows == len(records)  # nosec B101
+    assert report.rows_per_second > 0  # nosec B101
+    assert [(record.serial, record.value, record.valid) for record in records] == [("SN-1", 1.5, True), ("SN-2", 2.0, False), ("SN-3", -3.25, False)]  # nosec B101
+    assert records[0].measured_at == datetime(2024, 1, 2, 3, 4, 5)  # noqa: DTZ001 # nosec B101
+    assert records[1].measured_at is None  # nosec B101
+
+
+def test_load_csv_invalid(fx_crud_instance: Crud, tmp_path: Path) -> None:
+    """Test that load_file() rejects invalid values and unknown columns, and loads nothing.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        tmp_path (Path): A temporary directory.
+    """
+    path = tmp_path / "measures.csv"
+    path.write_text("serial,value,valid\nSN-1,1.5,true\nSN-2,2,0\nSN-3,high,1\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="'high' for column 'value' at line 4"):
+        fx_crud_instance.load_file(path, chunk_size=2)
+    assert not fx_crud_instance.reads()  # nosec B101
+    path.write_text("serial,temperature\nSN-1,20\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="temperature"):
+        fx_crud_instance.load_file(path)
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        fx_crud_instance.load_file(tmp_path / "measures.xlsx")
+
+
+def test_load_parquet(fx_crud_instance: Crud, tmp_path: Path) -> None:
+    """Test that load_file() loads a Parquet file, casting its columns to the column types.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        tmp_path (Path): A temporary directory.
+    """
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "measures.data"
+    pq.write_table(pa.table({"serial": ["SN-1", "SN-2", "SN-3"], "value": pa.array([1, 2, 3], type=pa.int32()), "valid": [True, False, True]}), path)
+    report = fx_crud_instance.load_file(path, FileFormat.PARQUET, chunk_size=2)
+    assert report.rows == len(fx_crud_instance.reads())  # nosec B101
+    assert [record.value for record in fx_crud_instance.reads()] == [1.0, 2.0, 3.0]  # nosec B101
@@ -0,0 +1,136 @@
+"""e-lims-utils tests crud query."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from e_lims_utils.crud.query import Aggregate, Operator, between, eq, ge, gt, in_, le, like, lt, ne
+
+if TYPE_CHECKING:
+    from e_lims_utils.crud.crud import Crud
+
+
+@pytest.fixture()
+def fx_crud_instance(fx_crud_instance: Crud) -> Crud:
+    """Return the Crud object with four records.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object of an empty table.
+
+    Returns:
+        Crud: The Crud object.
+    """
+    fx_crud_instance.bulk_creates([{"name": "John", "age": 25}, {"name": "Jane", "age": 22}, {"name": "Jack", "age": 40}, {"name": "Jill", "age": 31}])
+    return fx_crud_instance
+
+
+@pytest.mark.parametrize(
+    ("predicate", "uids"),
+    [
+        (eq("name", "Jane"), [2]),
+        (ne("name", "Jane"), [1, 3, 4]),
+        (lt("age", 25), [2]),
+        (le("age", 25), [1, 2]),
+        (gt("age", 31), [3]),
+        (ge("age", 31), [3, 4]),
+        (in_("name", ["John", "Jill"]), [1, 4]),
+        (between("age", 22, 31), [1, 2, 4]),
+        (like("name", "J_ck"), [3]),
+        (eq("name", "John") | gt("age", 35), [1, 3]),
+        ((eq("name", "John") | gt("age", 35)) & lt("age", 30), [1]),
+    ],
+)
+def test_predicates(fx_crud_instance: Crud, predicate: object, uids: list[int]) -> None:
+    """Test that the predicates select the expected records.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+        predicate (Predicate): The predicate to test.
+        uids (list[int]): The primary keys of the expected records.
+    """
+    assert [record.uid for record in fx_crud_instance.query().where(predicate).order_by("uid").all()] == uids  # nosec B101
+
+
+def test_where_equalities(fx_crud_instance: Crud) -> None:
+    """Test that the keyword equalities are combined with the predicates.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    assert [record.uid for record in fx_crud_instance.query().where(gt("age", 20), name="Jill").all()] == [4]  # nosec B101
+
+
+def test_order_limit_offset(fx_crud_instance: Crud) -> None:
+    """Test the ordering and the pagination of a query.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    query = fx_crud_instance.query().order_by("-age")
+    assert [record.name for record in query.all()] == ["Jack", "Jill", "John", "Jane"]  # nosec B101
+    assert [record.name for record in query.offset(1).limit(2).all()] == ["Jill", "John"]  # nosec B101
+    assert query.first().name == "Jack"  # nosec B101
+    assert fx_crud_instance.query().where(name="Nobody").first() is None  # nosec B101
+
+
+def test_projection(fx_crud_instance: Crud) -> None:
+    """Test that a projection returns rows and dictionaries of the selected fields.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    query = fx_crud_instance.query().where(ge("age", 31)).order_by("uid")
+    assert [tuple(row) for row in query.columns("name", "age").all()] == [("Jack", 40), ("Jill", 31)]  # nosec B101
+    assert query.columns("name").dicts() == [{"name": "Jack"}, {"name": "Jill"}]  # nosec B101
+    assert query.dicts() == [{"uid": 3, "name": "Jack", "age": 40}, {"uid": 4, "name": "Jill", "age": 31}]  # nosec B101
+
+
+def test_predicate_filters(fx_crud_instance: Crud) -> None:
+    """Test that the where methods of Crud accept predicates.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    uids = [1, 2]
+    assert fx_crud_instance.update_where(in_("name", ["John", "Jane"]), {"age": 0}) == len(uids)  # nosec B101
+    assert [record.uid for record in fx_crud_instance.iter_reads(filters=eq("age", 0))] == uids  # nosec B101
+    assert fx_crud_instance.delete_where(eq("age", 0)) == len(uids)  # nosec B101
+    assert fx_crud_instance.index_advisor.unindexed_columns() == {"age": 2, "name": 1}  # nosec B101
+
+
+def test_predicate_fields() -> None:
+    """Test that the fields of combined predicates are listed."""
+    predicate = eq("name", "John") & (gt("age", 1) | lt("age", 0))
+    assert predicate.operator is Operator.AND  # nosec B101
+    assert list(predicate.fields()) == ["name", "age", "age"]  # nosec B101
+
+
+def test_count_and_exists(fx_crud_instance: Crud) -> None:
+    """Test that count() and exists() apply the filters in SQL.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    assert fx_crud_instance.count() == len(fx_crud_instance.reads())  # nosec B101
+    assert fx_crud_instance.count(like("name", "J%") & gt("age", 24)) == len(["John", "Jack", "Jill"])  # nosec B101
+    assert fx_crud_instance.count({"name": "Nobody"}) == 0  # nosec B101
+    assert fx_crud_instance.exists({"name": "Jane"})  # nosec B101
+    assert not fx_crud_instance.exists(gt("age", 99))  # nosec B101
+
+
+def test_aggregate(fx_crud_instance: Crud) -> None:
+    """Test that aggregate() returns one row of aggregates per group.
+
+    Args:
+        fx_crud_instance (Crud): The Crud object.
+    """
+    fx_crud_instance.bulk_creates([{"name": "Jane", "age": 30}])
+    assert fx_crud_instance.aggregate("age", [Aggregate.MIN, "max", "avg"]) == [{"min_age": 22, "max_age": 40, "avg_age": 29.6}]  # nosec B101
+    assert fx_crud_instance.aggregate("uid", group_by=["name"], filters=ne("name", "Jack")) == [  # nosec B101
+        {"name": "Jane", "count_uid": 2},
+        {"name": "Jill", "count_uid": 1},
+        {"name": "John", "count_uid": 1},
+    ]
+    with pytest.raises(ValueError, match="MEDIAN"):
+        fx_crud_instance.aggregate("age", ["median"])
@@ -0,0 +1,31 @@
+"""e-lims-utils tests logger fixtures."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING
+
+import pytest
+
+from e_lims_utils.files.files import FileProperties, FileSuffix
+from e_lims_utils.files.timestamp import Timestamp
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture()
+def fx_file(tmp_path: Path) -> FileProperties:
+    """Pytest fixture for the file of the Logger, in a temporary directory.
+
+    Args:
+        tmp_path (Path): A temporary directory.
+
+    Returns:
+        FileProperties: The properties of the log file.
+    """
+    return FileProperties(
+        name="test_logger",
+        suffix=FileSuffix.LOG,
+        path=tmp_path,
+        timestamp=Timestamp(datetime.now(tz=timezone.utc)),
+    )
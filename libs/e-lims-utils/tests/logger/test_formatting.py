@@ -0,0 +1,64 @@
+"""e-lims-utils tests logger formatting."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Generator
+
+import pytest
+
+from e_lims_utils.logger.logger import Logger, LoggerLevel
+
+if TYPE_CHECKING:
+    from e_lims_utils.files.files import FileProperties
+
+
+@pytest.fixture()
+def fx_logger(fx_file: FileProperties) -> Generator[Logger, None, None]:
+    """Pytest fixture for the Logger class.
+
+    Args:
+        fx_file (FileProperties): The properties of the log file, in a temporary directory.
+
+    Returns:
+        Logger: A Logger object, logging from the INFO level.
+    """
+    logger = Logger(file=fx_file, level=LoggerLevel.INFO, backtrace=True, diagnose=True)
+    yield logger
+    logger._logger.remove()  # noqa: SLF001
+
+
+def test_is_enabled(fx_logger: Logger) -> None:
+    """Test that is_enabled compares a level, given as a member or a name, with the lowest level of the handlers."""
+    assert not fx_logger.is_enabled(LoggerLevel.TRACE)  # nosec B101
+    assert not fx_logger.is_enabled(LoggerLevel.DEBUG)  # nosec B101
+    assert fx_logger.is_enabled(LoggerLevel.INFO)  # nosec B101
+    assert fx_logger.is_enabled(LoggerLevel.CRITICAL)  # nosec B101
+    assert not fx_logger.is_enabled("DEBUG")  # nosec B101
+    assert fx_logger.is_enabled("INFO")  # nosec B101
+    fx_logger._logger.remove()  # noqa: SLF001
+    assert not fx_logger.is_enabled(LoggerLevel.CRITICAL)  # nosec B101
+
+
+def test_format_arguments(fx_logger: Logger) -> None:
+    """Test that the messages are formatted with their arguments, and left as is without arguments."""
+    fx_logger.info("Read {} records from '{table}'.", 3, table="model")  # noqa: PLE1205
+    fx_logger.warning("Braces {kept} without arguments.")
+    content = fx_logger.file.file_path.read_text(encoding="utf-8")
+    assert "Read 3 records from 'model'." in content  # nosec B101
+    assert "Braces {kept} without arguments." in content  # nosec B101
+
+
+def test_lazy_message(fx_logger: Logger) -> None:
+    """Test that a message function is called only when its level is enabled."""
+    calls: list[str] = []
+
+    def message(level: str) -> str:
+        calls.append(level)
+        return f"Lazy {level} message."
+
+    fx_logger.debug(lambda: message("debug"))
+    fx_logger.debug("Unused {}", message)  # noqa: PLE1205
+    fx_logger.error(lambda: message("error"))
+    assert calls == ["error"]  # nosec B101
+    content = fx_logger.file.file_path.read_text(encoding="utf-8")
+    assert "Lazy error message." in content  # nosec B101
+    assert "Lazy debug message." not in content  # nosec B101
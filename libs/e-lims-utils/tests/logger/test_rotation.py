@@ -0,0 +1,119 @@
+"""e-lims-utils tests logger rotation."""
+from __future__ import annotations
+
+import gzip
+import os
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+import pytest
+
+from e_lims_utils.logger.logger import Logger, LoggerLevel
+from e_lims_utils.logger.rotation import Compression, LogRotation, RotatingFile
+from e_lims_utils.logger.sinks import QueueOptions
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from e_lims_utils.files.files import FileProperties
+
+
+@pytest.fixture()
+def fx_path(tmp_path: Path) -> Path:
+    """Pytest fixture for the path of a log file.
+
+    Returns:
+        Path: The path of the log file, in a temporary directory.
+    """
+    return tmp_path / "run.log"
+
+
+def read_segment(path: Path) -> str:
+    """Returns the content of a rotated segment, compressed or not.
+
+    Args:
+        path (Path): The path of the segment.
+
+    Returns:
+        str: The content of the segment.
+    """
+    if path.suffix == ".gz":
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            return file.read()
+    return path.read_text(encoding="utf-8")
+
+
+def test_log_rotation_needs_a_trigger() -> None:
+    """Test that a LogRotation without max_bytes nor interval raises a ValueError."""
+    with pytest.raises(ValueError, match="max_bytes, interval or both"):
+        LogRotation(keep=3)
+
+
+def test_rotation_by_size(fx_path: Path) -> None:
+    """Test that the file is rotated when it reaches max_bytes, and that the segments are compressed with gzip."""
+    rotating = RotatingFile(fx_path, LogRotation(max_bytes=100))
+    lines = [f"line {index:02d} of the rotation test\n" for index in range(20)]
+    rotating.writelines(lines)
+    rotating.stop()
+    segments = rotating.segments()
+    assert len(segments) == 4  # noqa: PLR2004 # nosec B101
+    assert all(segment.name.endswith(".log.gz") for segment in segments)  # nosec B101
+    assert all(len(read_segment(segment)) >= 100 for segment in segments)  # noqa: PLR2004 # nosec B101
+    assert "".join(map(read_segment, segments)) + fx_path.read_text(encoding="utf-8") == "".join(lines)  # nosec B101
+
+
+def test_rotation_by_time(fx_path: Path) -> None:
+    """Test that the file is rotated when its interval has passed, without compression."""
+    now = [0.0]
+    rotating = RotatingFile(fx_path, LogRotation(interval=timedelta(seconds=10), compression=Compression.NONE), clock=lambda: now[0])
+    rotating.write("first\n")
+    now[0] = 10.0
+    rotating.write("second\n")
+    rotating.write("third\n")
+    rotating.stop()
+    segments = rotating.segments()
+    assert [read_segment(segment) for segment in segments] == ["first\n"]  # nosec B101
+    assert segments[0].suffix == ".log"  # nosec B101
+    assert fx_path.read_text(encoding="utf-8") == "second\nthird\n"  # nosec B101
+
+
+def test_retention(fx_path: Path) -> None:
+    """Test that the segments beyond keep and older than max_age are deleted."""
+    old = fx_path.with_name("run.20000101_000000_000000.log.gz")
+    old.write_bytes(b"")
+    os.utime(old, (0, 0))
+    rotating = RotatingFile(fx_path, LogRotation(max_bytes=10, keep=2, max_age=timedelta(days=1)))
+    rotating.writelines(f"message {index}\n" for index in range(6))
+    rotating.stop()
+    segments = rotating.segments()
+    assert not old.exists()  # nosec B101
+    assert [read_segment(segment) for segment in segments] == ["message 3\n", "message 4\n"]  # nosec B101
+
+
+def test_zstd_compression(fx_path: Path) -> None:
+    """Test that the segments are compressed with zstandard."""
+    zstandard = pytest.importorskip("zstandard")
+    rotating = RotatingFile(fx_path, LogRotation(max_bytes=10, compression=Compression.ZSTD))
+    rotating.writelines(["first message\n", "second message\n"])
+    rotating.stop()
+    segments = rotating.segments()
+    assert [segment.suffix for segment in segments] == [".zst"]  # nosec B101
+    with segments[0].open("rb") as file:
+        assert zstandard.ZstdDecompressor().stream_reader(file).read() == b"first message\n"  # nosec B101
+
+
+@pytest.mark.parametrize("queue", [None, QueueOptions()])
+def test_logger_rotation(fx_file: FileProperties, queue: QueueOptions | None) -> None:
+    """Test that a Logger with a rotation rotates its file, with or without queue."""
+    logger = Logger(file=fx_file, level=LoggerLevel.INFO, queue=queue, rotation=LogRotation(max_bytes=200, keep=3))
+    try:
+        for index in range(20):
+            logger.info("Message {}.", index)  # noqa: PLE1205
+        logger.set_file_level(LoggerLevel.WARNING)
+        logger.warning("After level change.")
+    finally:
+        logger._logger.remove()  # noqa: SLF001
+    segments = sorted(fx_file.path.glob(f"{fx_file.file_path.stem}.*.log.gz"))
+    assert len(segments) == 3  # noqa: PLR2004 # nosec B101
+    assert "Message 19." in read_segment(segments[-1]) + fx_file.file_path.read_text(encoding="utf-8")  # nosec B101
+    assert "After level change." in fx_file.file_path.read_text(encoding="utf-8")  # nosec B101
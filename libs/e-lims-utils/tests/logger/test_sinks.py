@@ -0,0 +1,268 @@
+"""e-lims-utils tests logger sinks."""
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Generator, Iterable, Self
+
+import pytest
+
+from e_lims_utils.logger.logger import Logger, LoggerLevel
+from e_lims_utils.logger.sinks import BufferedSink, BufferOptions, OverflowPolicy, QueuedSink, QueueOptions
+
+if TYPE_CHECKING:
+    from e_lims_utils.files.files import FileProperties
+
+
+class FakeMessage(str):
+    """A formatted message with the level number of its record, as handed to a sink by loguru."""
+
+    __slots__ = ("record",)
+
+    def __new__(cls, text: str, level: int = 20) -> Self:
+        """Creates the message.
+
+        Args:
+            text (str): The formatted message.
+            level (int): The level number of the record.
+
+        Returns:
+            Self: The message.
+        """
+        message = super().__new__(cls, text)
+        message.record = {"level": SimpleNamespace(no=level)}
+        return message
+
+
+class BlockingStream:
+    """A stream whose writes wait until it's released.
+
+    Attributes:
+        lines (list[str]): The written lines.
+        started (threading.Event): Set when a write is waiting.
+        released (threading.Event): Set to let the writes through.
+    """
+
+    def __init__(self) -> None:
+        """Initializes the BlockingStream object, not released."""
+        self.lines: list[str] = []
+        self.started = threading.Event()
+        self.released = threading.Event()
+
+    def writelines(self, lines: Iterable[str]) -> None:
+        """Waits until the stream is released and records the lines.
+
+        Args:
+            lines (Iterable[str]): The lines to write.
+        """
+        self.started.set()
+        self.released.wait()
+        self.lines.extend(lines)
+
+    def flush(self) -> None:
+        """Does nothing, the lines are recorded on write."""
+
+
+class FailingStream:
+    """A stream whose writes raise an OSError, as a full disk does."""
+
+    def writelines(self, lines: Iterable[str]) -> None:  # noqa: ARG002
+        """Raises an OSError.
+
+        Args:
+            lines (Iterable[str]): The lines to write.
+
+        Raises:
+            OSError: Always.
+        """
+        msg = "No space left on device"
+        raise OSError(msg)
+
+    def flush(self) -> None:
+        """Does nothing, nothing is written."""
+
+
+@pytest.fixture()
+def fx_stream() -> Generator[BlockingStream, None, None]:
+    """Pytest fixture for a blocking stream.
+
+    Returns:
+        BlockingStream: A stream, released at teardown.
+    """
+    stream = BlockingStream()
+    yield stream
+    stream.released.set()
+
+
+def test_queued_sink_writes_and_stops(fx_file: FileProperties) -> None:
+    """Test that a queued sink writes the messages to its file, and that stop writes the queued ones."""
+    sink = QueuedSink(fx_file.file_path)
+    sink.write(FakeMessage("first\n"))
+    sink.drain()
+    assert fx_file.file_path.read_text(encoding="utf-8") == "first\n"  # nosec B101
+    for index in range(100):
+        sink.write(FakeMessage(f"{index}\n"))
+    sink.stop()
+    sink.stop()
+    assert fx_file.file_path.read_text(encoding="utf-8").splitlines() == ["first", *map(str, range(100))]  # nosec B101
+    assert not sink._thread.is_alive()  # noqa: SLF001 # nosec B101
+
+
+def test_overflow_block(fx_stream: BlockingStream) -> None:
+    """Test that a full queue makes the caller wait with the BLOCK policy, without losing messages."""
+    sink = QueuedSink(fx_stream, QueueOptions(maxsize=1, overflow=OverflowPolicy.BLOCK))
+    sink.write(FakeMessage("a"))
+    fx_stream.started.wait()
+    sink.write(FakeMessage("b"))
+    writer = threading.Thread(target=sink.write, args=(FakeMessage("c"),))
+    writer.start()
+    writer.join(0.1)
+    assert writer.is_alive()  # nosec B101
+    fx_stream.released.set()
+    writer.join()
+    sink.stop()
+    assert fx_stream.lines == ["a", "b", "c"]  # nosec B101
+    assert sink.dropped == 0  # nosec B101
+
+
+def test_overflow_block_stopped(fx_stream: BlockingStream) -> None:
+    """Test that a caller waiting for a slot with the BLOCK policy drops its message when the sink is stopped, and that a stopped sink drops messages."""
+    sink = QueuedSink(fx_stream, QueueOptions(maxsize=1, overflow=OverflowPolicy.BLOCK))
+    sink.write(FakeMessage("a"))
+    fx_stream.started.wait()
+    sink.write(FakeMessage("b"))
+    writer = threading.Thread(target=sink.write, args=(FakeMessage("c"),))
+    writer.start()
+    writer.join(0.1)
+    assert writer.is_alive()  # nosec B101
+    stopper = threading.Thread(target=sink.stop)
+    stopper.start()
+    writer.join(5)
+    assert not writer.is_alive()  # nosec B101
+    sink.write(FakeMessage("d"))
+    fx_stream.released.set()
+    stopper.join()
+    assert fx_stream.lines == ["a", "b"]  # nosec B101
+    assert sink.dropped == 2  # noqa: PLR2004 # nosec B101
+
+
+def test_failing_stream(capsys: pytest.CaptureFixture[str]) -> None:
+    """Test that the writer thread reports a batch which fails to be written and goes on, so that drain() and stop() return."""
+    sink = QueuedSink(FailingStream(), QueueOptions(maxsize=2, overflow=OverflowPolicy.BLOCK))
+    for text in "abcde":
+        sink.write(FakeMessage(text))
+    sink.drain()
+    assert sink._thread.is_alive()  # noqa: SLF001 # nosec B101
+    for text in "fgh":
+        sink.write(FakeMessage(text))
+    sink.stop()
+    assert not sink._thread.is_alive()  # noqa: SLF001 # nosec B101
+    assert "No space left on device" in capsys.readouterr().err  # nosec B101
+
+
+def test_overflow_drop_oldest(fx_stream: BlockingStream) -> None:
+    """Test that a full queue drops its oldest messages with the DROP_OLDEST policy."""
+    sink = QueuedSink(fx_stream, QueueOptions(maxsize=2, overflow=OverflowPolicy.DROP_OLDEST))
+    sink.write(FakeMessage("a"))
+    fx_stream.started.wait()
+    for text in "bcde":
+        sink.write(FakeMessage(text))
+    fx_stream.released.set()
+    sink.stop()
+    assert fx_stream.lines == ["a", "d", "e"]  # nosec B101
+    assert sink.dropped == 2  # noqa: PLR2004 # nosec B101
+
+
+def test_overflow_drop_below_level(fx_stream: BlockingStream) -> None:
+    """Test that a full queue drops the messages below the drop level with the DROP_BELOW_LEVEL policy."""
+    sink = QueuedSink(fx_stream, QueueOptions(maxsize=1, overflow=OverflowPolicy.DROP_BELOW_LEVEL, drop_level=LoggerLevel.WARNING))
+    sink.write(FakeMessage("a"))
+    fx_stream.started.wait()
+    sink.write(FakeMessage("b", level=10))
+    sink.write(FakeMessage("c", level=20))
+    writer = threading.Thread(target=sink.write, args=(FakeMessage("d", level=40),))
+    writer.start()
+    writer.join(0.1)
+    assert writer.is_alive()  # nosec B101
+    fx_stream.released.set()
+    writer.join()
+    sink.stop()
+    assert fx_stream.lines == ["a", "b", "d"]  # nosec B101
+    assert sink.dropped == 1  # nosec B101
+
+
+def test_logger_queued(fx_file: FileProperties) -> None:
+    """Test that a Logger with queue options writes its messages to the file through queued sinks."""
+    logger = Logger(file=fx_file, level=LoggerLevel.DEBUG, queue=QueueOptions(maxsize=100))
+    try:
+        logger.debug("queued message")
+        logger.drain()
+        assert "queued message" in fx_file.file_path.read_text(encoding="utf-8")  # nosec B101
+        logger.set_file_level(LoggerLevel.WARNING)
+        logger.info("filtered message")
+        logger.warning("after level change")
+        logger.drain()
+        content = fx_file.file_path.read_text(encoding="utf-8")
+        assert "filtered message" not in content  # nosec B101
+        assert "after level change" in content  # nosec B101
+        logger.error("written on removal")
+    finally:
+        logger._logger.remove()  # noqa: SLF001
+    assert "written on removal" in fx_file.file_path.read_text(encoding="utf-8")  # nosec B101
+    assert all(not sink._thread.is_alive() for sink in logger._sinks.values())  # noqa: SLF001 # nosec B101
+
+
+def test_buffered_sink_size(fx_file: FileProperties) -> None:
+    """Test that a buffered sink writes its buffer when it reaches its size, and when it's stopped."""
+    sink = BufferedSink(fx_file.file_path, BufferOptions(size=20, interval=60))
+    sink.write(FakeMessage("0123456789\n"))
+    assert fx_file.file_path.read_text(encoding="utf-8") == ""  # nosec B101
+    sink.write(FakeMessage("abcdefghij\n"))
+    assert fx_file.file_path.read_text(encoding="utf-8") == "0123456789\nabcdefghij\n"  # nosec B101
+    sink.write(FakeMessage("last\n"))
+    sink.stop()
+    sink.stop()
+    assert fx_file.file_path.read_text(encoding="utf-8").endswith("abcdefghij\nlast\n")  # nosec B101
+
+
+def test_buffered_sink_flush_level(fx_file: FileProperties) -> None:
+    """Test that a buffered sink writes its buffer with a message from its flush level."""
+    sink = BufferedSink(fx_file.file_path, BufferOptions(interval=60, flush_level=LoggerLevel.ERROR))
+    sink.write(FakeMessage("warning\n", level=30))
+    assert fx_file.file_path.read_text(encoding="utf-8") == ""  # nosec B101
+    sink.write(FakeMessage("error\n", level=40))
+    assert fx_file.file_path.read_text(encoding="utf-8") == "warning\nerror\n"  # nosec B101
+    sink.stop()
+
+
+def test_buffered_sink_interval(fx_file: FileProperties) -> None:
+    """Test that the background thread of a buffered sink writes its buffer when its interval has passed."""
+    sink = BufferedSink(fx_file.file_path, BufferOptions(interval=0.02))
+    sink.write(FakeMessage("idle\n"))
+    deadline = time.monotonic() + 5
+    while not fx_file.file_path.read_text(encoding="utf-8") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fx_file.file_path.read_text(encoding="utf-8") == "idle\n"  # nosec B101
+    sink.stop()
+
+
+def test_logger_buffered(fx_file: FileProperties) -> None:
+    """Test that a Logger with buffer options writes its file on errors, and that queue and buffer options are exclusive."""
+    with pytest.raises(ValueError, match="queue or buffer options"):
+        Logger(file=fx_file, level=LoggerLevel.DEBUG, queue=QueueOptions(), buffer=BufferOptions())
+    logger = Logger(file=fx_file, level=LoggerLevel.DEBUG, buffer=BufferOptions(interval=60))
+    try:
+        logger.info("buffered message")
+        assert "buffered message" not in fx_file.file_path.read_text(encoding="utf-8")  # nosec B101
+        logger.error("error message")
+        content = fx_file.file_path.read_text(encoding="utf-8")
+        assert "buffered message" in content  # nosec B101
+        assert "error message" in content  # nosec B101
+        logger.debug("drained message")
+        logger.drain()
+        assert "drained message" in fx_file.file_path.read_text(encoding="utf-8")  # nosec B101
+        logger.warning("written on removal")
+    finally:
+        logger._logger.remove()  # noqa: SLF001
+    assert "written on removal" in fx_file.file_path.read_text(encoding="utf-8")  # nosec B101
@@ -0,0 +1,128 @@
+"""e-lims-utils tests logger structured."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Generator
+
+import pytest
+
+from e_lims_utils.logger.logger import Logger, LoggerLevel
+from e_lims_utils.logger.rotation import LogRotation
+from e_lims_utils.logger.structured import JsonLinesSink, StructuredLogReader, index_path
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from e_lims_utils.files.files import FileProperties
+
+
+@pytest.fixture()
+def fx_logger(fx_file: FileProperties) -> Generator[Logger, None, None]:
+    """Pytest fixture for the Logger class, with a structured sink.
+
+    Args:
+        fx_file (FileProperties): The properties of the log file, in a temporary directory.
+
+    Returns:
+        Logger: A Logger object, writing a structured log file in a temporary directory.
+    """
+    logger = Logger(file=fx_file, level=LoggerLevel.TRACE, backtrace=True, diagnose=True, structured=True)
+    yield logger
+    logger._logger.remove()  # noqa: SLF001
+
+
+@pytest.fixture()
+def fx_path(tmp_path: Path) -> Path:
+    """Pytest fixture for the path of a structured log file.
+
+    Returns:
+        Path: The path of the structured log file, in a temporary directory.
+    """
+    return tmp_path / "run.jsonl"
+
+
+def test_structured_logger(fx_logger: Logger) -> None:
+    """Test that a structured Logger writes its records as JSON lines, with the context bound to the Logger."""
+    fx_logger.bind(instrument="X", run=42).error("Measure {} failed.", 3)
+    fx_logger.bind(instrument="Y").error("Measure failed.")
+    fx_logger.info("Measure started.")
+    fx_logger._logger.remove()  # noqa: SLF001
+    reader = StructuredLogReader(fx_logger.structured_path)
+    records = list(reader.query(level=LoggerLevel.ERROR, instrument="X"))
+    assert [record["message"] for record in records] == ["Measure 3 failed."]  # nosec B101
+    assert records[0]["extra"] == {"instrument": "X", "run": 42}  # nosec B101
+    assert records[0]["level"] == "ERROR"  # nosec B101
+    assert len(list(reader.query())) == 3  # noqa: PLR2004 # nosec B101
+    assert [block.count for block in reader.blocks()] == [3]  # nosec B101
+    assert "Measure 3 failed." in fx_logger.file.file_path.read_text(encoding="utf-8")  # nosec B101
+
+
+def test_structured_caller(fx_logger: Logger) -> None:
+    """Test that the records carry the location of the caller of the Logger, bound or not, rather than the Logger itself."""
+    fx_logger.info("Measure started.")
+    fx_logger.bind(instrument="X").debug(lambda: "Measure read.")
+    fx_logger._logger.remove()  # noqa: SLF001
+    records = list(StructuredLogReader(fx_logger.structured_path).query())
+    assert [record["function"] for record in records] == ["test_structured_caller"] * 2  # nosec B101
+    assert {record["name"] for record in records} == {__name__}  # nosec B101
+
+
+def test_structured_rotation(fx_file: FileProperties) -> None:
+    """Test that a structured Logger with a rotation raises a ValueError."""
+    with pytest.raises(ValueError, match="structured Logger can't rotate"):
+        Logger(file=fx_file, level=LoggerLevel.INFO, structured=True, rotation=LogRotation(max_bytes=1000))
+    assert not fx_file.file_path.exists()  # nosec B101
+
+
+def test_exceptions(fx_logger: Logger, fx_path: Path) -> None:
+    """Test that the exception of a record is written with its type, also without an active exception."""
+    handler = fx_logger._logger.add(JsonLinesSink(fx_path), level="TRACE")  # noqa: SLF001
+    msg = "uid"
+    try:
+        raise KeyError(msg)  # noqa: TRY301
+    except KeyError:
+        fx_logger._logger.exception("Measure failed.")  # noqa: SLF001
+    fx_logger._logger.opt(exception=True).error("No active exception.")  # noqa: SLF001
+    fx_logger._logger.remove(handler)  # noqa: SLF001
+    assert [record["exception"] for record in StructuredLogReader(fx_path).query()] == ["KeyError: 'uid'", "None: None"]  # nosec B101
+
+
+def test_blocks(fx_logger: Logger, fx_path: Path) -> None:
+    """Test that the blocks are indexed with their levels and time range, and that a query reads the matching blocks only."""
+    handler = fx_logger._logger.add(JsonLinesSink(fx_path, block_records=10), level="TRACE")  # noqa: SLF001
+    for index in range(35):
+        if index == 22:  # noqa: PLR2004
+            fx_logger.error("Error {}.", index)  # noqa: PLE1205
+        else:
+            fx_logger.debug("Debug {}.", index)  # noqa: PLE1205
+    reader = StructuredLogReader(fx_path)
+    assert [block.count for block in reader.blocks()] == [10, 10, 10]  # nosec B101
+    assert len(list(reader.query())) == 35  # noqa: PLR2004 # nosec B101
+    fx_logger._logger.remove(handler)  # noqa: SLF001
+    blocks = reader.blocks()
+    assert [block.count for block in blocks] == [10, 10, 10, 5]  # nosec B101
+    assert [block.offset + block.length for block in blocks[:-1]] == [block.offset for block in blocks[1:]]  # nosec B101
+    assert [block.matches(float("-inf"), float("inf"), 40) for block in blocks] == [False, False, True, False]  # nosec B101
+    assert [record["message"] for record in reader.query(level=LoggerLevel.ERROR)] == ["Error 22."]  # nosec B101
+    records = list(reader.query())
+    start = datetime.fromisoformat(records[12]["time"])
+    end = datetime.fromisoformat(records[27]["time"])
+    selected = list(reader.query(start=start, end=end))
+    assert all(start.timestamp() <= record["timestamp"] <= end.timestamp() for record in selected)  # nosec B101
+    assert {"Debug 12.", "Error 22.", "Debug 27."} <= {record["message"] for record in selected}  # nosec B101
+    assert not blocks[0].matches(start.timestamp(), end.timestamp(), 0)  # nosec B101
+
+
+def test_recover_unindexed_records(fx_logger: Logger, fx_path: Path) -> None:
+    """Test that a new sink indexes the records left unindexed by a sink which was not stopped."""
+    crashed = JsonLinesSink(fx_path)
+    handler = fx_logger._logger.add(crashed.write, level="TRACE")  # noqa: SLF001
+    for index in range(5):
+        fx_logger.warning("Warning {}.", index)  # noqa: PLE1205
+    fx_logger._logger.remove(handler)  # noqa: SLF001
+    crashed.flush()
+    assert index_path(fx_path).read_text(encoding="utf-8") == ""  # nosec B101
+    JsonLinesSink(fx_path).stop()
+    reader = StructuredLogReader(fx_path)
+    assert [block.count for block in reader.blocks()] == [5]  # nosec B101
+    assert len(list(reader.query(level=LoggerLevel.WARNING))) == 5  # noqa: PLR2004 # nosec B101